@@ -0,0 +1,167 @@
+"""
+Benchmark cases for the asset pipeline hot paths.
+
+Every case is registered with @case(name) on a setup function. setup() runs once,
+outside the measurement, and returns the zero-argument callable that is timed.
+Generator modules are imported lazily inside setup() so that the font override
+(PWB_FONT) is in place before their module-level font discovery runs.
+
+  repeat  default number of timed samples (slow cases use fewer)
+  number  calls per sample, for sub-millisecond cases; times are reported per call
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOOLS = os.path.join(ROOT, 'tools')
+# tools/ wins over the repo root: both have a create_screenshots.py, the cases want the tools one
+if TOOLS not in sys.path:
+    sys.path.insert(0, TOOLS)
+if ROOT not in sys.path:
+    sys.path.append(ROOT)  # create_icon.py
+
+from prepare_store_screenshots import SPECS, resize_with_fit  # no fonts, cheap to import
+
+CASES = {}
+
+
+def case(name: str, repeat=None, number=1):
+    def register(setup):
+        CASES[name] = {'name': name, 'setup': setup, 'repeat': repeat, 'number': number}
+        return setup
+    return register
+
+
+# ---------------------------------------------------------------- icon
+
+def _icon(size):
+    def setup():
+        from create_icon import create_app_icon
+        return lambda: create_app_icon(size)
+    return setup
+
+
+case('icon/create_app_icon[512]')(_icon(512))
+case('icon/create_app_icon[1024]', repeat=3)(_icon(1024))
+case('icon/create_app_icon[2048]', repeat=3)(_icon(2048))
+
+
+# ---------------------------------------------------------------- feature graphic
+
+def _variant(name):
+    def setup():
+        import generate_feature_graphic_variants as variants
+        return getattr(variants, name)
+    return setup
+
+
+for _name in ('variant_a', 'variant_b', 'variant_c'):
+    case(f'feature/{_name}')(_variant(_name))
+
+
+@case('feature/premium')
+def _premium():
+    import generate_feature_graphic_premium as premium
+    return premium.render
+
+
+@case('feature/v2')
+def _v2():
+    import generate_feature_graphic_v2 as v2
+    return v2.render
+
+
+@case('text/wrap_text', number=50)
+def _wrap_text():
+    from PIL import Image, ImageDraw
+    import generate_feature_graphic_variants as variants
+    draw = ImageDraw.Draw(Image.new('RGB', (variants.WIDTH, variants.HEIGHT)))
+    return lambda: variants.wrap_text(draw, variants.SUB, variants.font_sub, 560)
+
+
+# ---------------------------------------------------------------- screenshots
+
+def _screen(name):
+    def setup():
+        import create_screenshots
+        return getattr(create_screenshots, name)
+    return setup
+
+
+for _name in ('screenshot_1_home', 'screenshot_2_add', 'screenshot_3_detail', 'screenshot_4_notification'):
+    case(f'screenshots/{_name}')(_screen(_name))
+
+
+def _resize(spec):
+    def setup():
+        import create_screenshots
+        src = create_screenshots.screenshot_1_home()  # 1080x2340, same as the Play source
+        w, h = SPECS[spec]
+        return lambda: resize_with_fit(src, w, h)
+    return setup
+
+
+for _spec in SPECS:
+    case(f'resize/resize_with_fit[{_spec}]')(_resize(_spec))
+
+
+# ---------------------------------------------------------------- store preview
+
+@case('preview/compose[10s@30fps]', repeat=3)
+def _preview_compose():
+    import create_preview
+    from animation import Compositor
+    background = create_preview.screenshot_1_home(plants=())
+
+    def run():
+        comp = Compositor(background)
+        for i in range(300):
+            comp.render(create_preview.sprites_at(i / 30))
+    return run
+
+
+@case('preview/compose+apng[10s@30fps]', repeat=3)
+def _preview_apng():
+    import create_preview
+    from animation import Compositor
+    from png_stream import ApngStreamWriter
+    background = create_preview.screenshot_1_home(plants=())
+    os.makedirs(os.path.join(ROOT, 'build', 'bench'), exist_ok=True)
+    path = os.path.join(ROOT, 'build', 'bench', 'preview.png')  # overwritten by every run
+
+    def run():
+        comp = Compositor(background)
+        with ApngStreamWriter(path, background.size, 'RGB', 30) as apng:
+            for i in range(300):
+                apng.add_frame(comp.canvas, comp.render(create_preview.sprites_at(i / 30)))
+    return run
+
+
+# ---------------------------------------------------------------- export encoders
+
+def _feature_source():
+    import generate_feature_graphic_premium as premium
+    from export_engine import prepare_source
+    return prepare_source(premium.render())
+
+
+def _encode(fmt, quality):
+    def setup():
+        from export_engine import encode
+        src = _feature_source()[fmt]
+        return lambda: encode(src, fmt, quality)
+    return setup
+
+
+for _fmt, _quality, _label in (('webp', None, 'lossless'), ('webp', 80, 'q80'),
+                               ('jpeg', 90, 'q90'), ('png', None, 'optimize')):
+    case(f'export/encode[{_fmt}-{_label}]', repeat=3 if _fmt == 'png' else None)(_encode(_fmt, _quality))
+
+
+@case('export/export[feature preset]', repeat=3)
+def _export():
+    import generate_feature_graphic_premium as premium
+    from export_engine import export
+    from export_feature_graphics import PRESETS
+    src = premium.render()
+    return lambda: export(src, PRESETS['feature'])
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Benchmark the asset pipeline hot paths (see cases.py) and compare with a stored baseline.
+
+Each case runs in its own subprocess so memory numbers are not polluted by other cases:
+- one untimed first call records the tracemalloc peak (Python objects) and the growth
+  of the process max RSS (Pillow pixel buffers live outside the Python allocator)
+- then `repeat` timed samples; the median and min per call are reported
+
+Runs headless: unless --font is given, the TrueType font embedded in Pillow is
+written to build/fonts/ and passed to the generators via PWB_FONT, so results
+do not depend on the fonts installed on the machine. It has no Hangul glyphs, so text
+stages render .notdef boxes; pass a Korean font with --font for representative text
+timings (the baseline records which font was used).
+
+Outputs:
+  build/bench/results-<timestamp>.json   every run
+  benchmarks/baseline.json               with --update-baseline
+
+Usage:
+  python3 benchmarks/run_benchmarks.py [-k icon/] [--repeat 5] [--threshold 0.15] [--update-baseline]
+  python3 benchmarks/run_benchmarks.py --list
+Exit code 1 when a case is slower (median) or bigger (memory) than the baseline beyond the threshold.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+OUT_DIR = os.path.join(ROOT, 'build', 'bench')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.15       # +15% median time
+DEFAULT_MEM_THRESHOLD = 0.20   # +20% memory
+NOISE_FLOOR_MS = 1.0           # differences below this are never regressions
+NOISE_FLOOR_KB = 1024
+RESULT_MARKER = 'BENCH_RESULT '
+
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+from fonts import bundled_font
+from profiling import _max_rss_kb
+
+
+def environment(font_path: str, layer_cache: bool) -> dict:
+    import PIL
+    return {
+        'python': platform.python_version(),
+        'pillow': PIL.__version__,
+        'machine': f'{platform.system()} {platform.machine()}',
+        'cpu_count': os.cpu_count(),
+        'font': os.path.basename(font_path),
+        'layer_cache': layer_cache,
+    }
+
+
+# ---------------------------------------------------------------- worker (one case per process)
+
+def run_case(name: str, repeat: int) -> dict:
+    from cases import CASES
+    spec = CASES[name]
+    number = spec['number']
+    with contextlib.redirect_stdout(io.StringIO()):  # generators print progress messages
+        fn = spec['setup']()
+
+        # First call: memory. Doubles as warm-up, so it is not timed.
+        rss_before = _max_rss_kb()
+        tracemalloc.start()
+        fn()
+        _, py_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss_growth = _max_rss_kb() - rss_before
+
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - t0) * 1000 / number)
+    return {
+        'median_ms': statistics.median(samples),
+        'min_ms': min(samples),
+        'stdev_ms': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'samples': len(samples),
+        'py_peak_kb': py_peak // 1024,
+        'rss_growth_kb': rss_growth,
+    }
+
+
+def spawn(name: str, repeat: int, font_path: str, layer_cache: bool) -> dict:
+    # The layer cache is off by default so the timings measure the rendering itself
+    env = dict(os.environ, PWB_FONT=font_path, PWB_LAYER_CACHE='on' if layer_cache else 'off')
+    env.setdefault('PWB_EMOJI_FONT', 'off')  # no machine-dependent emoji atlas or fallback fonts either
+    env.setdefault('PWB_FONT_FALLBACK', 'off')
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', name, '--repeat', str(repeat)],
+        cwd=ROOT, env=env, capture_output=True, text=True)
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    tail = (proc.stderr or proc.stdout).strip().splitlines()[-1:] or ['(no output)']
+    return {'error': tail[0]}
+
+
+# ---------------------------------------------------------------- comparison
+
+def compare(result: dict, base: dict, threshold: float, mem_threshold: float) -> list:
+    """Return a list of regression descriptions (empty when within thresholds)."""
+    problems = []
+    if not base or 'error' in result or 'error' in base:
+        return problems
+    old, new = base['median_ms'], result['median_ms']
+    if new - old > max(old * threshold, NOISE_FLOOR_MS):
+        problems.append(f'time {old:.1f} → {new:.1f} ms ({(new / old - 1) * 100:+.0f}%)')
+    for key in ('rss_growth_kb', 'py_peak_kb'):
+        old, new = base[key], result[key]
+        if new - old > max(old * mem_threshold, NOISE_FLOOR_KB):
+            problems.append(f'{key} {old:,} → {new:,} KB')
+    return problems
+
+
+def load_baseline(path: str):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the asset pipeline against a stored baseline')
+    parser.add_argument('-k', '--filter', default='', help='regex on case names (e.g. "icon/|resize/")')
+    parser.add_argument('--repeat', type=int, help=f'timed samples per case (default {DEFAULT_REPEAT}, less for slow cases)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='allowed median slowdown, fraction')
+    parser.add_argument('--mem-threshold', type=float, default=DEFAULT_MEM_THRESHOLD, help='allowed memory growth, fraction')
+    parser.add_argument('--font', help='font file for the generators (default: font bundled with Pillow)')
+    parser.add_argument('--layer-cache', action='store_true', help='run with the layer cache enabled (warm after the first call)')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help='store this run as the new baseline')
+    parser.add_argument('--list', action='store_true', help='list case names and exit')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        res = run_case(args.worker, args.repeat or DEFAULT_REPEAT)
+        print(RESULT_MARKER + json.dumps(res))
+        return
+
+    from cases import CASES
+    names = [n for n in CASES if re.search(args.filter, n)]
+    if args.list:
+        print('\n'.join(names))
+        return
+    if not names:
+        raise SystemExit(f'❌ 일치하는 벤치마크가 없습니다: {args.filter}')
+
+    font_path = os.path.abspath(args.font) if args.font else bundled_font()
+    env = environment(font_path, args.layer_cache)
+    baseline = load_baseline(args.baseline)
+    base_cases = (baseline or {}).get('cases', {})
+    if baseline and baseline.get('environment') != env:
+        print(f"⚠️ 기준선 환경이 다릅니다: {baseline.get('environment')} ≠ {env}")
+
+    print(f"🏁 벤치마크 {len(names)}개 (font: {env['font']}, Pillow {env['pillow']})")
+    print(f"  {'case':<44} {'median ms':>10} {'min ms':>9} {'py KB':>8} {'+RSS KB':>9} {'vs base':>8}")
+    results, regressions = {}, []
+    for name in names:
+        repeat = args.repeat or CASES[name]['repeat'] or DEFAULT_REPEAT
+        res = results[name] = spawn(name, repeat, font_path, args.layer_cache)
+        if 'error' in res:
+            print(f"  ❌ {name}: {res['error']}")
+            continue
+        base = base_cases.get(name)
+        delta = f"{(res['median_ms'] / base['median_ms'] - 1) * 100:+.0f}%" if base and base.get('median_ms') else 'new'
+        print(f"  {name:<44} {res['median_ms']:>10.2f} {res['min_ms']:>9.2f} "
+              f"{res['py_peak_kb']:>8,} {res['rss_growth_kb']:>9,} {delta:>8}")
+        for problem in compare(res, base, args.threshold, args.mem_threshold):
+            regressions.append(f'{name}: {problem}')
+
+    report = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'environment': env, 'cases': results}
+    os.makedirs(OUT_DIR, exist_ok=True)
+    out_path = os.path.join(OUT_DIR, f"results-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print('\n📝 결과 저장:', os.path.relpath(out_path, ROOT))
+
+    if args.update_baseline:
+        if baseline and args.filter:
+            # Partial run: keep the other cases of the existing baseline
+            report['cases'] = dict(base_cases, **results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print('📌 기준선 갱신:', os.path.relpath(args.baseline, ROOT))
+    elif baseline is None:
+        print('ℹ️ 기준선이 없습니다. --update-baseline 으로 저장하세요.')
+
+    failed = [n for n, r in results.items() if 'error' in r]
+    if regressions:
+        print(f'\n⚠️ 성능 회귀 {len(regressions)}건 (time > +{args.threshold:.0%}, memory > +{args.mem_threshold:.0%}):')
+        for line in regressions:
+            print('  -', line)
+    if regressions or failed:
+        sys.exit(1)
+    print('✅ 회귀 없음')
+
+
+if __name__ == '__main__':
+    main()
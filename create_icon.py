@@ -2,270 +2,387 @@
 """
 물주기 알림 앱 아이콘 생성기
 귀여운 물방울 캐릭터 디자인
+
+같은 장면을 SVG(assets/images/app_icon.svg)로도 출력하고, --android 이면
+Android 적응형 아이콘(VectorDrawable 배경/전경 + mipmap-anydpi-v26)도 생성:
+API 26+ 기기는 벡터 하나를 쓰고, mipmap-*dpi PNG는 그 이하 기기용으로 남음
+(앱 런처 아이콘이 바뀌므로 명시적으로 요청할 때만)
+
+--master SIZE: 마케팅용 대형 원본 assets/store_graphics/masters/app_icon_<SIZE>.png (4096 이상 등),
+타일로 나눠 프로세스마다 렌더링 (tiles.py, 좌표는 정수 픽셀로 맞춤);
+--verify 이면 타일과 한 장 렌더링을 비교
+
+Usage:
+  python3 create_icon.py [--android] [--master SIZE ...] [--workers N] [--verify] [--profile]
 """
 
 from PIL import Image, ImageDraw
+import argparse
+import functools
 import math
+import os
+import sys
+import time
 
-def create_app_icon(size=1024):
-    # 부드러운 그라데이션 배경
-    img = Image.new('RGB', (size, size), '#FFFFFF')
-    
-    # 배경 그라데이션 (하늘색에서 청록색으로)
-    for y in range(size):
-        ratio = y / size
-        r = int(135 + (100 - 135) * ratio)
-        g = int(206 + (200 - 206) * ratio)
-        b = int(250 + (230 - 250) * ratio)
-        for x in range(size):
-            img.putpixel((x, y), (r, g, b))
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+from profiling import stage, enable_from_argv
+from tiles import compare_tiled, render_tiled
+from vector_scene import Scene, to_svg, to_vector_drawable
+from write_behind import flush_writes, get_writer, save_async, write_bytes
+
+ANDROID_RES = os.path.join(ROOT, 'android', 'app', 'src', 'main', 'res')
+MASTERS_DIR = os.path.join(ROOT, 'assets', 'store_graphics', 'masters')
+ADAPTIVE_DP = 108       # adaptive icon layer size
+ADAPTIVE_INNER_DP = 72  # where the legacy square icon sits (launcher masks show at least 66dp)
+ADAPTIVE_ICON_XML = '''<?xml version="1.0" encoding="utf-8"?>
+<adaptive-icon xmlns:android="http://schemas.android.com/apk/res/android">
+    <background android:drawable="@drawable/ic_launcher_background" />
+    <foreground android:drawable="@drawable/ic_launcher_foreground" />
+</adaptive-icon>
+'''
+
+def icon_scene(size=1024) -> Scene:
+    """아이콘 장면 (도형 목록): 래스터, SVG, VectorDrawable 공용"""
+    scene = Scene(size, size)
+    with scene.group('background'):
+        # 배경 그라데이션 (하늘색에서 청록색으로)
+        scene.vertical_gradient((135, 206, 250), (100, 200, 230))
     
-    draw = ImageDraw.Draw(img)
     center = size // 2
     
-    # === 귀여운 물방울 캐릭터 ===
-    char_y_offset = -size // 12
+    with scene.group('droplet'):
+        # === 귀여운 물방울 캐릭터 ===
+        char_y_offset = -size // 12
     
-    # 물방울 몸통 (부드러운 물방울 모양)
-    droplet_center_x = center
-    droplet_center_y = center + char_y_offset
-    droplet_width = size // 2.8
-    droplet_height = size // 2.5
+        # 물방울 몸통 (부드러운 물방울 모양)
+        droplet_center_x = center
+        droplet_center_y = center + char_y_offset
+        droplet_width = size // 2.8
+        droplet_height = size // 2.5
     
-    # 물방울 외곽선 만들기
-    points = []
-    for angle in range(140, 400, 1):
-        rad = math.radians(angle)
-        if angle <= 270:
-            # 위쪽 뾰족한 부분
-            scale_factor = 0.3 + 0.7 * ((angle - 140) / 130) ** 0.8
-        else:
-            scale_factor = 1.0
+        # 물방울 외곽선 만들기
+        points = []
+        for angle in range(140, 400, 1):
+            rad = math.radians(angle)
+            if angle <= 270:
+                # 위쪽 뾰족한 부분
+                scale_factor = 0.3 + 0.7 * ((angle - 140) / 130) ** 0.8
+            else:
+                scale_factor = 1.0
         
-        x = droplet_center_x + droplet_width * scale_factor * math.cos(rad)
-        y = droplet_center_y + droplet_height * scale_factor * math.sin(rad)
-        points.append((x, y))
+            x = droplet_center_x + droplet_width * scale_factor * math.cos(rad)
+            y = droplet_center_y + droplet_height * scale_factor * math.sin(rad)
+            points.append((x, y))
     
-    # 그림자 (여러 레이어로 부드럽게)
-    for i in range(5):
-        shadow_points = [(p[0] + i*2, p[1] + i*2) for p in points]
-        shadow_gray = 200 - i * 15
-        draw.polygon(shadow_points, fill=(shadow_gray, shadow_gray, shadow_gray))
+        # 그림자 (여러 레이어로 부드럽게)
+        for i in range(5):
+            shadow_points = [(p[0] + i*2, p[1] + i*2) for p in points]
+            shadow_gray = 200 - i * 15
+            scene.polygon(shadow_points, fill=(shadow_gray, shadow_gray, shadow_gray))
     
-    # 물방울 본체 (밝은 청록색)
-    draw.polygon(points, fill=(100, 200, 255))
+        # 물방울 본체 (밝은 청록색)
+        scene.polygon(points, fill=(100, 200, 255))
     
-    # 물방울 하이라이트 (3D 효과)
-    highlight1_x = droplet_center_x - droplet_width // 3
-    highlight1_y = droplet_center_y - droplet_height // 4
-    highlight1_size = droplet_width // 2
+        # 물방울 하이라이트 (3D 효과)
+        highlight1_x = droplet_center_x - droplet_width // 3
+        highlight1_y = droplet_center_y - droplet_height // 4
+        highlight1_size = droplet_width // 2
     
-    # 큰 하이라이트
-    draw.ellipse([
-        highlight1_x - highlight1_size//2,
-        highlight1_y - highlight1_size//2,
-        highlight1_x + highlight1_size//2,
-        highlight1_y + highlight1_size//2
-    ], fill=(180, 230, 255))
+        # 큰 하이라이트
+        scene.ellipse([
+            highlight1_x - highlight1_size//2,
+            highlight1_y - highlight1_size//2,
+            highlight1_x + highlight1_size//2,
+            highlight1_y + highlight1_size//2
+        ], fill=(180, 230, 255))
     
-    # 중간 하이라이트
-    draw.ellipse([
-        highlight1_x - highlight1_size//3,
-        highlight1_y - highlight1_size//3,
-        highlight1_x + highlight1_size//3,
-        highlight1_y + highlight1_size//3
-    ], fill=(220, 245, 255))
+        # 중간 하이라이트
+        scene.ellipse([
+            highlight1_x - highlight1_size//3,
+            highlight1_y - highlight1_size//3,
+            highlight1_x + highlight1_size//3,
+            highlight1_y + highlight1_size//3
+        ], fill=(220, 245, 255))
     
-    # 작은 하이라이트들 (반짝이는 효과)
-    small_highlights = [
-        (droplet_center_x + droplet_width//3, droplet_center_y - droplet_height//6, droplet_width//8),
-        (droplet_center_x - droplet_width//6, droplet_center_y + droplet_height//8, droplet_width//12),
-        (droplet_center_x + droplet_width//5, droplet_center_y + droplet_height//5, droplet_width//15)
-    ]
+        # 작은 하이라이트들 (반짝이는 효과)
+        small_highlights = [
+            (droplet_center_x + droplet_width//3, droplet_center_y - droplet_height//6, droplet_width//8),
+            (droplet_center_x - droplet_width//6, droplet_center_y + droplet_height//8, droplet_width//12),
+            (droplet_center_x + droplet_width//5, droplet_center_y + droplet_height//5, droplet_width//15)
+        ]
     
-    for hx, hy, hsize in small_highlights:
-        draw.ellipse([hx - hsize, hy - hsize, hx + hsize, hy + hsize], fill=(240, 250, 255))
+        for hx, hy, hsize in small_highlights:
+            scene.ellipse([hx - hsize, hy - hsize, hx + hsize, hy + hsize], fill=(240, 250, 255))
     
-    # 물방울 외곽선 (부드러운 테두리)
-    draw.polygon(points, outline=(60, 150, 220), width=size//180)
+        # 물방울 외곽선 (부드러운 테두리)
+        scene.polygon(points, outline=(60, 150, 220), width=size//180)
     
-    # === 귀여운 얼굴 ===
-    face_y = droplet_center_y
+    with scene.group('face'):
+        # === 귀여운 얼굴 ===
+        face_y = droplet_center_y
     
-    # 눈 (큰 귀여운 눈)
-    eye_y = face_y - droplet_height // 8
-    eye_spacing = droplet_width // 4
-    eye_size = droplet_width // 8
+        # 눈 (큰 귀여운 눈)
+        eye_y = face_y - droplet_height // 8
+        eye_spacing = droplet_width // 4
+        eye_size = droplet_width // 8
     
-    # 왼쪽 눈
-    left_eye_x = center - eye_spacing
-    # 흰자
-    draw.ellipse([
-        left_eye_x - eye_size,
-        eye_y - eye_size,
-        left_eye_x + eye_size,
-        eye_y + eye_size
-    ], fill=(255, 255, 255))
-    # 눈동자
-    pupil_size = eye_size // 1.8
-    draw.ellipse([
-        left_eye_x - pupil_size,
-        eye_y - pupil_size,
-        left_eye_x + pupil_size,
-        eye_y + pupil_size
-    ], fill=(40, 40, 60))
-    # 하이라이트
-    pupil_highlight = pupil_size // 2.5
-    draw.ellipse([
-        left_eye_x - pupil_size//2 - pupil_highlight//2,
-        eye_y - pupil_size//2 - pupil_highlight//2,
-        left_eye_x - pupil_size//2 + pupil_highlight//2,
-        eye_y - pupil_size//2 + pupil_highlight//2
-    ], fill=(255, 255, 255))
+        # 왼쪽 눈
+        left_eye_x = center - eye_spacing
+        # 흰자
+        scene.ellipse([
+            left_eye_x - eye_size,
+            eye_y - eye_size,
+            left_eye_x + eye_size,
+            eye_y + eye_size
+        ], fill=(255, 255, 255))
+        # 눈동자
+        pupil_size = eye_size // 1.8
+        scene.ellipse([
+            left_eye_x - pupil_size,
+            eye_y - pupil_size,
+            left_eye_x + pupil_size,
+            eye_y + pupil_size
+        ], fill=(40, 40, 60))
+        # 하이라이트
+        pupil_highlight = pupil_size // 2.5
+        scene.ellipse([
+            left_eye_x - pupil_size//2 - pupil_highlight//2,
+            eye_y - pupil_size//2 - pupil_highlight//2,
+            left_eye_x - pupil_size//2 + pupil_highlight//2,
+            eye_y - pupil_size//2 + pupil_highlight//2
+        ], fill=(255, 255, 255))
     
-    # 오른쪽 눈
-    right_eye_x = center + eye_spacing
-    # 흰자
-    draw.ellipse([
-        right_eye_x - eye_size,
-        eye_y - eye_size,
-        right_eye_x + eye_size,
-        eye_y + eye_size
-    ], fill=(255, 255, 255))
-    # 눈동자
-    draw.ellipse([
-        right_eye_x - pupil_size,
-        eye_y - pupil_size,
-        right_eye_x + pupil_size,
-        eye_y + pupil_size
-    ], fill=(40, 40, 60))
-    # 하이라이트
-    draw.ellipse([
-        right_eye_x - pupil_size//2 - pupil_highlight//2,
-        eye_y - pupil_size//2 - pupil_highlight//2,
-        right_eye_x - pupil_size//2 + pupil_highlight//2,
-        eye_y - pupil_size//2 + pupil_highlight//2
-    ], fill=(255, 255, 255))
+        # 오른쪽 눈
+        right_eye_x = center + eye_spacing
+        # 흰자
+        scene.ellipse([
+            right_eye_x - eye_size,
+            eye_y - eye_size,
+            right_eye_x + eye_size,
+            eye_y + eye_size
+        ], fill=(255, 255, 255))
+        # 눈동자
+        scene.ellipse([
+            right_eye_x - pupil_size,
+            eye_y - pupil_size,
+            right_eye_x + pupil_size,
+            eye_y + pupil_size
+        ], fill=(40, 40, 60))
+        # 하이라이트
+        scene.ellipse([
+            right_eye_x - pupil_size//2 - pupil_highlight//2,
+            eye_y - pupil_size//2 - pupil_highlight//2,
+            right_eye_x - pupil_size//2 + pupil_highlight//2,
+            eye_y - pupil_size//2 + pupil_highlight//2
+        ], fill=(255, 255, 255))
     
-    # 미소 (반달 모양)
-    smile_y = face_y + droplet_height // 6
-    smile_width = droplet_width // 3
-    smile_height = droplet_height // 8
+        # 미소 (반달 모양)
+        smile_y = face_y + droplet_height // 6
+        smile_width = droplet_width // 3
+        smile_height = droplet_height // 8
     
-    # 미소 외곽
-    smile_bbox = [
-        center - smile_width,
-        smile_y - smile_height,
-        center + smile_width,
-        smile_y + smile_height * 3
-    ]
-    draw.arc(smile_bbox, 0, 180, fill=(40, 40, 60), width=size//120)
+        # 미소 외곽
+        smile_bbox = [
+            center - smile_width,
+            smile_y - smile_height,
+            center + smile_width,
+            smile_y + smile_height * 3
+        ]
+        scene.arc(smile_bbox, 0, 180, fill=(40, 40, 60), width=size//120)
     
-    # 볼 홍조
-    blush_y = face_y + droplet_height // 12
-    blush_size = droplet_width // 10
-    # 왼쪽 볼
-    draw.ellipse([
-        center - eye_spacing * 1.3 - blush_size,
-        blush_y - blush_size//2,
-        center - eye_spacing * 1.3 + blush_size,
-        blush_y + blush_size//2
-    ], fill=(255, 180, 200))
-    # 오른쪽 볼
-    draw.ellipse([
-        center + eye_spacing * 1.3 - blush_size,
-        blush_y - blush_size//2,
-        center + eye_spacing * 1.3 + blush_size,
-        blush_y + blush_size//2
-    ], fill=(255, 180, 200))
+        # 볼 홍조
+        blush_y = face_y + droplet_height // 12
+        blush_size = droplet_width // 10
+        # 왼쪽 볼
+        scene.ellipse([
+            center - eye_spacing * 1.3 - blush_size,
+            blush_y - blush_size//2,
+            center - eye_spacing * 1.3 + blush_size,
+            blush_y + blush_size//2
+        ], fill=(255, 180, 200))
+        # 오른쪽 볼
+        scene.ellipse([
+            center + eye_spacing * 1.3 - blush_size,
+            blush_y - blush_size//2,
+            center + eye_spacing * 1.3 + blush_size,
+            blush_y + blush_size//2
+        ], fill=(255, 180, 200))
     
-    # === 식물 장식 (머리 위 왕관처럼) ===
-    plant_y = droplet_center_y - droplet_height * 0.85
-    leaf_size = droplet_width // 3.5
+    with scene.group('leaves'):
+        # === 식물 장식 (머리 위 왕관처럼) ===
+        plant_y = droplet_center_y - droplet_height * 0.85
+        leaf_size = droplet_width // 3.5
     
-    # 중앙 줄기
-    stem_width = size // 80
-    stem_height = droplet_height // 6
-    draw.rectangle([
-        center - stem_width,
-        plant_y - stem_height,
-        center + stem_width,
-        plant_y
-    ], fill=(60, 140, 60))
+        # 중앙 줄기
+        stem_width = size // 80
+        stem_height = droplet_height // 6
+        scene.rectangle([
+            center - stem_width,
+            plant_y - stem_height,
+            center + stem_width,
+            plant_y
+        ], fill=(60, 140, 60))
     
-    # 왼쪽 잎 (하트 모양)
-    left_leaf_center = center - leaf_size * 0.8
-    left_leaf_top = plant_y - stem_height - leaf_size * 0.3
+        # 왼쪽 잎 (하트 모양)
+        left_leaf_center = center - leaf_size * 0.8
+        left_leaf_top = plant_y - stem_height - leaf_size * 0.3
     
-    left_leaf_points = []
-    for angle in range(0, 360, 5):
-        rad = math.radians(angle)
-        # 하트 모양 공식
-        if angle <= 180:
-            r = leaf_size * 0.5 * (1 + 0.3 * math.sin(rad * 3))
-        else:
-            r = leaf_size * 0.4
-        x = left_leaf_center + r * math.cos(rad)
-        y = left_leaf_top + r * math.sin(rad) * 1.2
-        left_leaf_points.append((x, y))
+        left_leaf_points = []
+        for angle in range(0, 360, 5):
+            rad = math.radians(angle)
+            # 하트 모양 공식
+            if angle <= 180:
+                r = leaf_size * 0.5 * (1 + 0.3 * math.sin(rad * 3))
+            else:
+                r = leaf_size * 0.4
+            x = left_leaf_center + r * math.cos(rad)
+            y = left_leaf_top + r * math.sin(rad) * 1.2
+            left_leaf_points.append((x, y))
     
-    draw.polygon(left_leaf_points, fill=(80, 200, 100))
-    draw.polygon(left_leaf_points, outline=(50, 150, 70), width=size//250)
+        scene.polygon(left_leaf_points, fill=(80, 200, 100))
+        scene.polygon(left_leaf_points, outline=(50, 150, 70), width=size//250)
     
-    # 오른쪽 잎
-    right_leaf_center = center + leaf_size * 0.8
-    right_leaf_points = []
-    for angle in range(0, 360, 5):
-        rad = math.radians(angle)
-        if angle <= 180:
-            r = leaf_size * 0.5 * (1 + 0.3 * math.sin(rad * 3))
-        else:
-            r = leaf_size * 0.4
-        x = right_leaf_center + r * math.cos(rad)
-        y = left_leaf_top + r * math.sin(rad) * 1.2
-        right_leaf_points.append((x, y))
+        # 오른쪽 잎
+        right_leaf_center = center + leaf_size * 0.8
+        right_leaf_points = []
+        for angle in range(0, 360, 5):
+            rad = math.radians(angle)
+            if angle <= 180:
+                r = leaf_size * 0.5 * (1 + 0.3 * math.sin(rad * 3))
+            else:
+                r = leaf_size * 0.4
+            x = right_leaf_center + r * math.cos(rad)
+            y = left_leaf_top + r * math.sin(rad) * 1.2
+            right_leaf_points.append((x, y))
     
-    draw.polygon(right_leaf_points, fill=(100, 220, 120))
-    draw.polygon(right_leaf_points, outline=(60, 170, 80), width=size//250)
+        scene.polygon(right_leaf_points, fill=(100, 220, 120))
+        scene.polygon(right_leaf_points, outline=(60, 170, 80), width=size//250)
     
-    # 잎맥
-    draw.line([
-        (left_leaf_center, left_leaf_top - leaf_size * 0.3),
-        (left_leaf_center, left_leaf_top + leaf_size * 0.3)
-    ], fill=(50, 150, 70), width=size//300)
+        # 잎맥
+        scene.line([
+            (left_leaf_center, left_leaf_top - leaf_size * 0.3),
+            (left_leaf_center, left_leaf_top + leaf_size * 0.3)
+        ], fill=(50, 150, 70), width=size//300)
     
-    draw.line([
-        (right_leaf_center, left_leaf_top - leaf_size * 0.3),
-        (right_leaf_center, left_leaf_top + leaf_size * 0.3)
-    ], fill=(60, 170, 80), width=size//300)
+        scene.line([
+            (right_leaf_center, left_leaf_top - leaf_size * 0.3),
+            (right_leaf_center, left_leaf_top + leaf_size * 0.3)
+        ], fill=(60, 170, 80), width=size//300)
     
-    # 작은 새싹 (가운데)
-    sprout_points = [
-        (center, plant_y - stem_height - leaf_size * 0.5),
-        (center - leaf_size * 0.25, plant_y - stem_height - leaf_size * 0.2),
-        (center, plant_y - stem_height),
-        (center + leaf_size * 0.25, plant_y - stem_height - leaf_size * 0.2)
-    ]
-    draw.polygon(sprout_points, fill=(120, 230, 140))
-    draw.polygon(sprout_points, outline=(70, 180, 90), width=size//300)
+        # 작은 새싹 (가운데)
+        sprout_points = [
+            (center, plant_y - stem_height - leaf_size * 0.5),
+            (center - leaf_size * 0.25, plant_y - stem_height - leaf_size * 0.2),
+            (center, plant_y - stem_height),
+            (center + leaf_size * 0.25, plant_y - stem_height - leaf_size * 0.2)
+        ]
+        scene.polygon(sprout_points, fill=(120, 230, 140))
+        scene.polygon(sprout_points, outline=(70, 180, 90), width=size//300)
     
-    return img
+    return scene
+
+def create_app_icon(size=1024):
+    return icon_scene(size).rasterize()
+
+@functools.lru_cache(maxsize=4)
+def _scene(size):
+    return icon_scene(size)
+
+def icon_region(size, box):
+    """size 아이콘의 box 영역 (타일 렌더링용)"""
+    return _scene(size).rasterize(box=box, snap=True)
+
+def create_icon_master(size, workers=None):
+    """대형 원본: 타일마다 다른 프로세스에서 렌더링해 공유 메모리에 이어 붙임"""
+    return render_tiled(functools.partial(icon_region, size), (size, size), workers=workers)
+
+def vector_outputs(size=1024, android=False):
+    """[(경로, 내용)]: SVG 아이콘, android이면 적응형 아이콘 배경/전경/정의도"""
+    scene = icon_scene(size)
+    svg = (os.path.join(ROOT, 'assets', 'images', 'app_icon.svg'), to_svg(scene))
+    if not android:
+        return [svg]
+    background = scene.select(lambda group: group == 'background')
+    foreground = scene.select(lambda group: group != 'background')
+    margin = (ADAPTIVE_DP - ADAPTIVE_INNER_DP) / 2
+    viewport = (ADAPTIVE_DP, ADAPTIVE_DP)
+    return [
+        svg,
+        (os.path.join(ANDROID_RES, 'drawable', 'ic_launcher_background.xml'),
+         to_vector_drawable(background, viewport=viewport)),
+        (os.path.join(ANDROID_RES, 'drawable', 'ic_launcher_foreground.xml'),
+         to_vector_drawable(foreground, viewport=viewport, translate=(margin, margin),
+                            scale=ADAPTIVE_INNER_DP / size)),
+        (os.path.join(ANDROID_RES, 'mipmap-anydpi-v26', 'ic_launcher.xml'), ADAPTIVE_ICON_XML),
+    ]
+
+def create_rounded_icon(icon, radius=180):
+    """iOS용 둥근 모서리 버전"""
+    size = icon.size[0]
+    rounded = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    mask = Image.new('L', (size, size), 0)
+    mask_draw = ImageDraw.Draw(mask)
+    mask_draw.rounded_rectangle([0, 0, size, size], radius=radius, fill=255)
+    rounded.paste(icon, (0, 0))
+    rounded.putalpha(mask)
+    return rounded
+
+def main():
+    enable_from_argv('create_icon')
+    parser = argparse.ArgumentParser(description='Render the app icon (PNG, SVG, Android adaptive icon)')
+    parser.add_argument('--android', action='store_true', help='also write the Android adaptive icon')
+    parser.add_argument('--master', type=int, action='append', default=[], metavar='SIZE',
+                        help='large master assets/store_graphics/masters/app_icon_<SIZE>.png, rendered in tiles (repeatable)')
+    parser.add_argument('--workers', type=int, default=None, help='tile processes (default: CPU count)')
+    parser.add_argument('--verify', action='store_true', help='compare the master tiles with a single render')
+    args = parser.parse_args()
+    images_dir = os.path.join(ROOT, 'assets', 'images')
+
+    # 1024x1024 아이콘 생성
+    print("Creating cute character app icon...")
+    with stage('render'):
+        icon = create_app_icon(1024)
+    save_async(icon, os.path.join(images_dir, 'app_icon.png'))  # encoded while the rounded icon renders
+    print("✓ App icon created: assets/images/app_icon.png")
+
+    # iOS용 둥근 모서리 버전도 생성
+    print("Creating rounded icon for iOS...")
+    with stage('rounded'):
+        rounded = create_rounded_icon(icon)
+    save_async(rounded, os.path.join(images_dir, 'app_icon_rounded.png'))
+    with stage('encode'):
+        flush_writes()
+    print("✓ Rounded icon created: assets/images/app_icon_rounded.png")
+
+    # 벡터 아이콘 (SVG + Android 적응형 아이콘)
+    with stage('vector'):
+        for path, text in vector_outputs(android=args.android):
+            write_bytes(path, text.encode('utf-8'))
+            print(f"✓ Vector icon: {os.path.relpath(path, ROOT)} ({len(text) // 1024}KB)")
 
-# 1024x1024 아이콘 생성
-print("Creating cute character app icon...")
-icon = create_app_icon(1024)
-icon.save('/Users/ambrosia0715/Desktop/project/AquaLeaf/plant_water_buddy_lite/assets/images/app_icon.png')
-print("✓ App icon created: assets/images/app_icon.png")
+    # 대형 원본 (타일 병렬)
+    for size in args.master:
+        with stage(f'master {size}'):
+            t0 = time.perf_counter()
+            master = create_icon_master(size, args.workers)
+            elapsed = time.perf_counter() - t0
+        path = os.path.join(MASTERS_DIR, f'app_icon_{size}.png')
+        os.makedirs(MASTERS_DIR, exist_ok=True)
+        save_async(master, path)
+        print(f"✓ Master icon: {os.path.relpath(path, ROOT)} ({elapsed:.1f}s)")
+        if args.verify:
+            with stage(f'verify {size}'):
+                diffs = compare_tiled(functools.partial(icon_region, size), (size, size))
+            if diffs:
+                print(f"  ⚠️ 타일 {len(diffs)}개가 한 장 렌더링과 다름 ({sum(n for _, n in diffs)}픽셀)")
+            else:
+                print("  ✓ 타일 = 한 장 렌더링 (픽셀 일치)")
+    with stage('encode'):
+        flush_writes()
+    print('💾', get_writer().summary())
 
-# iOS용 둥근 모서리 버전도 생성
-print("Creating rounded icon for iOS...")
-rounded = Image.new('RGBA', (1024, 1024), (0, 0, 0, 0))
-mask = Image.new('L', (1024, 1024), 0)
-mask_draw = ImageDraw.Draw(mask)
-mask_draw.rounded_rectangle([0, 0, 1024, 1024], radius=180, fill=255)
-rounded.paste(icon, (0, 0))
-rounded.putalpha(mask)
-rounded.save('/Users/ambrosia0715/Desktop/project/AquaLeaf/plant_water_buddy_lite/assets/images/app_icon_rounded.png')
-print("✓ Rounded icon created: assets/images/app_icon_rounded.png")
+    print("\n🌱 Done! Cute character icon is ready!")
 
-print("\n🌱 Done! Cute character icon is ready!")
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,11 @@
 from PIL import Image, ImageDraw, ImageFont
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from emoji_atlas import draw_emoji_text
+from fonts import chain_font, draw_text
+from write_behind import flush_writes, get_writer, save_async
 
 def create_screenshot(title, content_lines, filename):
     # 전화 화면 크기 (9:16 비율)
@@ -11,9 +17,10 @@ def create_screenshot(title, content_lines, filename):
     
     # 폰트 설정
     try:
-        title_font = ImageFont.truetype('/System/Library/Fonts/Supplemental/Arial Bold.ttf', 60)
-        content_font = ImageFont.truetype('/System/Library/Fonts/AppleSDGothicNeo.ttc', 45)
-        small_font = ImageFont.truetype('/System/Library/Fonts/AppleSDGothicNeo.ttc', 35)
+        # 제목은 Arial: 한글은 폴백 체인의 한글 폰트로
+        title_font = chain_font('/System/Library/Fonts/Supplemental/Arial Bold.ttf', 60)
+        content_font = chain_font('/System/Library/Fonts/AppleSDGothicNeo.ttc', 45)
+        small_font = chain_font('/System/Library/Fonts/AppleSDGothicNeo.ttc', 35)
     except:
         title_font = ImageFont.load_default()
         content_font = ImageFont.load_default()
@@ -23,7 +30,7 @@ def create_screenshot(title, content_lines, filename):
     draw.rectangle([(0, 0), (width, 150)], fill='#4CAF50')
     
     # 앱 제목
-    draw.text((40, 50), title, font=title_font, fill='white')
+    draw_text(draw, (40, 50), title, font=title_font, fill='white')
     
     # 콘텐츠 영역
     y_offset = 200
@@ -31,15 +38,15 @@ def create_screenshot(title, content_lines, filename):
         if isinstance(line, tuple):
             text, color, font_type = line
             font = content_font if font_type == 'content' else small_font
-            draw.text((40, y_offset), text, font=font, fill=color)
+            draw_emoji_text(img, (40, y_offset), text, font, color)
             y_offset += 80 if font_type == 'content' else 60
         else:
-            draw.text((40, y_offset), line, font=content_font, fill='#333333')
+            draw_text(draw, (40, y_offset), line, font=content_font, fill='#333333')
             y_offset += 80
     
     # 저장
     output_path = f'assets/store_graphics/screenshots/{filename}'
-    img.save(output_path)
+    save_async(img, output_path)  # encoded while the next screen renders
     print(f'✅ {filename} 생성 완료')
 
 # 스크린샷 1: 홈 화면
@@ -132,6 +139,8 @@ screenshot4 = [
     ('배터리 최적화를 해제해주세요', '#999999', 'small'),
 ]
 create_screenshot('설정', screenshot4, '04_settings.png')
+flush_writes()
+print('💾', get_writer().summary())
 
 print('\n✅ 모든 스크린샷 생성 완료!')
 print('📁 위치: assets/store_graphics/screenshots/')
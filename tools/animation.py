@@ -0,0 +1,265 @@
+"""
+Dirty-rectangle animation: a static background plus moving / changing sprites, where
+each frame repaints only the rectangles that changed, and encoders that store only
+those regions.
+
+    comp = Compositor(background)
+    with ApngStreamWriter(path, comp.size, 'RGB', fps) as apng, WebpAnimWriter(webp, comp.size, fps) as anim:
+        for t in times:
+            box = comp.render({'card': Sprite(card_img, (x, y)), ...})   # changed region or None
+            apng.add_frame(comp.canvas, box)
+            anim.add_frame(comp.canvas, box)
+
+- sprites are keyed; a sprite that moved, appeared or disappeared dirties its old and
+  new rectangles, a sprite whose image changed in place only the pixels that differ
+  (images are compared only when they are not the same object, so cache sprite images)
+- dirty rectangles that overlap are merged; each is repainted from the background and
+  the sprites over it, in key order (later keys on top), and pasted into the canvas
+- render() returns the bounding box of the frame's changes, which is what the frame
+  encoders store: APNG (png_stream.ApngStreamWriter) and animated WebP (ANMF frames at
+  even offsets, no blending) keep only that region, and frames without changes
+  lengthen the previous frame; FrameSequence writes every frame as a numbered PNG for
+  video tools, unchanged frames as hard links to the previous one
+"""
+import io
+import os
+import re
+import struct
+from typing import NamedTuple, Optional
+
+from PIL import Image, ImageChops
+
+from write_behind import PROFILES, copy_file, flush_writes, save_async, write_bytes
+
+
+class Sprite(NamedTuple):
+    image: Image.Image  # same mode as the background
+    xy: tuple
+    mask: Optional[Image.Image] = None  # 'L' coverage, None for opaque
+
+
+def _rect(sprite: Sprite) -> tuple:
+    x, y = sprite.xy
+    return (x, y, x + sprite.image.width, y + sprite.image.height)
+
+
+def union(a, b):
+    if a is None or b is None:
+        return a or b
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _overlap(a, b) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def merge_rects(rects) -> list:
+    """Rectangles with every overlapping pair replaced by their union."""
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rects)):
+            for j in range(i + 1, len(rects)):
+                if _overlap(rects[i], rects[j]):
+                    rects[i] = union(rects[i], rects.pop(j))
+                    merged = True
+                    break
+            if merged:
+                break
+    return rects
+
+
+def _changed(old: Sprite, new: Sprite):
+    """Region of the canvas a sprite change touches, or None."""
+    if old.image is new.image and old.mask is new.mask and old.xy == new.xy:
+        return None
+    if old.xy != new.xy or old.image.size != new.image.size or (old.mask is None) != (new.mask is None):
+        return union(_rect(old), _rect(new))
+    box = None
+    for a, b in ((old.image, new.image), (old.mask, new.mask)):
+        if a is not b:
+            box = union(box, ImageChops.difference(a, b).getbbox())
+    if box is None:
+        return None
+    x, y = new.xy
+    return (x + box[0], y + box[1], x + box[2], y + box[3])
+
+
+class Compositor:
+    def __init__(self, background: Image.Image):
+        self.background = background
+        self.canvas = background.copy()
+        self.size = background.size
+        self.sprites = {}
+        self.frames = 0
+        self.repainted = 0  # pixels repainted over all frames
+
+    def _clip(self, rect):
+        w, h = self.size
+        rect = (max(rect[0], 0), max(rect[1], 0), min(rect[2], w), min(rect[3], h))
+        return rect if rect[0] < rect[2] and rect[1] < rect[3] else None
+
+    def dirty_rects(self, sprites: dict) -> list:
+        rects = []
+        for key in self.sprites.keys() | sprites.keys():
+            old, new = self.sprites.get(key), sprites.get(key)
+            rects.append(_changed(old, new) if old and new else _rect(old or new))
+        old_order = [k for k in self.sprites if k in sprites]
+        new_order = [k for k in sprites if k in self.sprites]
+        for a, b in zip(old_order, new_order):  # restacked sprites
+            if a != b:
+                rects += [_rect(sprites[a]), _rect(sprites[b])]
+        return merge_rects(r for r in map(self._clip, filter(None, rects)) if r)
+
+    def render(self, sprites: dict):
+        """Move to the next frame; returns the bounding box of what changed, None if nothing did."""
+        rects = self.dirty_rects(sprites) if self.frames else [(0, 0) + self.size]
+        for rect in rects:
+            region = self.background.crop(rect)
+            for sprite in sprites.values():
+                if _overlap(rect, _rect(sprite)):
+                    region.paste(sprite.image, (sprite.xy[0] - rect[0], sprite.xy[1] - rect[1]), sprite.mask)
+            self.canvas.paste(region, rect[:2])
+            self.repainted += (rect[2] - rect[0]) * (rect[3] - rect[1])
+        self.sprites = dict(sprites)
+        self.frames += 1
+        box = None
+        for rect in rects:
+            box = union(box, rect)
+        return box
+
+
+# ---------------------------------------------------------------- animated WebP
+
+def _riff_chunks(data: bytes, start: int):
+    while start + 8 <= len(data):
+        tag, size = data[start:start + 4], struct.unpack_from('<I', data, start + 4)[0]
+        yield tag, data[start:start + 8 + size + (size & 1)]
+        start += 8 + size + (size & 1)
+
+
+def _chunk(tag: bytes, payload: bytes) -> bytes:
+    return tag + struct.pack('<I', len(payload)) + payload + b'\0' * (len(payload) & 1)
+
+
+def _u24(v: int) -> bytes:
+    return struct.pack('<I', v)[:3]
+
+
+class WebpAnimWriter:
+    """
+    Animated WebP muxed frame by frame: each changed region is encoded as a still WebP
+    (write_behind profile) and stored as an ANMF frame. The file is written on close.
+    """
+
+    def __init__(self, path: str, size, fps: int, loop: int = 0, profile='webp-lossless', background=(255, 255, 255, 255)):
+        self.path = path
+        self.width, self.height = size
+        self.fps = fps
+        self.loop = loop
+        self.options = PROFILES[profile][1]
+        self.background = background
+        self.frames = 0
+        self.changed = None
+        self._ticks = 0  # add_frame() calls
+        self._anmf = io.BytesIO()
+        self._pending = None  # [box, frame chunks, first tick]
+
+    def _timestamp(self, tick: int) -> int:
+        return round(tick * 1000 / self.fps)
+
+    def add_frame(self, img, box):
+        """Same contract as ApngStreamWriter.add_frame()."""
+        tick = self._ticks
+        self._ticks += 1
+        if self._pending is not None and box is None:
+            return
+        if self._pending is None:
+            box = (0, 0, self.width, self.height)
+        self._write_pending(tick)
+        box = (box[0] & ~1, box[1] & ~1, box[2], box[3])  # ANMF offsets are stored halved
+        buf = io.BytesIO()
+        img.crop(box).save(buf, 'WEBP', **self.options)
+        data = buf.getvalue()
+        frame = b''.join(c for tag, c in _riff_chunks(data, 12) if tag in (b'ALPH', b'VP8 ', b'VP8L'))
+        self._pending = [box, frame, tick]
+
+    def _write_pending(self, tick: int):
+        if self._pending is None:
+            return
+        (x0, y0, x1, y1), frame, start = self._pending
+        duration = self._timestamp(tick) - self._timestamp(start)
+        header = _u24(x0 // 2) + _u24(y0 // 2) + _u24(x1 - x0 - 1) + _u24(y1 - y0 - 1) + _u24(duration)
+        self._anmf.write(_chunk(b'ANMF', header + b'\x02' + frame))  # no blending, no disposal
+        self.frames += 1
+        self._pending = None
+
+    def close(self):
+        if self._pending is None:
+            raise ValueError('WebP animation closed without frames')
+        self._write_pending(self._ticks)
+        r, g, b, a = self.background
+        vp8x = _chunk(b'VP8X', b'\x02\0\0\0' + _u24(self.width - 1) + _u24(self.height - 1))  # animation flag
+        anim = _chunk(b'ANIM', bytes((b, g, r, a)) + struct.pack('<H', self.loop))
+        body = b'WEBP' + vp8x + anim + self._anmf.getvalue()
+        self.changed = write_bytes(self.path, b'RIFF' + struct.pack('<I', len(body)) + body)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        return False
+
+
+# ---------------------------------------------------------------- image sequence
+
+class FrameSequence:
+    """frame_0000.png, frame_0001.png ... in directory (e.g. ffmpeg -framerate 30 -i frame_%04d.png)."""
+    PATTERN = 'frame_{:04d}.png'
+
+    def __init__(self, directory: str, profile='png-fast'):
+        self.directory = directory
+        self.profile = profile
+        self.frames = 0
+        self.encoded = 0
+        self._links = []  # (existing frame, frame that repeats it), made once the writes are done
+        self._last = None
+        os.makedirs(directory, exist_ok=True)
+
+    def add_frame(self, img, box):
+        path = os.path.join(self.directory, self.PATTERN.format(self.frames))
+        self.frames += 1
+        if box is None and self._last is not None:
+            self._links.append((self._last, path))
+            return
+        save_async(img.copy(), path, self.profile)  # the canvas keeps changing
+        self._last = path
+        self.encoded += 1
+
+    def close(self):
+        flush_writes()
+        for src, dst in self._links:
+            if os.path.exists(dst):
+                if os.path.samefile(src, dst):
+                    continue
+                os.unlink(dst)
+            try:
+                os.link(src, dst)
+            except OSError:  # no hard links on this file system
+                copy_file(src, dst)
+        pattern = re.compile(r'frame_(\d+)\.png$')
+        for name in os.listdir(self.directory):  # frames of a longer earlier run
+            m = pattern.match(name)
+            if m and int(m.group(1)) >= self.frames:
+                os.unlink(os.path.join(self.directory, name))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        return False
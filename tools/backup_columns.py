@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Compact columnar archive of plant_water_buddy_backup.json (.pwbc), for keeping and
+analysing many device backups without re-parsing indented JSON.
+
+Layout (little-endian):
+  8 bytes   magic b'PWBCOLS1'
+  uint32    header length, then a UTF-8 JSON header: version / exportedAt of the
+            backup, row count, and {column: [dtype, offset, count]}
+  columns   raw arrays, each 64-byte aligned, in the header's dtypes:
+    interval_days int32, notify_hour int8, notify_minute int8, is_active bool
+    watered_day int32 (epoch day of the lastWateredAt date fields), watered_sec int32
+    (second of that day), watered_us int32 (microseconds), watered_utc bool
+    id / name / image_path / extra: string tables - int32 code per row (-1 = null)
+    + uint64 offsets + UTF-8 blob of the distinct strings (names and image folders
+    repeat a lot; ids simply get one entry each)
+Rows keep the order of the backup, duplicates included. lastWateredAt is kept as
+DateTime.parse reads it: strings with an offset become UTC fields ('Z' when written
+back), others keep their local wall-clock fields. Missing notifyHour / notifyMinute /
+isActive get Plant.fromJson's defaults. Fields the app does not know are kept as
+a JSON object in `extra` and written back after the known ones.
+
+unpack writes the exportToJson layout again (2-space indent, Plant.toJson field order,
+DateTime.toIso8601String fractions), so app exports round-trip byte for byte.
+ColumnarBackup memory-maps an archive; column() returns zero-copy NumPy views and
+plant_columns() feeds forecast_watering / simulate_notifications directly.
+
+Usage:
+  python3 tools/backup_columns.py pack backup.json backup.pwbc
+  python3 tools/backup_columns.py unpack backup.pwbc backup.json
+  python3 tools/backup_columns.py info *.pwbc
+"""
+import argparse
+import datetime
+import json
+import mmap
+import os
+import re
+import struct
+import tempfile
+import time
+
+from forecast_watering import PlantColumns, utf16_key
+from generate_backup import dart_iso_strings
+from merge_backups import BACKUP_VERSION, BackupFormatError, read_backup, watered_us
+from write_behind import replace_file
+
+try:
+    import numpy as np
+except ImportError:
+    raise SystemExit('❌ numpy가 필요합니다: pip install numpy')
+
+MAGIC = b'PWBCOLS1'
+FORMAT_VERSION = 1
+ALIGN = 64
+KNOWN_FIELDS = ('id', 'name', 'imagePath', 'intervalDays', 'lastWateredAt', 'notifyHour', 'notifyMinute', 'isActive')
+STRING_COLUMNS = ('id', 'name', 'image_path', 'extra')
+NUMERIC_COLUMNS = {
+    'interval_days': '<i4',
+    'notify_hour': 'i1',
+    'notify_minute': 'i1',
+    'is_active': '?',
+    'watered_day': '<i4',
+    'watered_sec': '<i4',
+    'watered_us': '<i4',
+    'watered_utc': '?',
+}
+DAY = 86400
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+_NEEDS_ESCAPE = re.compile(rb'[\x00-\x1f"\\]')
+_HEADER_LEN = struct.Struct('<I')
+
+RECORD = (b'    {\n'
+          b'      "id": %s,\n'
+          b'      "name": %s,\n'
+          b'      "imagePath": %s,\n'
+          b'      "intervalDays": %d,\n'
+          b'      "lastWateredAt": "%s",\n'
+          b'      "notifyHour": %d,\n'
+          b'      "notifyMinute": %d,\n'
+          b'      "isActive": %s%s\n'
+          b'    }')
+_BOOL = (b'false', b'true')
+
+
+class _StringTable:
+    """Distinct strings in first-seen order, one code per row."""
+
+    def __init__(self):
+        self.codes = {}
+        self.rows = []
+
+    def add(self, value):
+        if value is None:
+            self.rows.append(-1)
+            return
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.codes)
+        self.rows.append(code)
+
+    def arrays(self) -> tuple:
+        encoded = [s.encode('utf-8') for s in self.codes]
+        offsets = np.zeros(len(encoded) + 1, dtype='<u8')
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return np.array(self.rows, dtype='<i4'), offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+
+def _split_watered(value: str) -> tuple:
+    """(epoch day, second of day, microseconds, is UTC) of DateTime.parse(value)'s fields."""
+    dt = datetime.datetime.fromisoformat(value)
+    utc = dt.tzinfo is not None
+    if utc:
+        dt = dt.astimezone(datetime.timezone.utc)
+    return dt.toordinal() - _EPOCH_ORDINAL, dt.hour * 3600 + dt.minute * 60 + dt.second, dt.microsecond, utc
+
+
+def _int_field(record: dict, key: str, default, where: str) -> int:
+    value = record.get(key)
+    if value is None:
+        if default is None:
+            raise BackupFormatError(f'{where}: {key} 없음')
+        return default
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise BackupFormatError(f'{where}: {key}는 정수여야 함 ({value!r})')
+    return value
+
+
+def pack(json_path: str, out_path: str) -> int:
+    """Convert one backup; returns the number of rows."""
+    header = {}
+    strings = {name: _StringTable() for name in STRING_COLUMNS}
+    numeric = {name: [] for name in NUMERIC_COLUMNS}
+
+    def on_header(key, value):
+        header[key] = value
+
+    for n, record in enumerate(read_backup(json_path, on_header)):
+        where = f'{json_path} #{n}'
+        if not isinstance(record, dict) or not isinstance(record.get('id'), str) or not isinstance(record.get('name'), str):
+            raise BackupFormatError(f'{where}: id / name이 없는 레코드')
+        try:
+            day, sec, micro, utc = _split_watered(record['lastWateredAt'])
+        except (KeyError, TypeError, ValueError):
+            raise BackupFormatError(f"{where}: lastWateredAt 형식 오류 ({record.get('lastWateredAt')!r})")
+        image = record.get('imagePath')
+        if image is not None and not isinstance(image, str):
+            raise BackupFormatError(f'{where}: imagePath 형식 오류 ({image!r})')
+        active = record.get('isActive')
+        extra = {k: v for k, v in record.items() if k not in KNOWN_FIELDS}
+        strings['id'].add(record['id'])
+        strings['name'].add(record['name'])
+        strings['image_path'].add(image)
+        strings['extra'].add(json.dumps(extra, ensure_ascii=False) if extra else None)
+        numeric['interval_days'].append(_int_field(record, 'intervalDays', None, where))
+        numeric['notify_hour'].append(_int_field(record, 'notifyHour', 9, where))
+        numeric['notify_minute'].append(_int_field(record, 'notifyMinute', 0, where))
+        numeric['is_active'].append(True if active is None else bool(active))
+        numeric['watered_day'].append(day)
+        numeric['watered_sec'].append(sec)
+        numeric['watered_us'].append(micro)
+        numeric['watered_utc'].append(utc)
+
+    arrays = {name: np.array(values, dtype=NUMERIC_COLUMNS[name]) for name, values in numeric.items()}
+    for name, table in strings.items():
+        arrays[name], arrays[name + '.offsets'], arrays[name + '.blob'] = table.arrays()
+    rows = len(numeric['interval_days'])
+    _write(out_path, arrays, {
+        'format': FORMAT_VERSION,
+        'rows': rows,
+        'version': header.get('version', BACKUP_VERSION),
+        'exportedAt': header.get('exportedAt'),
+    })
+    return rows
+
+
+def _write(path: str, arrays: dict, header: dict):
+    columns, offset = {}, 0
+    for name, array in arrays.items():
+        columns[name] = [array.dtype.str, offset, len(array)]
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+    header = dict(header, columns=columns)
+    # Column offsets are relative to the first aligned byte after the header
+    encoded = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    start = -(-(len(MAGIC) + _HEADER_LEN.size + len(encoded)) // ALIGN) * ALIGN
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(MAGIC + _HEADER_LEN.pack(len(encoded)) + encoded)
+            out.write(b'\0' * (start - out.tell()))
+            for name, array in arrays.items():
+                out.write(array.tobytes())
+                out.write(b'\0' * (-array.nbytes % ALIGN))
+        replace_file(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def is_columnar(path: str) -> bool:
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class StringColumn:
+    """Codes per row (-1 = null) into a table of distinct UTF-8 strings, all zero-copy."""
+
+    def __init__(self, codes, offsets, blob):
+        self.codes = codes
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.codes)
+
+    def entry(self, code: int) -> str:
+        return self.blob[int(self.offsets[code]):int(self.offsets[code + 1])].tobytes().decode('utf-8')
+
+    def __getitem__(self, row: int):
+        code = int(self.codes[row])
+        return None if code < 0 else self.entry(code)
+
+    def table(self) -> list:
+        """Every distinct string, by code."""
+        data = self.blob.tobytes()
+        bounds = self.offsets.tolist()
+        return [data[a:b].decode('utf-8') for a, b in zip(bounds, bounds[1:])]
+
+    def tolist(self) -> list:
+        table = self.table() + [None]  # code -1 picks the trailing None
+        return [table[c] for c in self.codes.tolist()]
+
+    def json_table(self) -> list:
+        """Every distinct string as a JSON literal (bytes)."""
+        data = self.blob.tobytes()
+        bounds = self.offsets.tolist()
+        if not _NEEDS_ESCAPE.search(data):
+            return [b'"' + data[a:b] + b'"' for a, b in zip(bounds, bounds[1:])]
+        return [json.dumps(data[a:b].decode('utf-8'), ensure_ascii=False).encode('utf-8')
+                for a, b in zip(bounds, bounds[1:])]
+
+
+class ColumnarBackup:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise BackupFormatError(f'{path}: 빈 파일')
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise BackupFormatError(f'{path}: .pwbc 파일이 아님')
+        length = _HEADER_LEN.unpack_from(self._mm, len(MAGIC))[0]
+        at = len(MAGIC) + _HEADER_LEN.size
+        self.header = json.loads(self._mm[at:at + length].decode('utf-8'))
+        if self.header.get('format') != FORMAT_VERSION:
+            self.close()
+            raise BackupFormatError(f'{path}: 지원하지 않는 형식 버전 {self.header.get("format")}')
+        self._start = -(-(at + length) // ALIGN) * ALIGN
+        self.rows = self.header['rows']
+
+    def close(self):
+        try:
+            self._mm.close()
+        except BufferError:  # column views still in use: the mapping goes away with the last one
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __len__(self):
+        return self.rows
+
+    def column(self, name: str):
+        """Zero-copy read-only view of a fixed-width column (valid until close())."""
+        dtype, offset, count = self.header['columns'][name]
+        return np.frombuffer(self._mm, dtype=np.dtype(dtype), count=count, offset=self._start + offset)
+
+    def strings(self, name: str) -> StringColumn:
+        return StringColumn(self.column(name), self.column(name + '.offsets'), self.column(name + '.blob'))
+
+    def watered_iso(self) -> list:
+        """lastWateredAt per row as DateTime.toIso8601String() writes it (bytes)."""
+        micros = (self.column('watered_day').astype(np.int64) * DAY + self.column('watered_sec')) * 10 ** 6 \
+            + self.column('watered_us')
+        text = dart_iso_strings(micros.astype('datetime64[us]'))
+        return [t + b'Z' if utc else t for t, utc in zip(text.tolist(), self.column('watered_utc').tolist())]
+
+    def plant_columns(self) -> tuple:
+        """
+        (PlantColumns, {id: lastWateredAt}) as forecast_watering.load_backup builds them:
+        duplicate ids resolved like importFromJson, rows in box order.
+        """
+        ids = self.strings('id')
+        codes = ids.codes
+        rows = np.arange(self.rows)
+        if len(np.unique(codes)) != len(codes):
+            rows = self._import_winners()
+        id_table = ids.table()
+        row_ids = [id_table[c] for c in codes[rows].tolist()]
+        order = sorted(range(len(rows)), key=lambda i: utf16_key(row_ids[i]))
+        rows = rows[order]
+        names = self.strings('name')
+        name_table = names.table()
+        watered = self.watered_iso()
+        cols = PlantColumns(
+            ids=[row_ids[i] for i in order],
+            names=[name_table[c] for c in names.codes[rows].tolist()],
+            interval=self.column('interval_days')[rows],
+            last_day=self.column('watered_day')[rows],
+            notify_hour=self.column('notify_hour')[rows],
+            notify_minute=self.column('notify_minute')[rows],
+            active=self.column('is_active')[rows],
+        )
+        return cols, {i: watered[r].decode() for i, r in zip(cols.ids, rows.tolist())}
+
+    def _import_winners(self):
+        """Row of each id after importing the rows in order: a later row wins only if strictly later."""
+        watered = self.watered_iso()
+        best = {}
+        for row, code in enumerate(self.strings('id').codes.tolist()):
+            when = watered_us(watered[row].decode())
+            current = best.get(code)
+            if current is None or when > current[0]:
+                best[code] = (when, row)
+        return np.array(sorted(row for _, row in best.values()), dtype=np.int64)
+
+
+def _extra_lines(extra: str) -> bytes:
+    """Unknown fields as they follow isActive in an indented record."""
+    fields = json.dumps(json.loads(extra), indent=2, ensure_ascii=False)[2:-2]  # drop '{\n' and '\n}'
+    return b',\n' + '\n'.join('    ' + line for line in fields.split('\n')).encode('utf-8')
+
+
+def unpack(path: str, json_path: str) -> int:
+    with ColumnarBackup(path) as backup:
+        header = {'version': backup.header['version'], 'exportedAt': backup.header['exportedAt']}
+        tables = {name: backup.strings(name) for name in STRING_COLUMNS}
+        literals = {name: col.json_table() for name, col in tables.items() if name != 'extra'}
+        extras = [b''] * backup.rows
+        extra_codes = tables['extra'].codes.tolist()
+        if any(c >= 0 for c in extra_codes):
+            extra_table = [_extra_lines(e) for e in tables['extra'].table()]
+            extras = [extra_table[c] if c >= 0 else b'' for c in extra_codes]
+        image_literals = literals['image_path'] + [b'null']
+        records = map(RECORD.__mod__, zip(
+            [literals['id'][c] for c in tables['id'].codes.tolist()],
+            [literals['name'][c] for c in tables['name'].codes.tolist()],
+            [image_literals[c] for c in tables['image_path'].codes.tolist()],
+            backup.column('interval_days').tolist(),
+            backup.watered_iso(),
+            backup.column('notify_hour').tolist(),
+            backup.column('notify_minute').tolist(),
+            [_BOOL[a] for a in backup.column('is_active').tolist()],
+            extras,
+        ))
+        text = json.dumps(header, indent=2, ensure_ascii=False).encode('utf-8')
+        directory = os.path.dirname(os.path.abspath(json_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                out.write(text[:-2] + b',\n  "plants": [')
+                if backup.rows:
+                    out.write(b'\n' + b',\n'.join(records) + b'\n  ]\n}')
+                else:
+                    out.write(b']\n}')
+            replace_file(tmp, json_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return backup.rows
+
+
+def info(paths) -> None:
+    intervals = np.zeros(0, dtype=np.int64)
+    total = active = 0
+    for path in paths:
+        with ColumnarBackup(path) as backup:
+            interval = backup.column('interval_days')
+            n_active = int(backup.column('is_active').sum())
+            print(f'🗜️ {path}: {backup.rows:,}행 (활성 {n_active:,}), {os.path.getsize(path) / 1e6:,.1f} MB, '
+                  f'이름 {len(backup.strings("name").offsets) - 1:,}종, exportedAt {backup.header["exportedAt"]}')
+            counts = np.bincount(np.clip(interval, 0, None))
+            intervals = np.pad(intervals, (0, max(0, len(counts) - len(intervals))))
+            intervals[:len(counts)] += counts
+            total += backup.rows
+            active += n_active
+    if len(paths) > 1:
+        print(f'📊 합계: {total:,}행 (활성 {active:,})')
+    top = np.argsort(-intervals, kind='stable')[:5]
+    print('   주기 상위: ' + ', '.join(f'{d}일 {int(intervals[d]):,}' for d in top if intervals[d]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert backups to and from the .pwbc columnar format')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('pack', help='JSON backup -> .pwbc')
+    p.add_argument('input')
+    p.add_argument('output')
+    p = sub.add_parser('unpack', help='.pwbc -> JSON backup')
+    p.add_argument('input')
+    p.add_argument('output')
+    p = sub.add_parser('info', help='summary of one or more .pwbc files')
+    p.add_argument('inputs', nargs='+')
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    try:
+        if args.command == 'pack':
+            rows = pack(args.input, args.output)
+            ratio = os.path.getsize(args.output) / max(os.path.getsize(args.input), 1)
+            print(f'✅ {args.input} → {args.output}: {rows:,}행, 크기 {ratio:.0%} ({time.perf_counter() - t0:.1f}s)')
+        elif args.command == 'unpack':
+            rows = unpack(args.input, args.output)
+            print(f'✅ {args.input} → {args.output}: {rows:,}행 ({time.perf_counter() - t0:.1f}s)')
+        else:
+            info(args.inputs)
+            print(f'⏱️ {time.perf_counter() - t0:.2f}s')
+    except (OSError, ValueError) as e:
+        raise SystemExit(f'❌ 변환 실패: {e}')
+
+
+if __name__ == '__main__':
+    main()
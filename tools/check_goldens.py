@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Golden-image regression check for the generated assets.
+
+Every target is rendered in-process and compared with test/goldens/<target>.png:
+1. pixel hash   blake2b of the raw pixels, stored in goldens.json;
+                equal hash = identical image, the golden PNG is not even decoded
+2. dHash        64-bit perceptual hash; a large Hamming distance fails whatever the tolerance
+3. array diff   per-channel absolute difference with a per-target tolerance:
+                fails when more than `ratio` of the pixels differ by more than `max_diff`
+On failure the actual image and a diff heatmap are written to build/goldens/.
+
+Text is rendered with the font bundled in Pillow (see fonts.py) unless PWB_FONT is set,
+so the goldens do not depend on the fonts installed on the machine. That also turns the
+fallback fonts and the emoji atlas off for the generators; fallback_text checks both
+with a chain of the bundled font and a font generated by fonts.box_font().
+
+Usage:
+  python3 tools/check_goldens.py [-k feature_] [--update]
+  --update  re-record the goldens of the selected targets (review the PNG diff before committing)
+"""
+import argparse
+import functools
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+from PIL import Image
+
+from fonts import use_headless_font
+
+try:
+    import numpy as np
+except ImportError:
+    raise SystemExit('❌ numpy가 필요합니다: pip install numpy')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GOLDEN_DIR = os.path.join(ROOT, 'test', 'goldens')
+MANIFEST_PATH = os.path.join(GOLDEN_DIR, 'goldens.json')
+OUT_DIR = os.path.join(ROOT, 'build', 'goldens')
+
+DHASH_LIMIT = 10  # bits out of 64; beyond this the images are clearly different
+
+# Tolerances: pure pixel math is exact; text and resampling allow small FreeType / libjpeg drift
+EXACT = {'max_diff': 0, 'ratio': 0.0}
+TEXT = {'max_diff': 24, 'ratio': 0.002}
+
+
+@functools.lru_cache(maxsize=None)
+def _icon():
+    from create_icon import create_app_icon
+    return create_app_icon(512)  # same drawing code as 1024, a quarter of the pixels
+
+
+def _rounded_icon():
+    from create_icon import create_rounded_icon
+    return create_rounded_icon(_icon(), radius=90)
+
+
+def _variant(name):
+    def render():
+        import generate_feature_graphic_variants as variants
+        return getattr(variants, name)()
+    return render
+
+
+def _premium():
+    import generate_feature_graphic_premium as premium
+    return premium.render()
+
+
+def _v2():
+    import generate_feature_graphic_v2 as v2
+    return v2.render()
+
+
+FALLBACK_TEXT = '✓ D‑day 물주기 🌿'
+
+
+def _fallback_text():
+    """Run splitting, baseline alignment and text_bbox of a fallback chain, and atlas blitting,
+    with the bundled font in front of a generated font that covers the rest of the string."""
+    from PIL import ImageDraw
+    from emoji_atlas import EmojiAtlas, draw_emoji_text
+    from fonts import box_font, bundled_font, chain_font, draw_text, text_bbox
+
+    boxes = box_font(ord(ch) for ch in FALLBACK_TEXT if ord(ch) > 0x7F)
+    img = Image.new('RGB', (480, 220), (255, 255, 255))
+    draw = ImageDraw.Draw(img)
+    y = 10
+    for size in (24, 40):
+        font = chain_font(bundled_font(), size, fallbacks=[boxes])
+        draw_text(draw, (10, y), FALLBACK_TEXT, font, fill=(36, 56, 46))
+        draw.rectangle(text_bbox(draw, (10, y), FALLBACK_TEXT, font), outline=(220, 60, 60))
+        y += size + 24
+    draw_emoji_text(img, (10, y), FALLBACK_TEXT, chain_font(bundled_font(), 40, fallbacks=[boxes]),
+                    fill=(36, 56, 46), atlas=EmojiAtlas(boxes, strikes=(32, 64)))
+    return img
+
+
+def _screen(name):
+    def render():
+        import create_screenshots
+        return getattr(create_screenshots, name)()
+    return render
+
+
+# target -> (render function, tolerance)
+TARGETS = {
+    'icon_512': (_icon, EXACT),
+    'icon_rounded_512': (_rounded_icon, EXACT),
+    'feature_variant_a': (_variant('variant_a'), TEXT),
+    'feature_variant_b': (_variant('variant_b'), TEXT),
+    'feature_variant_c': (_variant('variant_c'), TEXT),
+    'feature_premium': (_premium, TEXT),
+    'feature_v2': (_v2, TEXT),
+    'fallback_text': (_fallback_text, TEXT),
+    'screenshot_1_home': (_screen('screenshot_1_home'), TEXT),
+    'screenshot_2_add': (_screen('screenshot_2_add'), TEXT),
+    'screenshot_3_detail': (_screen('screenshot_3_detail'), TEXT),
+    'screenshot_4_notification': (_screen('screenshot_4_notification'), TEXT),
+}
+
+
+def pixel_hash(img: Image.Image) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f'{img.mode} {img.size}'.encode())
+    h.update(img.tobytes())
+    return h.hexdigest()
+
+
+def dhash(img: Image.Image) -> int:
+    """Difference hash: sign of horizontal gradients of a 9x8 grayscale thumbnail."""
+    small = np.asarray(img.convert('L').resize((9, 8), Image.Resampling.BOX), dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int(''.join('1' if b else '0' for b in bits), 2)
+
+
+def heatmap(golden: np.ndarray, diff: np.ndarray) -> Image.Image:
+    """Dimmed grayscale golden with differing pixels in red (brighter = larger difference)."""
+    gray = golden[..., :3].mean(axis=2) * 0.35
+    out = np.repeat(gray[..., None], 3, axis=2)
+    mask = diff > 0
+    out[mask, 0] = 80 + diff[mask] * (175 / 255)
+    out[mask, 1:] = 0
+    return Image.fromarray(out.astype(np.uint8), 'RGB')
+
+
+def compare(name: str, actual: Image.Image, entry, tol) -> tuple:
+    """Return (ok, detail)."""
+    if entry is None or not os.path.exists(os.path.join(GOLDEN_DIR, name + '.png')):
+        return False, '골든 없음 (--update 로 생성)'
+    if pixel_hash(actual) == entry['pixel_hash']:
+        return True, 'identical'
+
+    golden_img = Image.open(os.path.join(GOLDEN_DIR, name + '.png'))
+    if golden_img.mode != actual.mode or golden_img.size != actual.size:
+        return False, f'{actual.mode} {actual.size} ≠ golden {golden_img.mode} {golden_img.size}'
+    golden = np.asarray(golden_img, dtype=np.int16)
+    diff = np.abs(np.asarray(actual, dtype=np.int16) - golden)
+    diff = diff.max(axis=2) if diff.ndim == 3 else diff
+
+    distance = bin(dhash(actual) ^ entry['dhash']).count('1')
+    bad = int((diff > tol['max_diff']).sum())
+    ratio = bad / diff.size
+    ok = distance <= DHASH_LIMIT and ratio <= tol['ratio']
+    detail = f'dHash Δ{distance}, {bad:,}px > {tol["max_diff"]} ({ratio:.3%}), max {int(diff.max())}'
+    if not ok:
+        os.makedirs(OUT_DIR, exist_ok=True)
+        actual.save(os.path.join(OUT_DIR, name + '-actual.png'))
+        heatmap(golden, diff).save(os.path.join(OUT_DIR, name + '-diff.png'))
+    return ok, detail
+
+
+def load_manifest() -> dict:
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+    with open(MANIFEST_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare generated assets with the stored goldens')
+    parser.add_argument('-k', '--filter', default='', help='regex on target names')
+    parser.add_argument('--update', action='store_true', help='re-record goldens for the selected targets')
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # generators resolve some asset paths relative to the repo root
+    sys.path.append(ROOT)  # create_icon.py
+    use_headless_font()
+    names = [n for n in TARGETS if re.search(args.filter, n)]
+    if not names:
+        raise SystemExit(f'❌ 일치하는 대상이 없습니다: {args.filter}')
+    manifest = load_manifest()
+
+    failures = 0
+    t_start = time.perf_counter()
+    for name in names:
+        render, tol = TARGETS[name]
+        t0 = time.perf_counter()
+        img = render()
+        ms = (time.perf_counter() - t0) * 1000
+        if args.update:
+            os.makedirs(GOLDEN_DIR, exist_ok=True)
+            img.save(os.path.join(GOLDEN_DIR, name + '.png'), optimize=True)
+            manifest[name] = {'size': list(img.size), 'mode': img.mode,
+                              'pixel_hash': pixel_hash(img), 'dhash': dhash(img)}
+            print(f'  📌 {name} ({ms:.0f} ms)')
+            continue
+        ok, detail = compare(name, img, manifest.get(name), tol)
+        failures += not ok
+        print(f"  {'✅' if ok else '❌'} {name:<28} {detail} ({ms:.0f} ms)")
+
+    elapsed = time.perf_counter() - t_start
+    if args.update:
+        with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(manifest.items())), f, indent=2)
+            f.write('\n')
+        print(f'\n📌 골든 {len(names)}개 갱신 ({elapsed:.1f}s): {os.path.relpath(GOLDEN_DIR, ROOT)}')
+        return
+    if failures:
+        print(f'\n❌ {failures}/{len(names)}개 불일치 ({elapsed:.1f}s). 비교 이미지: {os.path.relpath(OUT_DIR, ROOT)}')
+        sys.exit(1)
+    print(f'\n✅ 골든 {len(names)}개 일치 ({elapsed:.1f}s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -5,7 +5,9 @@ Usage:
   python3 tools/choose_feature_graphic.py [a|b|c|v2]
 Default picks 'b'. Copies the chosen file to assets/store_graphics/feature_graphic.png
 """
-import os, sys, shutil
+import os, sys
+
+from write_behind import copy_file
 
 ROOT = os.path.dirname(os.path.dirname(__file__))  # .../plant_water_buddy_lite
 ASSETS_PRIMARY = os.path.join(ROOT, 'assets', 'store_graphics')
@@ -38,5 +40,7 @@ if not src or not os.path.exists(src):
 
 dst = os.path.join(ASSETS_PRIMARY, 'feature_graphic.png')
 os.makedirs(ASSETS_PRIMARY, exist_ok=True)
-shutil.copyfile(src, dst)
-print('✅ 기본 Feature Graphic으로 설정됨:', os.path.relpath(dst, ROOT))
+if copy_file(src, dst):
+    print('✅ 기본 Feature Graphic으로 설정됨:', os.path.relpath(dst, ROOT))
+else:
+    print('✅ 이미 기본 Feature Graphic입니다 (변경 없음):', os.path.relpath(dst, ROOT))
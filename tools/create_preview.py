@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Generate the animated store preview (1080x2340, 10 s at 30 fps) from the screenshot
+templates of create_screenshots.py: the plant cards slide in, the first card's D-day
+counts down, then the watering notification drops in and goes away again.
+Outputs:
+  assets/store_graphics/preview/store_preview.png   (APNG)
+  assets/store_graphics/preview/store_preview.webp  (animated WebP)
+  build/preview/frames/frame_0000.png ...           (image sequence for video tools)
+
+The home screen without cards is the background; cards and the notification are
+sprites rendered once (per D-day value), and every frame repaints only the dirty
+rectangles (see animation.py). The encoders store only the changed region of each
+frame and merge frames without changes, so only the first frame is a full image.
+
+Usage:
+  python3 tools/create_preview.py [--fps 30] [--seconds 10] [--formats apng,webp,frames] [--lossy] [--profile]
+"""
+import argparse
+import functools
+import os
+import time
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from animation import Compositor, FrameSequence, Sprite, WebpAnimWriter
+from create_screenshots import (BG, CARD_H, HOME_PLANTS, NOTIF_H, SAFE_X, STATUS_BAR_H, W, H,
+                                draw_notification_card, draw_plant_card, home_card_y, screenshot_1_home)
+from png_stream import ApngStreamWriter
+from profiling import stage, enable_from_argv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUT_DIR = os.path.join(ROOT, 'assets', 'store_graphics', 'preview')
+FRAMES_DIR = os.path.join(ROOT, 'build', 'preview', 'frames')
+FORMATS = ('apng', 'webp', 'frames')
+
+# Timeline (seconds)
+SLIDE_START, SLIDE_STAGGER, SLIDE_TIME = 0.3, 0.2, 0.6   # cards, one after another from the right
+COUNTDOWN = ((0.0, '3'), (2.0, '2'), (3.0, '1'), (4.0, 'day'))  # D-day of the first card
+DROP_START, DROP_TIME = 5.0, 0.5                          # notification comes down ...
+LIFT_START, LIFT_TIME = 8.5, 0.4                          # ... and goes back up
+NOTIF_Y = STATUS_BAR_H + 20
+SHADOW_PAD = 24
+
+
+def ease_out(p: float) -> float:
+    return 1 - (1 - p) ** 3
+
+
+def progress(t: float, start: float, duration: float) -> float:
+    return min(max((t - start) / duration, 0.0), 1.0)
+
+
+@functools.lru_cache(maxsize=None)
+def card_sprite(i: int, days: str) -> Image.Image:
+    """i번째 홈 카드 (D-day 값별로 한 번만 렌더)"""
+    name, _, date, emoji = HOME_PLANTS[i]
+    strip = Image.new('RGB', (W, CARD_H), BG)
+    draw_plant_card(strip, ImageDraw.Draw(strip), 0, name, days, date, emoji)
+    return strip.crop((SAFE_X, 0, W - SAFE_X, CARD_H))
+
+
+@functools.lru_cache(maxsize=None)
+def notification_sprites():
+    """(카드, 마스크, 그림자 마스크): 둥근 모서리 밖은 아래 화면이 보이도록"""
+    strip = Image.new('RGB', (W + 1, NOTIF_H + 1), BG)
+    draw_notification_card(strip, ImageDraw.Draw(strip), 0)
+    card = strip.crop((SAFE_X, 0, W - SAFE_X + 1, NOTIF_H + 1))
+    mask = Image.new('L', card.size, 0)
+    ImageDraw.Draw(mask).rounded_rectangle([0, 0, card.width - 1, card.height - 1], radius=20, fill=255)
+    shadow = Image.new('L', (card.width + SHADOW_PAD * 2, card.height + SHADOW_PAD * 2), 0)
+    ImageDraw.Draw(shadow).rounded_rectangle([SHADOW_PAD, SHADOW_PAD + 8, SHADOW_PAD + card.width - 1,
+                                              SHADOW_PAD + card.height + 7], radius=20, fill=70)
+    return card, mask, shadow.filter(ImageFilter.GaussianBlur(12))
+
+
+@functools.lru_cache(maxsize=None)
+def _black(size) -> Image.Image:
+    return Image.new('RGB', size, (0, 0, 0))
+
+
+def sprites_at(t: float) -> dict:
+    """Sprites of the frame at t seconds, bottom to top."""
+    sprites = {}
+    days = [v for start, v in COUNTDOWN if t >= start][-1]
+    for i in range(len(HOME_PLANTS)):
+        p = progress(t, SLIDE_START + SLIDE_STAGGER * i, SLIDE_TIME)
+        if p > 0:
+            image = card_sprite(i, days if i == 0 else HOME_PLANTS[i][1])
+            sprites[f'card{i}'] = Sprite(image, (SAFE_X + round((1 - ease_out(p)) * (W - SAFE_X)), home_card_y(i)))
+    drop, lift = progress(t, DROP_START, DROP_TIME), progress(t, LIFT_START, LIFT_TIME)
+    if 0 < drop and lift < 1:
+        card, mask, shadow = notification_sprites()
+        top = -card.height - SHADOW_PAD * 2
+        y = round(top + (NOTIF_Y - top) * ease_out(drop) * (1 - lift ** 3))
+        sprites['shadow'] = Sprite(_black(shadow.size), (SAFE_X - SHADOW_PAD, y - SHADOW_PAD), shadow)
+        sprites['notification'] = Sprite(card, (SAFE_X, y), mask)
+    return sprites
+
+
+def main():
+    enable_from_argv('create_preview')
+    parser = argparse.ArgumentParser(description='Render the animated store preview (APNG, WebP, image sequence)')
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--formats', type=lambda v: [f for f in v.split(',') if f], default=list(FORMATS),
+                        help='apng, webp and/or frames (default: all)')
+    parser.add_argument('--lossy', action='store_true', help='lossy WebP (default: lossless)')
+    args = parser.parse_args()
+    if not args.formats or not set(args.formats) <= set(FORMATS) or args.fps < 1 or args.seconds <= 0:
+        raise SystemExit(f'❌ --formats는 {"/".join(FORMATS)} 중에서, --fps와 --seconds는 양수')
+
+    t0 = time.perf_counter()
+    with stage('background'):
+        comp = Compositor(screenshot_1_home(plants=()))
+    os.makedirs(OUT_DIR, exist_ok=True)
+    writers = {}
+    if 'apng' in args.formats:
+        writers['apng'] = ApngStreamWriter(os.path.join(OUT_DIR, 'store_preview.png'), (W, H), 'RGB', args.fps)
+    if 'webp' in args.formats:
+        writers['webp'] = WebpAnimWriter(os.path.join(OUT_DIR, 'store_preview.webp'), (W, H), args.fps,
+                                         profile='webp' if args.lossy else 'webp-lossless', background=BG + (255,))
+    if 'frames' in args.formats:
+        writers['frames'] = FrameSequence(FRAMES_DIR)
+    try:
+        frames = round(args.seconds * args.fps)
+        changed = 0
+        for i in range(frames):
+            with stage('compose'):
+                box = comp.render(sprites_at(i / args.fps))
+            changed += box is not None
+            for name, writer in writers.items():
+                with stage(name):
+                    writer.add_frame(comp.canvas, box)
+        for name, writer in writers.items():
+            with stage(name):
+                writer.close()
+    except BaseException:
+        if 'apng' in writers:
+            writers['apng'].abort()
+        raise
+
+    elapsed = time.perf_counter() - t0
+    print(f'🎞️ {frames}프레임 ({args.seconds:g}s, {args.fps}fps): 변경 {changed}프레임, '
+          f'다시 그린 픽셀 {comp.repainted / (frames * W * H) * 100:.1f}%')
+    for name in ('apng', 'webp'):
+        if name in writers:
+            w = writers[name]
+            print(f'✅ {os.path.relpath(w.path, ROOT)}: {w.frames}프레임, '
+                  f'{os.path.getsize(w.path) / 1024:,.0f} KB{"" if w.changed else " (변경 없음)"}')
+    if 'frames' in writers:
+        seq = writers['frames']
+        print(f'✅ {os.path.relpath(seq.directory, ROOT)}/: {seq.frames}장 (인코딩 {seq.encoded}장, 나머지는 하드 링크)')
+        print(f'   ffmpeg -framerate {args.fps} -i {os.path.relpath(seq.directory, ROOT)}/frame_%04d.png '
+              f'-pix_fmt yuv420p preview.mp4')
+    print(f'⏱️ {elapsed:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -6,10 +6,25 @@ Outputs:
   assets/store_graphics/screenshots/screenshot_2_add.png (식물 추가)
   assets/store_graphics/screenshots/screenshot_3_detail.png (식물 상세)
   assets/store_graphics/screenshots/screenshot_4_notification.png (알림 화면)
+
+Usage:
+  python3 tools/create_screenshots.py [--shard i/N] [--profile] [--backup FILE --photos DIR]
+  --shard i/N  render only the i-th of N slices into build/shards/ (see sharding.py)
+  --backup     plant cards show the photo of the same-named plant in this backup instead
+               of the emoji circle (thumbnails made by thumbnails.py; --photos as there)
 """
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
+import argparse
+import functools
 import os
 
+from emoji_atlas import draw_emoji_text, get_atlas
+from fonts import chain_font, draw_text
+from layer_cache import cached_layer, font_id, get_cache
+from profiling import stage, enable_from_argv
+from sharding import ShardRun, add_shard_argument
+from write_behind import flush_writes, get_writer, save_async
+
 W, H = 1080, 2340
 BG = (245, 250, 247)
 PRIMARY = (76, 175, 80)
@@ -19,6 +34,8 @@ TEXT_MID = (108, 117, 125)
 STATUS_BAR_H = 100
 APP_BAR_H = 140
 SAFE_X = 40
+CARD_H = 200
+NOTIF_H = 200
 
 ROOT = os.path.dirname(os.path.dirname(__file__))
 
@@ -27,13 +44,15 @@ FONT_PATHS = [
     '/System/Library/Fonts/AppleSDGothicNeo.ttc',
     '/System/Library/Fonts/Supplemental/AppleGothic.ttf',
 ]
+if os.environ.get('PWB_FONT'):  # explicit override (benchmarks, CI)
+    FONT_PATHS.insert(0, os.environ['PWB_FONT'])
 font_title = font_body = font_caption = None
 for p in FONT_PATHS:
     if os.path.exists(p):
         try:
-            font_title = ImageFont.truetype(p, 64)
-            font_body = ImageFont.truetype(p, 48)
-            font_caption = ImageFont.truetype(p, 38)
+            font_title = chain_font(p, 64)
+            font_body = chain_font(p, 48)
+            font_caption = chain_font(p, 38)
             break
         except:
             pass
@@ -41,21 +60,67 @@ if not font_title:
     font_title = ImageFont.load_default()
     font_body = font_title
     font_caption = font_title
+# FAB '+' and the big detail-screen emoji
+font_fab = chain_font(FONT_PATHS[0], 90) if os.path.exists(FONT_PATHS[0]) else font_title
+font_emoji_large = chain_font(FONT_PATHS[0], 120) if os.path.exists(FONT_PATHS[0]) else font_title
+
+# plant name -> imagePath, from --backup; cards of other plants keep the emoji circle
+PHOTOS = {}
+PHOTO_DIRS = []
+PHOTO_INDEX = None  # thumbnails.ThumbnailIndex, read once in main()
+
+def plant_photo(name: str, size: int):
+    """size x size thumbnail of the plant's photo, or None"""
+    if name not in PHOTOS:
+        return None
+    from thumbnails import load_thumbnail
+    return load_thumbnail(PHOTOS[name], size, PHOTO_DIRS, index=PHOTO_INDEX)
 
-def draw_status_bar(d: ImageDraw.ImageDraw):
+def paste_round_photo(img: Image.Image, photo: Image.Image, xy):
+    """사진을 원형으로 붙이기"""
+    mask = Image.new('L', photo.size, 0)
+    ImageDraw.Draw(mask).ellipse([0, 0, photo.width - 1, photo.height - 1], fill=255)
+    img.paste(photo, xy, mask)
+
+def paste_emoji(img: Image.Image, d: ImageDraw.ImageDraw, emoji: str, center, size: int, text_xy, font):
+    """이모지 아틀라스 셀을 center에 붙이기 (아틀라스에 없으면 글꼴로 text_xy에)"""
+    cell = get_atlas().cell(emoji, size)
+    if cell is None:
+        draw_text(d, text_xy, emoji, font=font, fill=TEXT_DARK)
+    else:
+        img.paste(cell, (center[0] - size // 2, center[1] - size // 2), cell)
+
+def draw_status_bar(img: Image.Image, d: ImageDraw.ImageDraw):
     """상태바 (시간, 배터리 등)"""
     d.rectangle([0, 0, W, STATUS_BAR_H], fill=(255, 255, 255))
-    d.text((SAFE_X, STATUS_BAR_H//2 - 20), "오후 3:24", font=font_caption, fill=TEXT_DARK)
-    d.text((W - SAFE_X - 140, STATUS_BAR_H//2 - 20), "100% 📶", font=font_caption, fill=TEXT_DARK)
+    draw_text(d, (SAFE_X, STATUS_BAR_H//2 - 20), "오후 3:24", font=font_caption, fill=TEXT_DARK)
+    draw_emoji_text(img, (W - SAFE_X - 140, STATUS_BAR_H//2 - 20), "100% 📶", font_caption, TEXT_DARK)
 
 def draw_app_bar(d: ImageDraw.ImageDraw, title: str):
     """앱바 (타이틀)"""
     d.rectangle([0, STATUS_BAR_H, W, STATUS_BAR_H + APP_BAR_H], fill=PRIMARY)
-    d.text((SAFE_X, STATUS_BAR_H + APP_BAR_H//2 - 30), title, font=font_title, fill=(255, 255, 255))
+    draw_text(d, (SAFE_X, STATUS_BAR_H + APP_BAR_H//2 - 30), title, font=font_title, fill=(255, 255, 255))
+
+def render_chrome(title=None):
+    """Status bar, plus the app bar when title is given, on a strip the width of the device"""
+    strip = Image.new('RGB', (W, STATUS_BAR_H + (APP_BAR_H if title else 0) + 1), BG)
+    d = ImageDraw.Draw(strip)
+    draw_status_bar(strip, d)
+    if title:
+        draw_app_bar(d, title)
+    return strip
+
+def paste_chrome(img: Image.Image, title=None):
+    """기기 크롬 (상태바 + 앱바), 레이어 캐시 사용"""
+    strip = cached_layer('screenshots/chrome', functools.partial(render_chrome, title),
+                         size=(W, H), colors=[BG, PRIMARY, TEXT_DARK], bars=[STATUS_BAR_H, APP_BAR_H, SAFE_X],
+                         fonts=[font_id(font_title), font_id(font_caption)], emoji=get_atlas().cache_id(),
+                         helpers=[draw_status_bar, draw_app_bar])
+    img.paste(strip, (0, 0))
 
 def draw_plant_card(img: Image.Image, d: ImageDraw.ImageDraw, y: int, name: str, days: str, water_date: str, emoji: str):
     """식물 카드 UI"""
-    card_h = 200
+    card_h = CARD_H
     card_x = SAFE_X
     card_w = W - SAFE_X * 2
     # 카드 배경
@@ -65,41 +130,46 @@ def draw_plant_card(img: Image.Image, d: ImageDraw.ImageDraw, y: int, name: str,
     cd.rounded_rectangle([2, 2, card_w, card_h], radius=24, outline=(220, 220, 220), width=3)
     card = card.filter(ImageFilter.GaussianBlur(0.3))
     img.paste(card, (card_x, y), card)
-    # 아이콘
-    d.ellipse([card_x + 30, y + 50, card_x + 130, y + 150], fill=(PRIMARY[0]+30, PRIMARY[1]+30, PRIMARY[2]+30))
-    d.text((card_x + 55, y + 70), emoji, font=font_title, fill=TEXT_DARK)
+    # 아이콘 (사진이 있으면 썸네일)
+    photo = plant_photo(name, 101)
+    if photo:
+        paste_round_photo(img, photo, (card_x + 30, y + 50))
+    else:
+        d.ellipse([card_x + 30, y + 50, card_x + 130, y + 150], fill=(PRIMARY[0]+30, PRIMARY[1]+30, PRIMARY[2]+30))
+        paste_emoji(img, d, emoji, (card_x + 80, y + 100), 64, (card_x + 55, y + 70), font_title)
     # 텍스트
-    d.text((card_x + 160, y + 50), name, font=font_body, fill=TEXT_DARK)
-    d.text((card_x + 160, y + 110), f"D-{days}  {water_date}", font=font_caption, fill=TEXT_MID)
+    draw_text(d, (card_x + 160, y + 50), name, font=font_body, fill=TEXT_DARK)
+    draw_text(d, (card_x + 160, y + 110), f"D-{days}  {water_date}", font=font_caption, fill=TEXT_MID)
+
+HOME_PLANTS = [
+    ("몬스테라", "2", "4월 12일", "🌿"),
+    ("다육이", "5", "4월 15일", "🌵"),
+    ("장미", "1", "4월 11일", "🌹"),
+]
 
-def screenshot_1_home():
+def home_card_y(i: int) -> int:
+    """홈 화면 i번째 식물 카드의 y"""
+    return STATUS_BAR_H + APP_BAR_H + 60 + 230 * i
+
+def screenshot_1_home(plants=HOME_PLANTS):
     """홈 화면: 식물 목록"""
     img = Image.new('RGB', (W, H), BG)
     d = ImageDraw.Draw(img)
-    draw_status_bar(d)
-    draw_app_bar(d, "물주기 알림 Lite")
-    y = STATUS_BAR_H + APP_BAR_H + 60
-    plants = [
-        ("몬스테라", "2", "4월 12일", "🌿"),
-        ("다육이", "5", "4월 15일", "🌵"),
-        ("장미", "1", "4월 11일", "🌹"),
-    ]
-    for name, days, date, emoji in plants:
-        draw_plant_card(img, d, y, name, days, date, emoji)
-        y += 230
+    paste_chrome(img, "물주기 알림 Lite")
+    for i, (name, days, date, emoji) in enumerate(plants):
+        draw_plant_card(img, d, home_card_y(i), name, days, date, emoji)
     # FAB 버튼
     fab_x = W - 100 - SAFE_X
     fab_y = H - 120 - SAFE_X
     d.ellipse([fab_x, fab_y, fab_x + 140, fab_y + 140], fill=PRIMARY)
-    d.text((fab_x + 40, fab_y + 30), "+", font=ImageFont.truetype(FONT_PATHS[0], 90) if os.path.exists(FONT_PATHS[0]) else font_title, fill=(255, 255, 255))
+    draw_text(d, (fab_x + 40, fab_y + 30), "+", font=font_fab, fill=(255, 255, 255))
     return img
 
 def screenshot_2_add():
     """식물 추가 화면"""
     img = Image.new('RGB', (W, H), BG)
     d = ImageDraw.Draw(img)
-    draw_status_bar(d)
-    draw_app_bar(d, "식물 추가")
+    paste_chrome(img, "식물 추가")
     y = STATUS_BAR_H + APP_BAR_H + 80
     # 입력 필드들
     fields = [
@@ -108,29 +178,33 @@ def screenshot_2_add():
         ("알림 시간", "오전 9시"),
     ]
     for label, placeholder in fields:
-        d.text((SAFE_X, y), label, font=font_caption, fill=TEXT_MID)
+        draw_text(d, (SAFE_X, y), label, font=font_caption, fill=TEXT_MID)
         y += 60
         d.rounded_rectangle([SAFE_X, y, W - SAFE_X, y + 100], radius=16, fill=CARD_BG, outline=(200, 200, 200), width=2)
-        d.text((SAFE_X + 30, y + 30), placeholder, font=font_body, fill=TEXT_DARK)
+        draw_text(d, (SAFE_X + 30, y + 30), placeholder, font=font_body, fill=TEXT_DARK)
         y += 140
     # 저장 버튼
     btn_y = H - 250
     d.rounded_rectangle([SAFE_X + 100, btn_y, W - SAFE_X - 100, btn_y + 100], radius=50, fill=PRIMARY)
-    d.text((W//2 - 60, btn_y + 28), "저장", font=font_title, fill=(255, 255, 255))
+    draw_text(d, (W//2 - 60, btn_y + 28), "저장", font=font_title, fill=(255, 255, 255))
     return img
 
 def screenshot_3_detail():
     """식물 상세 화면"""
     img = Image.new('RGB', (W, H), BG)
     d = ImageDraw.Draw(img)
-    draw_status_bar(d)
-    draw_app_bar(d, "몬스테라")
+    paste_chrome(img, "몬스테라")
     y = STATUS_BAR_H + APP_BAR_H + 80
     # 큰 아이콘
     icon_size = 240
     icon_x = W//2 - icon_size//2
-    d.ellipse([icon_x, y, icon_x + icon_size, y + icon_size], fill=(PRIMARY[0]+40, PRIMARY[1]+40, PRIMARY[2]+40))
-    d.text((icon_x + 60, y + 50), "🌿", font=ImageFont.truetype(FONT_PATHS[0], 120) if os.path.exists(FONT_PATHS[0]) else font_title, fill=TEXT_DARK)
+    photo = plant_photo("몬스테라", icon_size + 1)
+    if photo:
+        paste_round_photo(img, photo, (icon_x, y))
+    else:
+        d.ellipse([icon_x, y, icon_x + icon_size, y + icon_size], fill=(PRIMARY[0]+40, PRIMARY[1]+40, PRIMARY[2]+40))
+        paste_emoji(img, d, "🌿", (icon_x + icon_size//2, y + icon_size//2), 120, (icon_x + 60, y + 50),
+                    font_emoji_large)
     y += icon_size + 80
     # 정보
     info = [
@@ -140,48 +214,70 @@ def screenshot_3_detail():
         ("메모", "밝은 곳에 두기"),
     ]
     for label, value in info:
-        d.text((SAFE_X + 40, y), label, font=font_caption, fill=TEXT_MID)
+        draw_text(d, (SAFE_X + 40, y), label, font=font_caption, fill=TEXT_MID)
         y += 55
-        d.text((SAFE_X + 40, y), value, font=font_body, fill=TEXT_DARK)
+        draw_text(d, (SAFE_X + 40, y), value, font=font_body, fill=TEXT_DARK)
         y += 90
     return img
 
+def draw_notification_card(img: Image.Image, d: ImageDraw.ImageDraw, notif_y: int):
+    """알림 카드 (높이 NOTIF_H)"""
+    d.rounded_rectangle([SAFE_X, notif_y, W - SAFE_X, notif_y + NOTIF_H], radius=20, fill=CARD_BG, outline=(220, 220, 220), width=2)
+    draw_emoji_text(img, (SAFE_X + 30, notif_y + 30), "🌿 물주기 알림", font_body, TEXT_DARK)
+    draw_text(d, (SAFE_X + 30, notif_y + 90), "몬스테라에게 물을 줄 시간이에요!", font=font_caption, fill=TEXT_MID)
+    draw_text(d, (SAFE_X + 30, notif_y + 140), "오전 9:00", font=font_caption, fill=(150, 150, 150))
+
 def screenshot_4_notification():
     """알림 화면 (notification bar expanded)"""
     img = Image.new('RGB', (W, H), BG)
     d = ImageDraw.Draw(img)
-    draw_status_bar(d)
+    paste_chrome(img)
     # 알림 패널
     panel_h = 600
     d.rectangle([0, STATUS_BAR_H, W, STATUS_BAR_H + panel_h], fill=(250, 250, 250))
-    d.text((SAFE_X, STATUS_BAR_H + 40), "알림", font=font_title, fill=TEXT_DARK)
-    # 알림 카드
-    notif_y = STATUS_BAR_H + 140
-    notif_h = 200
-    d.rounded_rectangle([SAFE_X, notif_y, W - SAFE_X, notif_y + notif_h], radius=20, fill=CARD_BG, outline=(220, 220, 220), width=2)
-    d.text((SAFE_X + 30, notif_y + 30), "🌿 물주기 알림", font=font_body, fill=TEXT_DARK)
-    d.text((SAFE_X + 30, notif_y + 90), "몬스테라에게 물을 줄 시간이에요!", font=font_caption, fill=TEXT_MID)
-    d.text((SAFE_X + 30, notif_y + 140), "오전 9:00", font=font_caption, fill=(150, 150, 150))
+    draw_text(d, (SAFE_X, STATUS_BAR_H + 40), "알림", font=font_title, fill=TEXT_DARK)
+    draw_notification_card(img, d, STATUS_BAR_H + 140)
     # 배경 흐림
     bg = Image.new('RGBA', (W, H), (0, 0, 0, 100))
     img.paste(bg, (0, STATUS_BAR_H + panel_h), bg)
     return img
 
 def main():
-    out_dir = os.path.join(ROOT, 'assets', 'store_graphics', 'screenshots')
-    os.makedirs(out_dir, exist_ok=True)
+    global PHOTO_INDEX
+    enable_from_argv('create_screenshots')
+    parser = argparse.ArgumentParser(description='Render the Play Store screenshots')
+    add_shard_argument(parser)
+    parser.add_argument('--backup', help='backup (.json/.pwbc) whose plant photos replace the emoji circles')
+    parser.add_argument('--photos', action='append', default=[], metavar='DIR',
+                        help='directory holding the photos by file name (repeatable)')
+    args = parser.parse_args()
+    run = ShardRun('create_screenshots', args.shard)
+    if args.backup:
+        from thumbnails import ThumbnailIndex, backup_photos
+        for name, image_path in backup_photos(args.backup):
+            PHOTOS.setdefault(name, image_path)
+        PHOTO_DIRS.extend(args.photos)
+        PHOTO_INDEX = ThumbnailIndex()
     screens = [
         (screenshot_1_home, 'screenshot_1_home.png'),
         (screenshot_2_add, 'screenshot_2_add.png'),
         (screenshot_3_detail, 'screenshot_3_detail.png'),
         (screenshot_4_notification, 'screenshot_4_notification.png'),
     ]
+    screens = run.select(screens, key=lambda s: s[1])
     for func, filename in screens:
-        img = func()
-        path = os.path.join(out_dir, filename)
-        img.save(path, 'PNG')
+        with stage(func.__name__):
+            img = func()
+        path = run.output_path(f'assets/store_graphics/screenshots/{filename}')
+        with stage('queue'):
+            save_async(img, path)  # encoded while the next screen renders
         print(f'✅ 생성: {os.path.relpath(path, ROOT)}')
-    print('\n완료: Play Store 스크린샷 4개 생성됨 (1080x2340)')
+    with stage('encode'):
+        flush_writes()
+    print('💾', get_writer().summary())
+    print('🗂️', get_cache().summary())
+    run.finish()
+    print(f'\n완료: Play Store 스크린샷 {len(screens)}개 생성됨 (1080x2340)')
 
 if __name__ == '__main__':
     main()
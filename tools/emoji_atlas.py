@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Colour-emoji atlas: the emoji the generators draw, rasterized once from a colour-emoji
+font at a few strike sizes and then blitted, instead of loading an emoji font per
+call (or drawing tofu with the Korean font on machines without Apple Color Emoji).
+
+    from emoji_atlas import draw_emoji_text
+
+    draw_emoji_text(img, (x, y), '🌿 물주기 알림', font_body, fill=TEXT_DARK)
+
+Font lookup: $PWB_EMOJI_FONT, then assets/fonts/NotoColorEmoji.ttf (not in the repo:
+drop the OFL font from github.com/googlefonts/noto-emoji there on build machines without
+one), then the usual Linux / macOS system locations. Bitmap colour fonts (CBDT, sbix)
+only load at their own strike sizes, so each glyph is rendered at the largest size
+the font accepts, cropped, and scaled down to STRIKES with premultiplied alpha.
+Glyphs the font does not have (.notdef) stay empty cells.
+
+One RGBA atlas per strike (EMOJI in order, COLUMNS per row) is kept in the layer cache,
+keyed by the font file content, so the font is only opened when the atlas changes.
+draw_emoji_text() picks the smallest strike at least as large as the wanted size.
+Without an emoji font, or with PWB_EMOJI_FONT=off (the golden checks), draw_emoji_text()
+is exactly fonts.draw_text(); get_atlas() warns once when no font was found. Text
+between the emoji goes through fonts.draw_text(), so font fallback chains apply to it.
+
+Usage:
+  python3 tools/emoji_atlas.py [--sheet out.png]   (font found, coverage, cell sheet)
+"""
+import argparse
+import functools
+import os
+
+from PIL import Image, ImageDraw, ImageFont
+
+from fonts import draw_text, text_length
+from layer_cache import cached_layer, file_digest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EMOJI_FONT_PATHS = [
+    os.path.join(ROOT, 'assets', 'fonts', 'NotoColorEmoji.ttf'),  # drop-in, not committed
+    '/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf',
+    '/usr/share/fonts/noto/NotoColorEmoji.ttf',
+    '/usr/share/fonts/google-noto-emoji/NotoColorEmoji.ttf',
+    '/System/Library/Fonts/Apple Color Emoji.ttc',
+]
+# Every emoji drawn by the generators (and the suffixes of generate_backup.py names)
+EMOJI = ('🌱', '🌿', '🌵', '🌹', '🪴', '🌸', '🍀', '🌼', '🌷', '💧', '⏰', '📅', '📶', '🔔')
+STRIKES = (32, 64, 128)
+COLUMNS = 8
+# Sizes a bitmap font may accept, largest first (Noto: 109, Apple: 160 / 96 / 64 ...)
+RENDER_SIZES = (160, 137, 128, 109, 96, 64, 48)
+MISSING = '\U0010FFFD'  # private use, never in a font: renders as .notdef
+
+
+def find_emoji_font():
+    """Path of the colour-emoji font, or None (also when PWB_EMOJI_FONT=off)."""
+    override = os.environ.get('PWB_EMOJI_FONT')
+    if override:
+        return None if override.lower() in ('0', 'off', 'false', 'no') else override
+    return next((p for p in EMOJI_FONT_PATHS if os.path.exists(p)), None)
+
+
+def _load(path: str):
+    for size in RENDER_SIZES:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:  # bitmap font without a strike of this size
+            continue
+    raise SystemExit(f'❌ 이모지 폰트를 열 수 없습니다: {path}')
+
+
+def _glyph(font, text: str):
+    """Tightly cropped RGBA rendering of text, or None for an empty glyph."""
+    size = font.size
+    img = Image.new('RGBA', (size * 3, size * 2), (0, 0, 0, 0))
+    ImageDraw.Draw(img).text((size // 2, size // 2), text, font=font, fill=(0, 0, 0, 255), embedded_color=True)
+    box = img.getchannel('A').getbbox()
+    return img.crop(box) if box else None
+
+
+def render_atlas(path: str, strike: int, emoji=EMOJI) -> Image.Image:
+    font = _load(path)
+    notdef = _glyph(font, MISSING)
+    rows = -(-len(emoji) // COLUMNS)
+    atlas = Image.new('RGBA', (COLUMNS * strike, rows * strike), (0, 0, 0, 0))
+    for i, e in enumerate(emoji):
+        glyph = _glyph(font, e)
+        if glyph is None or (notdef is not None and glyph.tobytes() == notdef.tobytes()):
+            continue
+        scale = strike / max(glyph.size)
+        w, h = max(1, round(glyph.width * scale)), max(1, round(glyph.height * scale))
+        glyph = glyph.resize((w, h), Image.Resampling.LANCZOS)  # RGBA: resized premultiplied
+        x, y = (i % COLUMNS) * strike, (i // COLUMNS) * strike
+        atlas.paste(glyph, (x + (strike - w) // 2, y + (strike - h) // 2))
+    return atlas
+
+
+class EmojiAtlas:
+    def __init__(self, font_path=None, emoji=EMOJI, strikes=STRIKES):
+        self.font_path = font_path
+        self.emoji = tuple(emoji)
+        self.strikes = tuple(sorted(strikes))
+        self._index = {e: i for i, e in enumerate(self.emoji)}
+        self._atlases = {}
+        self._cells = {}  # (emoji, size) -> cell or None
+        # longest first, so sequences win over their first code point
+        self._by_length = sorted(self.emoji, key=len, reverse=True)
+
+    @property
+    def available(self) -> bool:
+        return self.font_path is not None
+
+    def cache_id(self) -> tuple:
+        """Layer-cache parameter for layers that draw emoji."""
+        return (file_digest(self.font_path) if self.font_path else 'off', self.emoji, self.strikes)
+
+    def atlas(self, strike: int) -> Image.Image:
+        if strike not in self._atlases:
+            self._atlases[strike] = cached_layer(
+                'emoji/atlas', functools.partial(render_atlas, self.font_path, strike, self.emoji),
+                font=file_digest(self.font_path), helpers=[_load, _glyph])
+        return self._atlases[strike]
+
+    def cell(self, emoji: str, size: int):
+        """size x size RGBA image of an emoji, or None when it is not in the atlas."""
+        key = (emoji, size)
+        if key not in self._cells:
+            self._cells[key] = self._cell(emoji, size)
+        return self._cells[key]
+
+    def _cell(self, emoji: str, size: int):
+        if not self.available or emoji not in self._index:
+            return None
+        strike = next((s for s in self.strikes if s >= size), self.strikes[-1])
+        i = self._index[emoji]
+        x, y = (i % COLUMNS) * strike, (i // COLUMNS) * strike
+        cell = self.atlas(strike).crop((x, y, x + strike, y + strike))
+        if cell.getbbox() is None:  # glyph missing from the font
+            return None
+        return cell if strike == size else cell.resize((size, size), Image.Resampling.LANCZOS)
+
+    def split(self, text: str) -> list:
+        """[(emoji or None, run)]: text cut into atlas emoji and the plain text between them."""
+        runs, plain, i = [], [], 0
+        while i < len(text):
+            match = next((e for e in self._by_length if text.startswith(e, i)), None)
+            if match is None:
+                plain.append(text[i])
+                i += 1
+                continue
+            if plain:
+                runs.append((None, ''.join(plain)))
+                plain = []
+            i += len(match)
+            if text.startswith('\ufe0f', i):  # emoji presentation selector
+                i += 1
+            runs.append((match, match))
+        if plain:
+            runs.append((None, ''.join(plain)))
+        return runs
+
+
+@functools.lru_cache(maxsize=None)
+def get_atlas() -> EmojiAtlas:
+    atlas = EmojiAtlas(find_emoji_font())
+    if not atlas.available and not os.environ.get('PWB_EMOJI_FONT'):
+        print('⚠️ 컬러 이모지 폰트 없음: 이모지를 일반 폰트로 그립니다 (빈 상자일 수 있음). '
+              'assets/fonts/NotoColorEmoji.ttf를 두거나 PWB_EMOJI_FONT를 지정하세요')
+    return atlas
+
+
+def draw_emoji_text(img: Image.Image, xy, text: str, font, fill, emoji_size=None, atlas=None):
+    """
+    fonts.draw_text() with the atlas emoji blitted in: each emoji is an emoji_size (default:
+    the font size) square, vertically centred on the line, advancing by 1.125 of its size.
+    """
+    atlas = atlas or get_atlas()
+    draw = ImageDraw.Draw(img)
+    runs = atlas.split(text) if atlas.available else []
+    size = emoji_size or round(getattr(font, 'size', 10))
+    if not any(e is not None and atlas.cell(e, size) is not None for e, _ in runs):
+        draw_text(draw, xy, text, font, fill)
+        return
+    x, y = xy
+    ascent, descent = font.getmetrics()
+    for e, run in runs:
+        cell = atlas.cell(e, size) if e is not None else None
+        if cell is None:
+            draw_text(draw, (x, y), run, font, fill)
+            x += text_length(draw, run, font)
+        else:
+            img.paste(cell, (round(x), round(y + (ascent + descent - size) / 2)), cell)
+            x += size + size // 8
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the colour-emoji atlas and show its coverage')
+    parser.add_argument('--sheet', help='write the largest strike as a PNG for review')
+    args = parser.parse_args()
+    atlas = get_atlas()
+    if not atlas.available:
+        raise SystemExit('❌ 컬러 이모지 폰트가 없습니다: assets/fonts/NotoColorEmoji.ttf 또는 PWB_EMOJI_FONT')
+    covered = [e for e in atlas.emoji if atlas.cell(e, atlas.strikes[-1]) is not None]
+    print(f'😀 {atlas.font_path}')
+    print(f'   이모지 {len(covered)}/{len(atlas.emoji)}개: {"".join(covered)}')
+    missing = [e for e in atlas.emoji if e not in covered]
+    if missing:
+        print(f'   ⚠️ 글리프 없음: {" ".join(missing)}')
+    print(f'   크기 {", ".join(map(str, atlas.strikes))}px')
+    if args.sheet:
+        atlas.atlas(atlas.strikes[-1]).save(args.sheet)
+        print(f'✅ 시트 저장: {args.sheet}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Size-budgeted image export engine.
+
+Given one decoded source image and a list of targets (format, byte budget),
+find the highest encoder quality whose output fits the budget:
+- quality is binary-searched per format, every probe is encoded into memory
+- formats are searched in parallel threads (Pillow releases the GIL while encoding)
+- nothing is written to disk until write_results() is called with the winners
+
+Formats:
+  webp  lossless first, then lossy quality 1~100
+  jpeg  quality 1~95 (optimize + progressive)
+  png   lossless only (accepted when it fits the budget)
+"""
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from write_behind import write_bytes
+
+EXTENSIONS = {'webp': '.webp', 'jpeg': '.jpg', 'png': '.png'}
+QUALITY_RANGE = {'webp': (1, 100), 'jpeg': (1, 95)}
+
+
+def encode(img: Image.Image, fmt: str, quality=None) -> bytes:
+    """Encode to an in-memory buffer. quality=None means lossless (webp/png)."""
+    buf = io.BytesIO()
+    if fmt == 'webp':
+        if quality is None:
+            img.save(buf, 'WEBP', lossless=True, quality=100, method=4)
+        else:
+            img.save(buf, 'WEBP', quality=quality, method=4)
+    elif fmt == 'jpeg':
+        img.save(buf, 'JPEG', quality=quality, optimize=True, progressive=True)
+    elif fmt == 'png':
+        img.save(buf, 'PNG', optimize=True)
+    else:
+        raise ValueError(f'unknown export format: {fmt}')
+    return buf.getvalue()
+
+
+def search_quality(img: Image.Image, fmt: str, max_bytes: int):
+    """
+    Return {'format', 'quality', 'data', 'probes'} for the best encoding under
+    max_bytes, or the same dict with data=None when even the lowest quality is too big.
+    quality is None for lossless results.
+    """
+    probes = 0
+    if fmt in ('webp', 'png'):
+        data = encode(img, fmt)
+        probes += 1
+        if len(data) <= max_bytes or fmt == 'png':
+            return {'format': fmt, 'quality': None, 'probes': probes,
+                    'data': data if len(data) <= max_bytes else None, 'smallest': len(data)}
+
+    lo, hi = QUALITY_RANGE[fmt]
+    # Most sources fit at the top quality: try it before bisecting
+    data = encode(img, fmt, hi)
+    probes += 1
+    if len(data) <= max_bytes:
+        return {'format': fmt, 'quality': hi, 'data': data, 'probes': probes, 'smallest': len(data)}
+    hi -= 1
+    best, best_q, smallest = None, None, len(data)
+    while lo <= hi:
+        q = (lo + hi) // 2
+        data = encode(img, fmt, q)
+        probes += 1
+        smallest = min(smallest, len(data))
+        if len(data) <= max_bytes:
+            best, best_q = data, q
+            lo = q + 1
+        else:
+            hi = q - 1
+    return {'format': fmt, 'quality': best_q, 'data': best, 'probes': probes, 'smallest': smallest}
+
+
+def prepare_source(img: Image.Image) -> dict:
+    """Convert the decoded source once per required mode and share it across formats."""
+    has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+    rgb = img.convert('RGB')
+    rgba = img.convert('RGBA') if has_alpha else rgb
+    # JPEG cannot store alpha; webp/png keep it when the source has it
+    return {'jpeg': rgb, 'webp': rgba, 'png': rgba}
+
+
+def export(img: Image.Image, targets, workers=None) -> list:
+    """
+    targets: list of (format, max_bytes)
+    Returns search results in the same order as targets.
+    """
+    sources = prepare_source(img)
+    workers = workers or len(targets)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Image.save() stores encoder options on the Image object, so every thread gets
+        # its own wrapper around the shared pixel core instead of the same instance.
+        futures = [pool.submit(search_quality, sources[fmt]._new(sources[fmt].im), fmt, max_bytes)
+                   for fmt, max_bytes in targets]
+        return [f.result() for f in futures]
+
+
+def write_results(results, base_path: str, source=None) -> list:
+    """
+    Write winning encodings next to base_path (extension replaced per format).
+    An encoding that would land on the source image itself (png exports of a png
+    exported in place) goes to <stem>.export.png instead.
+    """
+    stem = os.path.splitext(base_path)[0]
+    written = []
+    for res in results:
+        if res['data'] is None:
+            continue
+        path = stem + EXTENSIONS[res['format']]
+        if source is not None and os.path.abspath(path) == os.path.abspath(source):
+            path = stem + '.export' + EXTENSIONS[res['format']]
+        write_bytes(path, res['data'])  # untouched when the encoding did not change
+        written.append(path)
+    return written
+
+
+def describe(res, max_bytes: int) -> str:
+    fmt = res['format']
+    if res['data'] is None:
+        return f"{fmt}: 예산 {max_bytes // 1024}KB 초과 (최소 {res['smallest'] // 1024}KB)"
+    quality = 'lossless' if res['quality'] is None else f"q={res['quality']}"
+    return f"{fmt}: {quality}, {len(res['data']) // 1024}KB / {max_bytes // 1024}KB ({res['probes']}회 시도)"
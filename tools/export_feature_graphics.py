@@ -1,27 +1,94 @@
 #!/usr/bin/env python3
 """
-Export the active feature graphic (assets/store_graphics/feature_graphic.png)
-into additional formats for store uploads and web previews:
-- feature_graphic.webp (lossless)
-- feature_graphic.jpg (quality=95)
+Export store graphics into additional formats for store uploads and web previews,
+picking the highest quality that fits a byte budget per format (see export_engine.py):
+- feature:     assets/store_graphics/feature_graphic.png -> feature_graphic.webp / .jpg
+- icon:        assets/store_graphics/app_icon_512.png    -> app_icon_512.webp
+- screenshots: assets/store_graphics/screenshots/*.png   -> assets/store_graphics/web/<name>.webp / .jpg
+A png budget never rewrites a source master: feature and icon get <name>.export.png.
+
+Usage:
+  python3 tools/export_feature_graphics.py [feature|icon|screenshots|all] [--budget webp=300 --budget jpeg=500]
+Budgets are in KB and override the preset budgets for every exported image.
 """
+import argparse
 import os
+
 from PIL import Image
 
+from export_engine import export, write_results, describe
+
 ROOT = os.path.dirname(os.path.dirname(__file__))
 ASSETS_PRIMARY = os.path.join(ROOT, 'assets', 'store_graphics')
 PNG_PATH = os.path.join(ASSETS_PRIMARY, 'feature_graphic.png')
+ICON_PATH = os.path.join(ASSETS_PRIMARY, 'app_icon_512.png')
+SCREENSHOTS_DIR = os.path.join(ASSETS_PRIMARY, 'screenshots')
+WEB_DIR = os.path.join(ASSETS_PRIMARY, 'web')
+
+KB = 1024
+# preset -> [(format, max_bytes)]
+PRESETS = {
+    'feature': [('webp', 300 * KB), ('jpeg', 500 * KB)],
+    'icon': [('webp', 60 * KB)],
+    'screenshots': [('webp', 250 * KB), ('jpeg', 400 * KB)],
+}
+
+
+def parse_budget(value: str):
+    fmt, _, kb = value.partition('=')
+    fmt = {'jpg': 'jpeg'}.get(fmt.lower(), fmt.lower())
+    if fmt not in ('webp', 'jpeg', 'png') or not kb.isdigit():
+        raise argparse.ArgumentTypeError(f'잘못된 예산 형식: {value} (예: webp=300)')
+    return fmt, int(kb) * KB
+
+
+def export_one(src_path: str, out_base: str, targets):
+    img = Image.open(src_path)
+    img.load()
+    results = export(img, targets)
+    written = write_results(results, out_base, source=src_path)
+    print(f'📦 {os.path.relpath(src_path, ROOT)}')
+    for res, (_, max_bytes) in zip(results, targets):
+        mark = '✅' if res['data'] is not None else '⚠️'
+        print(f'  {mark} {describe(res, max_bytes)}')
+    for path in written:
+        print('   -', os.path.relpath(path, ROOT))
+    return written
+
+
+def jobs_for(preset: str):
+    """Yield (src_path, out_base) pairs for a preset."""
+    if preset == 'feature':
+        if not os.path.exists(PNG_PATH):
+            raise SystemExit('feature_graphic.png not found. Run generator or chooser first.')
+        yield PNG_PATH, PNG_PATH
+    elif preset == 'icon':
+        if not os.path.exists(ICON_PATH):
+            raise SystemExit('app_icon_512.png not found.')
+        yield ICON_PATH, ICON_PATH
+    elif preset == 'screenshots':
+        os.makedirs(WEB_DIR, exist_ok=True)
+        for fname in sorted(os.listdir(SCREENSHOTS_DIR)):
+            src = os.path.join(SCREENSHOTS_DIR, fname)
+            if fname.endswith('.png') and os.path.isfile(src):
+                yield src, os.path.join(WEB_DIR, fname)
+
 
-if not os.path.exists(PNG_PATH):
-    raise SystemExit('feature_graphic.png not found. Run generator or chooser first.')
+def main():
+    parser = argparse.ArgumentParser(description='Export store graphics under byte budgets')
+    parser.add_argument('preset', nargs='?', default='feature', choices=['feature', 'icon', 'screenshots', 'all'])
+    parser.add_argument('--budget', action='append', type=parse_budget, default=[],
+                        help='format=KB (webp, jpeg, png); repeatable')
+    args = parser.parse_args()
 
-img = Image.open(PNG_PATH).convert('RGB')
-webp_path = os.path.join(ASSETS_PRIMARY, 'feature_graphic.webp')
-jpg_path = os.path.join(ASSETS_PRIMARY, 'feature_graphic.jpg')
+    presets = list(PRESETS) if args.preset == 'all' else [args.preset]
+    total = 0
+    for preset in presets:
+        targets = args.budget or PRESETS[preset]
+        for src, out_base in jobs_for(preset):
+            total += len(export_one(src, out_base, targets))
+    print(f'\n✅ Exported: {total}개 파일')
 
-img.save(webp_path, 'WEBP', lossless=True)
-img.save(jpg_path, 'JPEG', quality=95, optimize=True, progressive=True)
 
-print('✅ Exported:')
-print(' -', os.path.relpath(webp_path, ROOT))
-print(' -', os.path.relpath(jpg_path, ROOT))
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,366 @@
+"""
+Font helpers: the headless font of the benchmarks and golden checks, and the
+per-code-point fallback chains the generators draw text with (see below).
+
+bundled_font() extracts the TrueType font embedded in Pillow to build/fonts/ so the
+generators can run on machines without the macOS / Korean fonts they look for.
+It is stable per Pillow version but has no Hangul glyphs (text renders as .notdef boxes),
+which is fine for timing and pixel-regression purposes. use_headless_font() also turns
+the colour-emoji atlas (see emoji_atlas.py) and the fallback fonts off, so the output
+does not depend on the other fonts of the machine either. box_font() writes a small
+font of box glyphs for given code points, to check fallback chains without them.
+"""
+import functools
+import math
+import os
+import struct
+
+from PIL import ImageFont
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONT_DIR = os.path.join(ROOT, 'build', 'fonts')
+
+
+def bundled_font() -> str:
+    font = ImageFont.load_default(size=32)
+    family, style = font.getname()
+    path = os.path.join(FONT_DIR, f'{family}-{style}.ttf')
+    if not os.path.exists(path):
+        os.makedirs(FONT_DIR, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(font.font_bytes)
+    return path
+
+
+def _checksum(data: bytes) -> int:
+    data += b'\0' * (-len(data) % 4)
+    return sum(struct.unpack(f'>{len(data) // 4}I', data)) & 0xFFFFFFFF
+
+
+def _box_glyph(i: int) -> bytes:
+    """Square outline with a hole that moves with the glyph index, so swapped glyphs show."""
+    hx, hy = 200 + (i % 4) * 100, 150 + (i // 4 % 4) * 100
+    contours = [[(100, 0), (100, 700), (800, 700), (800, 0)],                 # clockwise: filled
+                [(hx, hy), (hx + 150, hy), (hx + 150, hy + 150), (hx, hy + 150)]]  # counter-clockwise: hole
+    points = [pt for c in contours for pt in c]
+    ends = [3, 7]  # last point of each contour
+    xs = [b - a for a, b in zip([0] + [x for x, _ in points], [x for x, _ in points])]
+    ys = [b - a for a, b in zip([0] + [y for _, y in points], [y for _, y in points])]
+    return (struct.pack('>5h', len(contours), 100, 0, 800, 700) + struct.pack('>3H', *ends, 0)
+            + bytes([1] * len(points)) + struct.pack(f'>{len(xs)}h', *xs) + struct.pack(f'>{len(ys)}h', *ys))
+
+
+def box_font(codepoints, name='PWB Boxes') -> str:
+    """
+    Write a TrueType font to build/fonts/ that maps each code point to its own box glyph
+    (and space to a blank; cmap format 12 only, ascent 900 / descent 300 per 1000 units, unlike the bundled font),
+    for checking fallback chains and the emoji atlas without fonts of the machine.
+    """
+    codepoints = sorted(set(codepoints) - {0x20})
+    # glyph 0: empty .notdef, glyph 1: space
+    glyphs = [b'', b''] + [_box_glyph(i) for i in range(len(codepoints))]
+    loca, offset = [], 0
+    for g in glyphs:
+        loca.append(offset)
+        offset += len(g)
+    loca.append(offset)
+    groups = struct.pack('>III', 0x20, 0x20, 1) + b''.join(
+        struct.pack('>III', cp, cp, i + 2) for i, cp in enumerate(codepoints))
+    cmap = struct.pack('>HHHHI', 0, 1, 3, 10, 12) + struct.pack('>HHIII', 12, 0, 16 + len(groups), 0,
+                                                                 len(codepoints) + 1) + groups
+    names = [(1, name), (2, 'Regular'), (4, name), (6, name.replace(' ', '') + '-Regular')]
+    strings = [text.encode('utf-16-be') for _, text in names]
+    records, at = b'', 0
+    for (name_id, _), raw in zip(names, strings):
+        records += struct.pack('>6H', 3, 1, 0x409, name_id, len(raw), at)
+        at += len(raw)
+    tables = {
+        b'cmap': cmap,
+        b'glyf': b''.join(glyphs),
+        b'head': struct.pack('>IIIIHHqqhhhhHHhhh', 0x10000, 0x10000, 0, 0x5F0F3CF5, 0x000B, 1000, 0, 0,
+                             100, 0, 800, 700, 0, 8, 2, 1, 0),
+        b'hhea': struct.pack('>IhhhHhhhhhhhhhhhH', 0x10000, 900, -300, 0, 900, 100, 100,
+                             800, 1, 0, 0, 0, 0, 0, 0, 0, len(glyphs)),
+        b'hmtx': b''.join(struct.pack('>Hh', 900 if g else 300, 100 if g else 0) for g in glyphs),
+        b'loca': struct.pack(f'>{len(loca)}I', *loca),
+        b'maxp': struct.pack('>I14H', 0x10000, len(glyphs), 8, 2, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0),
+        b'name': struct.pack('>HHH', 0, len(names), 6 + 12 * len(names)) + records + b''.join(strings),
+        b'post': struct.pack('>IIhhIIIII', 0x30000, 0, -100, 50, 0, 0, 0, 0, 0),
+    }
+    count = len(tables)
+    power = 1 << (count.bit_length() - 1)
+    header = struct.pack('>IHHHH', 0x10000, count, power * 16, power.bit_length() - 1, count * 16 - power * 16)
+    directory, body, offsets = b'', b'', {}
+    for tag in sorted(tables):
+        data = tables[tag]
+        offsets[tag] = 12 + 16 * count + len(body)
+        directory += struct.pack('>4sIII', tag, _checksum(data), offsets[tag], len(data))
+        body += data + b'\0' * (-len(data) % 4)
+    font = bytearray(header + directory + body)
+    struct.pack_into('>I', font, offsets[b'head'] + 8, (0xB1B0AFBA - _checksum(bytes(font))) & 0xFFFFFFFF)
+
+    path = os.path.join(FONT_DIR, name.replace(' ', '') + '-Regular.ttf')
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == font:
+                return path  # unchanged: keep the mtime, cmap_coverage() stays cached
+    os.makedirs(FONT_DIR, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(font)
+    return path
+
+
+def use_headless_font(path=None) -> str:
+    """Point the generators at `path` (default: the bundled font) unless PWB_FONT is already set.
+    Must run before the generator modules are imported."""
+    if not os.environ.get('PWB_FONT'):
+        os.environ['PWB_FONT'] = os.path.abspath(path) if path else bundled_font()
+    os.environ.setdefault('PWB_EMOJI_FONT', 'off')
+    os.environ.setdefault('PWB_FONT_FALLBACK', 'off')
+    return os.environ['PWB_FONT']
+
+
+# ---------------------------------------------------------------- fallback chains
+#
+# The generators mix Hangul, Latin, digits, '✓', '·', the non-breaking hyphen of 'D‑day'
+# and emoji, but Pillow draws a whole string with one font. chain_font(path, size) puts
+# FALLBACK_FONTS behind the generator's font; draw_text() / text_bbox() split a string
+# into runs by the first font whose cmap covers each code point (code points nobody
+# covers stay with the first font) and draw the runs on a common baseline.
+# Coverage comes from the fonts' cmap tables (parsed once per file, cached), the code
+# point -> font decision is cached per chain and the runs with their offsets per
+# (string, size). A string that is one run of the first font is drawn with a single
+# draw.text() call, so single-font output is unchanged.
+#
+# PWB_FONT_FALLBACK: os.pathsep-separated font list replacing FALLBACK_FONTS, or 'off'.
+
+FALLBACK_FONTS = [
+    '/System/Library/Fonts/AppleSDGothicNeo.ttc',
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+    '/System/Library/Fonts/Supplemental/Arial Unicode.ttf',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/System/Library/Fonts/Apple Symbols.ttf',
+]
+
+
+def _sfnt_offset(data: bytes, index: int) -> int:
+    if data[:4] == b'ttcf':  # collection: table directory of the index-th font
+        count = struct.unpack_from('>I', data, 8)[0]
+        if index >= count:
+            raise ValueError(f'font index {index} out of range ({count} fonts)')
+        return struct.unpack_from('>I', data, 12 + 4 * index)[0]
+    return 0
+
+
+def _cmap_subtable(data: bytes, index: int):
+    base = _sfnt_offset(data, index)
+    num_tables = struct.unpack_from('>H', data, base + 4)[0]
+    for i in range(num_tables):
+        tag, _, offset, _ = struct.unpack_from('>4sIII', data, base + 12 + 16 * i)
+        if tag == b'cmap':
+            break
+    else:
+        raise ValueError('no cmap table')
+    count = struct.unpack_from('>H', data, offset + 2)[0]
+    found = {}
+    for i in range(count):
+        platform, encoding, sub = struct.unpack_from('>HHI', data, offset + 4 + 8 * i)
+        fmt = struct.unpack_from('>H', data, offset + sub)[0]
+        found[(platform, encoding, fmt)] = offset + sub
+    # Full Unicode repertoire first, then the BMP ones
+    for key in ((3, 10, 12), (0, 6, 12), (0, 4, 12), (0, 3, 12), (3, 1, 4), (0, 3, 4), (0, 1, 4), (0, 0, 4)):
+        if key in found:
+            return key[2], found[key]
+    raise ValueError('no Unicode cmap subtable (format 4 or 12)')
+
+
+def _format4(data: bytes, at: int) -> set:
+    seg_x2 = struct.unpack_from('>H', data, at + 6)[0]
+    segs = seg_x2 // 2
+    ends = struct.unpack_from(f'>{segs}H', data, at + 14)
+    starts = struct.unpack_from(f'>{segs}H', data, at + 16 + seg_x2)
+    deltas = struct.unpack_from(f'>{segs}h', data, at + 16 + 2 * seg_x2)
+    range_at = at + 16 + 3 * seg_x2
+    range_offsets = struct.unpack_from(f'>{segs}H', data, range_at)
+    covered = set()
+    for i, (start, end, delta, range_offset) in enumerate(zip(starts, ends, deltas, range_offsets)):
+        if start == 0xFFFF:
+            continue
+        if range_offset == 0:
+            covered.update(c for c in range(start, end + 1) if (c + delta) & 0xFFFF)
+            continue
+        glyphs = struct.unpack_from(f'>{end - start + 1}H', data, range_at + 2 * i + range_offset)
+        covered.update(c for c, g in zip(range(start, end + 1), glyphs) if g and (g + delta) & 0xFFFF)
+    return covered
+
+
+def _format12(data: bytes, at: int) -> set:
+    groups = struct.unpack_from('>I', data, at + 12)[0]
+    covered = set()
+    for i in range(groups):
+        start, end, glyph = struct.unpack_from('>III', data, at + 16 + 12 * i)
+        covered.update(range(start + (glyph == 0), end + 1))  # glyph 0 is .notdef
+    return covered
+
+
+@functools.lru_cache(maxsize=None)
+def _coverage(path: str, index: int, mtime_ns: int) -> frozenset:
+    with open(path, 'rb') as f:
+        data = f.read()
+    fmt, at = _cmap_subtable(data, index)
+    return frozenset(_format12(data, at) if fmt == 12 else _format4(data, at))
+
+
+def cmap_coverage(path: str, index=0) -> frozenset:
+    """Code points the font maps to a real glyph (cmap format 4 / 12; TTC index)."""
+    return _coverage(os.path.abspath(path), index, os.stat(path).st_mtime_ns)
+
+
+def fallback_paths() -> list:
+    value = os.environ.get('PWB_FONT_FALLBACK')
+    if value is not None:
+        return [] if value.lower() in ('', '0', 'off', 'false', 'no') else value.split(os.pathsep)
+    return [p for p in FALLBACK_FONTS if os.path.exists(p)]
+
+
+class FontChain:
+    """Font files in priority order, with the code point -> font decision cached."""
+
+    def __init__(self, paths):
+        self.paths = list(dict.fromkeys(paths))
+        self._coverage = []
+        for path in self.paths:
+            try:
+                self._coverage.append(cmap_coverage(path))
+            except (OSError, ValueError, struct.error):  # unreadable cmap: only used where nothing else fits
+                self._coverage.append(frozenset())
+        self._choice = {}
+        self._sizes = {}
+
+    def index_for(self, ch: str) -> int:
+        cp = ord(ch)
+        choice = self._choice.get(cp)
+        if choice is None:
+            choice = next((i for i, cov in enumerate(self._coverage) if cp in cov), 0)
+            self._choice[cp] = choice
+        return choice
+
+    def font(self, size) -> 'ChainFont':
+        if size not in self._sizes:
+            self._sizes[size] = ChainFont(self, size)
+        return self._sizes[size]
+
+
+@functools.lru_cache(maxsize=None)
+def _chain(paths: tuple) -> FontChain:
+    return FontChain(paths)
+
+
+def chain_font(path: str, size, fallbacks=None) -> 'ChainFont':
+    """The font at path (raises like ImageFont.truetype) with the fallback fonts (default:
+    fallback_paths()) behind it."""
+    fallbacks = fallback_paths() if fallbacks is None else fallbacks
+    font = _chain((os.path.abspath(path),) + tuple(os.path.abspath(p) for p in fallbacks)).font(size)
+    font.member(0)  # load the primary now: callers try the next candidate when it fails
+    return font
+
+
+class ChainFont:
+    """One size of a FontChain. Fallback fonts are only opened when a string needs them."""
+
+    def __init__(self, chain: FontChain, size):
+        self.chain = chain
+        self.size = size
+        self._loaded = {}
+        self._runs = {}
+
+    def member(self, i: int):
+        if i not in self._loaded:
+            self._loaded[i] = ImageFont.truetype(self.chain.paths[i], self.size)
+        return self._loaded[i]
+
+    @property
+    def fonts(self) -> list:
+        """The fonts loaded so far (the primary always), for cache keys."""
+        return [self.member(0)] + [f for i, f in sorted(self._loaded.items()) if i]
+
+    @property
+    def path(self) -> str:
+        return self.chain.paths[0]
+
+    def getmetrics(self):
+        return self.member(0).getmetrics()
+
+    def runs(self, text: str) -> tuple:
+        """((font, run, x offset), ...) of text, cached."""
+        runs = self._runs.get(text)
+        if runs is None:
+            pieces = []
+            for ch in text:
+                i = self.chain.index_for(ch) if not ch.isspace() or not pieces else pieces[-1][0]
+                if pieces and pieces[-1][0] == i:
+                    pieces[-1][1].append(ch)
+                else:
+                    pieces.append((i, [ch]))
+            x, runs = 0.0, []
+            for i, chars in pieces:
+                font = self.member(i)
+                run = ''.join(chars)
+                runs.append((font, run, x))
+                x += font.getlength(run)
+            runs = self._runs[text] = tuple(runs)
+        return runs
+
+    def getlength(self, text: str) -> float:
+        runs = self.runs(text)
+        return runs[-1][2] + runs[-1][0].getlength(runs[-1][1]) if runs else 0.0
+
+    def getbbox(self, text: str):
+        return text_bbox(None, (0, 0), text, self)
+
+
+def _single(font, text: str):
+    """The plain font when text is drawn by one font in a single call."""
+    if not isinstance(font, ChainFont):
+        return font
+    runs = font.runs(text)
+    if len(runs) <= 1 and (not runs or runs[0][0] is font.member(0)):
+        return font.member(0)
+    return None
+
+
+def draw_text(draw, xy, text: str, font, fill=None, **kw):
+    """draw.text() for plain fonts and ChainFonts (runs on the first font's baseline)."""
+    single = _single(font, text)
+    if single is not None:
+        draw.text(xy, text, font=single, fill=fill, **kw)
+        return
+    baseline = xy[1] + font.getmetrics()[0]
+    for member, run, dx in font.runs(text):
+        draw.text((xy[0] + dx, baseline), run, font=member, fill=fill, anchor='ls', **kw)
+
+
+def text_bbox(draw, xy, text: str, font):
+    """draw.textbbox() for plain fonts and ChainFonts; draw may be None."""
+    single = _single(font, text)
+    if single is not None:
+        if draw is None:
+            box = single.getbbox(text)
+            return (box[0] + xy[0], box[1] + xy[1], box[2] + xy[0], box[3] + xy[1])
+        return draw.textbbox(xy, text, font=single)
+    baseline = xy[1] + font.getmetrics()[0]
+    boxes = [member.getbbox(run, anchor='ls') for member, run, _ in font.runs(text)]
+    offsets = [dx for _, _, dx in font.runs(text)]
+    # whole pixels, like textbbox(): callers size images from it
+    return (math.floor(min(b[0] + dx for b, dx in zip(boxes, offsets)) + xy[0]),
+            math.floor(min(b[1] for b in boxes) + baseline),
+            math.ceil(max(b[2] + dx for b, dx in zip(boxes, offsets)) + xy[0]),
+            math.ceil(max(b[3] for b in boxes) + baseline))
+
+
+def text_length(draw, text: str, font) -> float:
+    single = _single(font, text)
+    if single is not None:
+        return draw.textlength(text, font=single) if draw is not None else single.getlength(text)
+    return font.getlength(text)
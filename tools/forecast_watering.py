@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Bulk watering-schedule forecast over a backup, with the same date semantics as
+Plant (lib/domain/plant.dart) and PlantRepository, computed for every plant at once.
+
+The backup is loaded into columns (intervalDays, lastWateredAt as a local day number,
+notifyHour/Minute, isActive; ids in Hive box order) and evaluated with NumPy:
+- nextWaterDate      local midnight of the lastWateredAt date + intervalDays x 24h
+                     (Duration arithmetic: across a DST change it is not a midnight)
+- daysUntilNextWater (midnight of the next date - midnight of today).inDays, truncated
+- isOverdue / isDueToday, getTodayAndOverdue(), getAll(sort: nearestDue | mostOverdue | nameAsc)
+- an N-day calendar: dueOn counts (next date only, as the app sees it) and a
+  projection where every active plant is watered on its due days (overdue: today)
+
+Dart details reproduced: DateTime.parse gives UTC fields for strings with an offset
+and local fields otherwise; local midnights and offsets follow the time zone (--tz,
+default: this machine's); names compare by UTF-16 code units; box order is the id
+order. Dart's List.sort is not stable, so plants that compare equal may come out in a
+different order in the app; here they keep box order.
+--verify K re-computes K random plants with a scalar port of the Dart code.
+
+Usage:
+  python3 tools/forecast_watering.py backup.json [--today 2025-11-20] [--tz Asia/Seoul]
+         [--days 30] [--sort nearestDue] [--top 10] [--verify 1000]
+"""
+import argparse
+import datetime
+import random
+import time
+import zoneinfo
+
+from merge_backups import read_backup, watered_us
+
+try:
+    import numpy as np
+except ImportError:
+    raise SystemExit('❌ numpy가 필요합니다: pip install numpy')
+
+DAY = 86400
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+SORT_OPTIONS = ('nearestDue', 'mostOverdue', 'nameAsc')
+
+
+def day_number(date: datetime.date) -> int:
+    return date.toordinal() - EPOCH_ORDINAL
+
+
+def day_date(day: int) -> datetime.date:
+    return datetime.date.fromordinal(int(day) + EPOCH_ORDINAL)
+
+
+def parsed_day(value: str) -> int:
+    """Day number of DateTime.parse(value).year/month/day (UTC fields when the string has an offset)."""
+    dt = datetime.datetime.fromisoformat(value)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc)
+    return day_number(dt.date())
+
+
+def dday_text(days_until: int) -> str:
+    """DateFormats.getDDayText"""
+    if days_until == 0:
+        return '오늘'
+    if days_until > 0:
+        return f'D-{days_until}'
+    return f'+{-days_until}일 밀림'
+
+
+def utf16_key(s: str) -> bytes:
+    # Dart String.compareTo compares UTF-16 code units; big-endian bytes sort the same way
+    return s.encode('utf-16-be')
+
+
+class LocalTime:
+    """Local midnights and UTC offsets of a time zone, as Dart's local DateTime sees them."""
+
+    def __init__(self, tz_name=None):
+        self.name = tz_name or 'local'
+        self.tz = zoneinfo.ZoneInfo(tz_name) if tz_name else None
+
+    def midnight(self, day: int) -> int:
+        """Epoch seconds of DateTime(y, m, d) for a day number."""
+        d = day_date(day)
+        if self.tz is None:
+            return int(time.mktime((d.year, d.month, d.day, 0, 0, 0, 0, 0, -1)))
+        return int(datetime.datetime(d.year, d.month, d.day, tzinfo=self.tz).timestamp())
+
+    def offset_at(self, t: int) -> int:
+        if self.tz is None:
+            return time.localtime(t).tm_gmtoff
+        return int(datetime.datetime.fromtimestamp(t, self.tz).utcoffset().total_seconds())
+
+    def local_day(self, t: int) -> int:
+        return (t + self.offset_at(t)) // DAY
+
+
+class _Tables:
+    """Vectorized LocalTime over a range of days: midnight per day, offset per UTC hour."""
+
+    def __init__(self, local: LocalTime, lo: int, hi: int):
+        self.lo = lo
+        self.midnights = np.array([local.midnight(d) for d in range(lo, hi + 1)], dtype=np.int64)
+        offsets = np.arange(lo, hi + 1, dtype=np.int64) * DAY - self.midnights
+        self.fixed = int(offsets[0]) if (offsets == offsets[0]).all() else None
+        if self.fixed is None:
+            # Offsets can change at any hour: tabulate them per UTC hour over the range
+            self.t0 = int(self.midnights[0]) - DAY
+            hours = (int(self.midnights[-1]) + 2 * DAY - self.t0) // 3600
+            self.hourly = np.array([local.offset_at(self.t0 + h * 3600) for h in range(hours)], dtype=np.int64)
+
+    def midnight(self, days):
+        return self.midnights[np.asarray(days) - self.lo]
+
+    def local_day(self, instants):
+        if self.fixed is not None:
+            return (instants + self.fixed) // DAY
+        return (instants + self.hourly[(instants - self.t0) // 3600]) // DAY
+
+
+def ordered(*keys):
+    """
+    Row order by integer keys (first = most significant), equal rows in box order.
+    The keys and the row number are packed into one unique int64 when they fit, which
+    sorts several times faster than a stable lexsort.
+    """
+    n = len(keys[0])
+    packed = np.zeros(n, dtype=np.int64)
+    capacity = 1
+    for key in keys:
+        key = np.asarray(key, dtype=np.int64)
+        lo = int(key.min(initial=0))
+        span = int(key.max(initial=0)) - lo + 1
+        capacity *= span
+        if capacity * n >= 2 ** 62:
+            return np.lexsort(tuple(reversed(keys)))
+        packed = packed * span + (key - lo)
+    return np.argsort(packed * n + np.arange(n))
+
+
+class PlantColumns:
+    """One backup as columns, rows in Hive box order (ids by UTF-16 code units)."""
+
+    def __init__(self, ids, names, interval, last_day, notify_hour, notify_minute, active):
+        self.ids = ids
+        self.names = names
+        self.interval = np.asarray(interval, dtype=np.int64)
+        self.last_day = np.asarray(last_day, dtype=np.int64)
+        self.notify_hour = np.asarray(notify_hour, dtype=np.int8)
+        self.notify_minute = np.asarray(notify_minute, dtype=np.int8)
+        self.active = np.asarray(active, dtype=bool)
+        self._name_rank = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def name_rank(self):
+        if self._name_rank is None:
+            order = sorted(set(self.names), key=utf16_key)
+            rank = {name: i for i, name in enumerate(order)}
+            self._name_rank = np.array([rank[n] for n in self.names], dtype=np.int64)
+        return self._name_rank
+
+
+def _field(record: dict, key: str, default):
+    value = record.get(key)
+    return default if value is None else value
+
+
+def load_backup(path: str):
+    """
+    Return (PlantColumns, {id: raw lastWateredAt}). Duplicate ids follow importFromJson.
+    A .pwbc archive (backup_columns.py) is read straight from its columns.
+    """
+    from backup_columns import ColumnarBackup, is_columnar  # imports this module
+
+    if is_columnar(path):
+        with ColumnarBackup(path) as backup:
+            return backup.plant_columns()
+    plants = {}
+    for record in read_backup(path):
+        current = plants.get(record['id'])
+        if current is None or watered_us(record['lastWateredAt']) > watered_us(current['lastWateredAt']):
+            plants[record['id']] = record
+    ids = sorted(plants, key=utf16_key)
+    rows = [plants[i] for i in ids]
+    cols = PlantColumns(
+        ids=ids,
+        names=[p['name'] for p in rows],
+        interval=[p['intervalDays'] for p in rows],
+        last_day=[parsed_day(p['lastWateredAt']) for p in rows],
+        # Plant.fromJson defaults
+        notify_hour=[_field(p, 'notifyHour', 9) for p in rows],
+        notify_minute=[_field(p, 'notifyMinute', 0) for p in rows],
+        active=[_field(p, 'isActive', True) for p in rows],
+    )
+    return cols, {i: plants[i]['lastWateredAt'] for i in ids}
+
+
+class Forecast:
+    def __init__(self, cols: PlantColumns, today: int, local: LocalTime):
+        self.cols = cols
+        self.today = today
+        ends = cols.last_day + cols.interval
+        lo = min(int(cols.last_day.min(initial=today)), int(ends.min(initial=today)), today) - 1
+        hi = max(int(ends.max(initial=today)), today) + 1
+        tables = _Tables(local, lo, hi)
+        # nextWaterDate: DateTime(y, m, d).add(Duration(days: intervalDays))
+        self.next_instant = tables.midnight(cols.last_day) + cols.interval * DAY
+        # DateTime(nextWaterDate.year, .month, .day)
+        self.next_day = tables.local_day(self.next_instant)
+        # nextDate.difference(todayDate).inDays truncates toward zero
+        diff = tables.midnight(self.next_day) - tables.midnight(today)
+        self.days_until = np.sign(diff) * (np.abs(diff) // DAY)
+        self.overdue = self.next_day < today
+        self.due_today = self.next_day == today
+
+    def today_and_overdue(self):
+        """Row indices of getTodayAndOverdue(), in its order."""
+        rows = np.flatnonzero(self.cols.active & (self.due_today | self.overdue))
+        return rows[ordered(self.days_until[rows])]
+
+    def sorted_rows(self, option: str):
+        """Row indices of getAll(sort: option): inactive plants last."""
+        if option == 'nearestDue':
+            key = self.next_instant
+        elif option == 'mostOverdue':
+            key = self.days_until
+        elif option == 'nameAsc':
+            key = self.cols.name_rank()
+        else:
+            raise ValueError(f'unknown sort option: {option}')
+        return ordered(~self.cols.active, key)
+
+    def calendar(self, days: int):
+        """(dueOn counts, projected counts) for today .. today + days - 1, active plants only."""
+        active = self.cols.active
+        offset = self.next_day[active] - self.today
+        due_on = np.bincount(offset[(offset >= 0) & (offset < days)], minlength=days)[:days]
+
+        # Projection: watered on every due day, overdue plants today.
+        # First due day per (interval, day), then counts[d] += counts[d - interval] per row.
+        # Intervals of `days` or more (and invalid ones <= 0) never repeat inside the window.
+        first = np.maximum(offset, 0)
+        inside = first < days
+        interval = np.clip(self.cols.interval[active][inside], 0, days)
+        counts = np.bincount(interval * days + first[inside], minlength=(days + 1) * days).reshape(days + 1, days)
+        for k in range(1, days):
+            for j in range(k, days, k):  # one block at a time: block j - k is final
+                counts[k, j:j + k] += counts[k, j - k:j - k + min(k, days - j)]
+        return due_on, counts.sum(axis=0)
+
+
+def dart_reference(last_watered_at: str, interval: int, today: datetime.date, tz=None):
+    """
+    Scalar port of Plant.nextWaterDate / daysUntilNextWater with plain datetime objects
+    (tz=None: this machine's local time). Returns (next date, days until).
+    """
+    def local_midnight(d: datetime.date) -> float:  # DateTime(y, m, d).millisecondsSinceEpoch / 1000
+        return datetime.datetime(d.year, d.month, d.day, tzinfo=tz).timestamp()
+
+    last = datetime.datetime.fromisoformat(last_watered_at)
+    if last.tzinfo is not None:  # DateTime.parse returns a UTC DateTime
+        last = last.astimezone(datetime.timezone.utc)
+    # Duration is absolute time; aware datetime + timedelta would be wall-clock arithmetic
+    next_water = datetime.datetime.fromtimestamp(local_midnight(last.date()) + interval * DAY, tz)
+    diff = local_midnight(next_water.date()) - local_midnight(today)
+    return next_water.date(), int(diff / DAY)  # Duration.inDays truncates toward zero
+
+
+def verify(cols: PlantColumns, fc: Forecast, raw: dict, today: datetime.date, local: LocalTime, samples: int) -> int:
+    """Compare random plants with the scalar port; return the number of mismatches."""
+    rng = random.Random(0)
+    rows = rng.sample(range(len(cols)), min(samples, len(cols)))
+    bad = 0
+    for row in rows:
+        expected = dart_reference(raw[cols.ids[row]], int(cols.interval[row]), today, local.tz)
+        got = (day_date(fc.next_day[row]), int(fc.days_until[row]))
+        if got != expected:
+            bad += 1
+            if bad <= 5:
+                print(f'  ❌ {cols.ids[row]}: {got} ≠ {expected}')
+    return bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Forecast watering schedules for every plant of a backup')
+    parser.add_argument('backup', help='plant_water_buddy_backup.json')
+    parser.add_argument('--today', type=datetime.date.fromisoformat, default=None, help='YYYY-MM-DD (default: today)')
+    parser.add_argument('--tz', default=None, help='IANA time zone of the device (default: this machine)')
+    parser.add_argument('--days', type=int, default=30, help='calendar length')
+    parser.add_argument('--sort', choices=SORT_OPTIONS, default='nearestDue')
+    parser.add_argument('--top', type=int, default=10, help='rows of the sorted list to print')
+    parser.add_argument('--verify', type=int, default=0, metavar='K', help='check K random plants against the scalar Dart port')
+    args = parser.parse_args()
+
+    local = LocalTime(args.tz)
+    today = args.today or datetime.datetime.now(local.tz).date()
+    t0 = time.perf_counter()
+    cols, raw = load_backup(args.backup)
+    t1 = time.perf_counter()
+    fc = Forecast(cols, day_number(today), local)
+    todo = fc.today_and_overdue()
+    order = fc.sorted_rows(args.sort)
+    due_on, projected = fc.calendar(args.days)
+    t2 = time.perf_counter()
+
+    print(f'🌱 식물 {len(cols):,}개 (활성 {int(cols.active.sum()):,}개), 기준일 {today} ({local.name})')
+    print(f'   오늘 {int((fc.due_today & cols.active).sum()):,}개, 밀림 {int((fc.overdue & cols.active).sum()):,}개, '
+          f'오늘/밀림 목록 {len(todo):,}개')
+    print(f'\n📅 {args.days}일 달력 (dueOn / 예상):')
+    for d in range(args.days):
+        print(f'   {day_date(day_number(today) + d)}  {int(due_on[d]):>8,}  {int(projected[d]):>8,}')
+    print(f'\n🔝 getAll({args.sort}) 상위 {min(args.top, len(cols))}개:')
+    for row in order[:args.top]:
+        print(f'   {cols.ids[row]:<24} {cols.names[row]:<16} {day_date(fc.next_day[row])}  {dday_text(int(fc.days_until[row]))}'
+              f"{'' if cols.active[row] else '  (비활성)'}")
+    print(f'\n⏱️ 로드 {t1 - t0:.2f}s, 계산 {(t2 - t1) * 1000:.0f} ms')
+
+    if args.verify:
+        bad = verify(cols, fc, raw, today, local, args.verify)
+        if bad:
+            raise SystemExit(f'❌ 스칼라 포트와 불일치 {bad}건')
+        print(f'✅ 스칼라 포트와 일치: {min(args.verify, len(cols)):,}개')
+
+
+if __name__ == '__main__':
+    main()
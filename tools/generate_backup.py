@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Generate large plant_water_buddy_backup.json fixtures in the exportToJson schema
+(PlantRepository.exportToJson: 2-space indent, fields in Plant.toJson order) for load
+tests and benchmarks of import, sorting, forecasting and notification scheduling.
+
+Every field of plant #i is a pure function of (--seed, i) - lastWateredAt also of the
+file number - through a counter-based hash (SplitMix64), so the output is identical
+for the same arguments whatever the chunking, and any slice can be regenerated alone.
+Records are built a chunk at a time with NumPy (formatted in --workers processes,
+default: one per CPU) and written in order as they arrive, so memory stays flat for
+any --plants.
+
+Distributions (see the tables below): intervalDays weighted towards 7 / 3 / 14,
+notifyHour:notifyMinute mostly the app default 09:00, --inactive share of paused
+plants, --images share with an image_picker path, Korean names with optional
+number / emoji suffix, lastWateredAt within the last interval for most plants and
+up to three intervals back for the rest (local time, microseconds, like DateTime.now()).
+
+With --files K, file k holds plants k*step .. k*step+N-1 where step = N*(1-overlap),
+so neighbouring files share --overlap of their ids, with different lastWateredAt
+(exercises the importFromJson / merge_backups rule).
+
+Usage:
+  python3 tools/generate_backup.py out.json --plants 1000000 [--seed 1] [--today 2025-11-20]
+  python3 tools/generate_backup.py build/fixtures/backup.json --plants 500000 --files 4 --overlap 0.25
+"""
+import argparse
+import datetime
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from write_behind import replace_file
+
+try:
+    import numpy as np
+except ImportError:
+    raise SystemExit('❌ numpy가 필요합니다: pip install numpy')
+
+CHUNK = 1 << 16
+BACKUP_VERSION = '1.0'
+
+INTERVAL_WEIGHTS = {1: 2, 2: 5, 3: 12, 4: 6, 5: 10, 7: 30, 10: 10, 14: 13, 21: 6, 30: 6}
+DEFAULT_NOTIFY_SHARE = 0.7  # Plant defaults: 09:00
+HOUR_WEIGHTS = {6: 3, 7: 10, 8: 14, 9: 8, 10: 6, 12: 4, 13: 3, 18: 8, 19: 12, 20: 14, 21: 12, 22: 6}
+MINUTE_WEIGHTS = {0: 50, 10: 5, 15: 8, 20: 5, 30: 20, 40: 4, 45: 6, 50: 2}
+OVERDUE_SHARE = 0.2
+NAMES = ('몬스테라', '스킨답서스', '산세베리아', '스투키', '고무나무', '떡갈고무나무', '여인초', '극락조',
+         '알로카시아', '필로덴드론', '칼라데아', '마란타', '아이비', '틸란드시아', '다육이', '선인장',
+         '금전수', '행운목', '해피트리', '올리브나무', '율마', '로즈마리', '바질', '민트', '라벤더',
+         '스파티필럼', '안스리움', '호야', '디시디아', '박쥐란', '보스턴고사리', '아레카야자')
+SUFFIXES = ('',) * 10 + tuple(f' {n}' for n in range(2, 7)) + tuple(
+    ' ' + e for e in ('🌿', '🌱', '🌵', '🪴', '🌸', '🍀', '🌼', '🌷'))
+IMAGE_DIR = '/data/user/0/com.ambrosia.plantwaterbuddy/cache/'
+
+RECORD = (b'    {\n'
+          b'      "id": "%s",\n'
+          b'      "name": "%s",\n'
+          b'      "imagePath": %s,\n'
+          b'      "intervalDays": %d,\n'
+          b'      "lastWateredAt": "%s",\n'
+          b'      "notifyHour": %d,\n'
+          b'      "notifyMinute": %d,\n'
+          b'      "isActive": %s\n'
+          b'    }')
+# Names are written without escaping
+assert not any(c in n + s for n in NAMES for s in SUFFIXES for c in '"\\')
+
+# Hash streams: one per field
+S_ID_HI, S_ID_LO, S_NAME, S_SUFFIX, S_INTERVAL, S_NOTIFY, S_HOUR, S_MINUTE, S_ACTIVE, S_IMAGE, \
+    S_OVERDUE, S_DAYS, S_TIME = range(13)
+GOLDEN = 0x9E3779B97F4A7C15
+_GOLDEN = np.uint64(GOLDEN)
+_HEX = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+_UUID_DASHES = (8, 13, 18, 23)
+_NAME_TABLE = np.array([(n + s).encode('utf-8') for n in NAMES for s in SUFFIXES], dtype=object)
+_BOOL = (b'false', b'true')
+
+
+def _mix(x):
+    """SplitMix64 finalizer over a uint64 array (wrapping arithmetic)."""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class _Hash:
+    def __init__(self, seed: int, index, file_no=0):
+        self.base = _mix(np.uint64(seed & 0xFFFFFFFFFFFFFFFF) ^ (index.astype(np.uint64) * _GOLDEN))
+        self.file_no = file_no
+
+    def bits(self, stream: int, per_file=False):
+        salt = ((stream + 1) * GOLDEN + (self.file_no << 32 if per_file else 0)) & 0xFFFFFFFFFFFFFFFF
+        return _mix(self.base + np.uint64(salt))
+
+    def unit(self, stream: int, per_file=False):
+        return (self.bits(stream, per_file) >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+    def choice(self, stream: int, weights: dict):
+        values = np.array(list(weights), dtype=np.int64)
+        cumulative = np.cumsum(list(weights.values()), dtype=np.float64)
+        return values[np.searchsorted(cumulative / cumulative[-1], self.unit(stream), side='right')]
+
+
+def uuid4_strings(hi, lo) -> list:
+    """Random (version 4) UUIDs from two uint64 arrays, as ASCII bytes."""
+    hi = (hi & ~np.uint64(0xF000)) | np.uint64(0x4000)
+    lo = (lo & ~np.uint64(0xC << 60)) | np.uint64(0x8 << 60)
+    raw = np.stack([hi, lo], axis=1).astype('>u8').view(np.uint8).reshape(-1, 16)
+    digits = np.empty((len(raw), 32), dtype=np.uint8)
+    digits[:, 0::2] = _HEX[raw >> 4]
+    digits[:, 1::2] = _HEX[raw & 15]
+    out = np.full((len(raw), 36), ord('-'), dtype=np.uint8)
+    out[:, np.setdiff1d(np.arange(36), _UUID_DASHES)] = digits
+    return out.view('S36').ravel().tolist()
+
+
+def dart_iso_strings(stamps):
+    """Local DateTime.toIso8601String() of datetime64[us] wall times: microsecond digits only when non-zero."""
+    stamps = stamps.astype('datetime64[us]')
+    whole_ms = stamps.astype(np.int64) % 1000 == 0
+    return np.where(whole_ms,
+                    np.datetime_as_string(stamps, unit='ms').astype('S26'),
+                    np.datetime_as_string(stamps, unit='us').astype('S26'))
+
+
+def plant_chunk(seed: int, index, file_no: int, today: datetime.date, inactive: float, images: float) -> bytes:
+    h = _Hash(seed, index, file_no)
+    ids = uuid4_strings(h.bits(S_ID_HI), h.bits(S_ID_LO))
+    names = _NAME_TABLE[(h.bits(S_NAME) % np.uint64(len(NAMES))).astype(np.int64) * len(SUFFIXES)
+                        + (h.bits(S_SUFFIX) % np.uint64(len(SUFFIXES))).astype(np.int64)].tolist()
+    interval = h.choice(S_INTERVAL, INTERVAL_WEIGHTS)
+    default_notify = h.unit(S_NOTIFY) < DEFAULT_NOTIFY_SHARE
+    hour = np.where(default_notify, 9, h.choice(S_HOUR, HOUR_WEIGHTS))
+    minute = np.where(default_notify, 0, h.choice(S_MINUTE, MINUTE_WEIGHTS))
+    active = h.unit(S_ACTIVE) >= inactive
+    image_bits = h.bits(S_IMAGE)
+    has_image = (image_bits >> np.uint64(11)).astype(np.float64) * 2.0 ** -53 < images
+
+    # Days since watering: within the interval, or (overdue) up to three intervals back
+    overdue = h.unit(S_OVERDUE, per_file=True) < OVERDUE_SHARE
+    span = np.where(overdue, 2 * interval, interval + 1)
+    days_ago = np.where(overdue, interval + 1, 0) + (h.unit(S_DAYS, per_file=True) * span).astype(np.int64)
+    # Time of day between 07:00 and 23:00, with microseconds
+    micros = (7 * 3600 * 10 ** 6 + h.unit(S_TIME, per_file=True) * 16 * 3600 * 10 ** 6).astype(np.int64)
+    wall = np.datetime64(today, 'us') - days_ago.astype('timedelta64[D]') + micros.astype('timedelta64[us]')
+    watered = dart_iso_strings(wall).tolist()
+
+    paths = [b'"%simage_picker%016X.jpg"' % (IMAGE_DIR.encode(), bits) if flag else b'null'
+             for flag, bits in zip(has_image.tolist(), image_bits.tolist())]
+    return b',\n'.join(map(RECORD.__mod__, zip(
+        ids, names, paths, interval.tolist(), watered, hour.tolist(), minute.tolist(),
+        [_BOOL[a] for a in active.tolist()])))
+
+
+def _chunk_job(job) -> bytes:
+    seed, lo, hi, file_no, today, inactive, images = job
+    return plant_chunk(seed, np.arange(lo, hi, dtype=np.int64), file_no, today, inactive, images)
+
+
+def _chunks(jobs, pool, in_flight: int):
+    """Chunk bytes in order; with a pool at most in_flight chunks are queued or held."""
+    if pool is None:
+        yield from map(_chunk_job, jobs)
+        return
+    pending = deque()
+    for job in jobs:
+        pending.append(pool.submit(_chunk_job, job))
+        if len(pending) >= in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def write_backup(path: str, first: int, count: int, file_no: int, args, pool=None) -> int:
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    jobs = [(args.seed, lo, min(lo + CHUNK, first + count), file_no, args.today, args.inactive, args.images)
+            for lo in range(first, first + count, CHUNK)]
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            exported_at = f'{args.today.isoformat()}T12:{file_no % 60:02d}:00.000'
+            out.write(b'{\n  "version": "%s",\n  "exportedAt": "%s",\n  "plants": ['
+                      % (BACKUP_VERSION.encode(), exported_at.encode()))
+            for n, chunk in enumerate(_chunks(jobs, pool, 2 * args.workers)):
+                out.write((b',\n' if n else b'\n') + chunk)
+            out.write(b'\n  ]\n}' if count else b']\n}')
+        replace_file(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return os.path.getsize(path)
+
+
+def output_paths(output: str, files: int) -> list:
+    if files == 1:
+        return [output]
+    stem, ext = os.path.splitext(output)
+    return [f'{stem}-{k + 1}{ext or ".json"}' for k in range(files)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic plant_water_buddy_backup.json fixtures')
+    parser.add_argument('output', help='backup file to write (with --files K: <name>-1.json .. <name>-K.json)')
+    parser.add_argument('--plants', type=int, default=100_000, help='plants per file')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--today', type=datetime.date.fromisoformat, default=datetime.date.today(),
+                        help='YYYY-MM-DD the watering dates are relative to (default: today; fix it for identical output)')
+    parser.add_argument('--inactive', type=float, default=0.08, help='share of inactive plants')
+    parser.add_argument('--images', type=float, default=0.35, help='share of plants with a photo')
+    parser.add_argument('--files', type=int, default=1, help='number of backup files')
+    parser.add_argument('--overlap', type=float, default=0.2, help='share of ids a file shares with the next one')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='processes formatting chunks')
+    args = parser.parse_args()
+    if args.plants < 0 or args.files < 1 or not 0 <= args.overlap <= 1:
+        raise SystemExit('❌ --plants >= 0, --files >= 1, 0 <= --overlap <= 1')
+
+    step = round(args.plants * (1 - args.overlap))
+    total = 0
+    t0 = time.perf_counter()
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        for file_no, path in enumerate(output_paths(args.output, args.files)):
+            t1 = time.perf_counter()
+            size = write_backup(path, file_no * step, args.plants, file_no, args, pool)
+            total += size
+            elapsed = time.perf_counter() - t1
+            print(f'🌱 {path}: 식물 {args.plants:,}개, {size / 1e6:,.1f} MB '
+                  f'({elapsed:.1f}s, {size / 1e6 / max(elapsed, 1e-9):.0f} MB/s)')
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    elapsed = time.perf_counter() - t0
+    print(f'✅ 생성 완료: {args.files}개 파일, {total / 1e6:,.1f} MB, {elapsed:.1f}s '
+          f'(seed {args.seed}, 기준일 {args.today})')
+
+
+if __name__ == '__main__':
+    main()
@@ -7,51 +7,33 @@ Generate a premium Play Store Feature Graphic (1024x500) with refined visuals:
 - Short, crisp subtitle
 - Clean chips (✓ 맞춤 주기 / ✓ 정확 알림 / ✓ D‑day)
 Output: assets/store_graphics/feature_graphic_premium.png
+
+--master WIDTH renders the same layout scaled to WIDTH (e.g. 4096) into
+assets/store_graphics/masters/; the background is rendered in tiles on all cores
+(tiles.py), the icon and text are composed on top.
+
+Usage:
+  python3 tools/generate_feature_graphic_premium.py [--master WIDTH ...] [--workers N] [--profile]
 """
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageDraw, ImageFilter
+import argparse
+import functools
+import math
 import os
 
+from fonts import chain_font, draw_text, text_bbox
+from layer_cache import cached_layer, cached_icon, cached_shadow, get_cache
+from profiling import stage, enable_from_argv
+from tiles import render_tiled
+from write_behind import flush_writes, get_writer, save_async
+
 WIDTH, HEIGHT = 1024, 500
 SAFE = 36
 BG_BASE = (239, 247, 243)  # fresh light greenish neutral
 ROOT = os.path.dirname(os.path.dirname(__file__))
 ALT_ROOT = os.path.dirname(ROOT)
-
-# Canvas
-img = Image.new('RGB', (WIDTH, HEIGHT), BG_BASE)
-draw = ImageDraw.Draw(img)
-
-# Background: radial layers
-radials = [
-    ((int(WIDTH*0.20), int(HEIGHT*0.80)), 480, (204, 233, 215)),
-    ((int(WIDTH*0.85), int(HEIGHT*0.25)), 420, (200, 228, 210)),
-]
-for (cx, cy), radius, color in radials:
-    for r in range(radius, 0, -3):
-        t = r / radius
-        shade = (
-            int(color[0] + (BG_BASE[0] - color[0]) * t),
-            int(color[1] + (BG_BASE[1] - color[1]) * t),
-            int(color[2] + (BG_BASE[2] - color[2]) * t),
-        )
-        draw.ellipse([cx-r, cy-r, cx+r, cy+r], fill=shade)
-
-# Subtle diagonal sheen overlay
-sheen = Image.new('RGBA', (WIDTH, HEIGHT), (255,255,255,0))
-sd = ImageDraw.Draw(sheen)
-for y in range(0, HEIGHT, 4):
-    alpha = int(26 * max(0, 1 - y/HEIGHT))
-    sd.line([(0, y), (WIDTH, y)], fill=(255,255,255,alpha), width=1)
-img.paste(sheen, (0,0), sheen)
-
-# Watermark leaf silhouette
-wm = Image.new('RGBA', (WIDTH, HEIGHT), (0,0,0,0))
-wmd = ImageDraw.Draw(wm)
-# Simple abstract leaf using polygons and arcs
-wmd.polygon([(870, 450), (820, 260), (980, 320)], fill=(170, 195, 180, 50))
-wmd.ellipse([770, 150, 980, 360], outline=(170, 195, 180, 55), width=10)
-wm = wm.filter(ImageFilter.GaussianBlur(10))
-img.paste(wm, (0,0), wm)
+MASTERS_DIR = os.path.join(ROOT, 'assets', 'store_graphics', 'masters')
+WATERMARK_BLUR = 10
 
 # Fonts (rounded-preferred)
 FONT_CANDIDATES = [
@@ -60,13 +42,16 @@ FONT_CANDIDATES = [
     '/Library/Fonts/NanumSquareRoundR.ttf',
     '/System/Library/Fonts/AppleSDGothicNeo.ttc',
 ]
+if os.environ.get('PWB_FONT'):  # explicit override (benchmarks, CI)
+    FONT_CANDIDATES.insert(0, os.environ['PWB_FONT'])
 font_title = font_sub = font_badge = None
 for p in FONT_CANDIDATES:
     if os.path.exists(p):
         try:
-            font_title = ImageFont.truetype(p, 76)
-            font_sub = ImageFont.truetype(p, 34)
-            font_badge = ImageFont.truetype(p, 26)
+            font_title = chain_font(p, 76)
+            font_sub = chain_font(p, 34)
+            font_badge = chain_font(p, 26)
+            FONT_PATH = p
             print('✅ 폰트 사용:', p)
             break
         except Exception:
@@ -74,6 +59,14 @@ for p in FONT_CANDIDATES:
 if not font_title:
     raise SystemExit('한글 폰트 로드 실패')
 
+
+@functools.lru_cache(maxsize=None)
+def fonts_at(scale):
+    """(title, sub, badge) fonts for a layout scaled by scale"""
+    if scale == 1:
+        return font_title, font_sub, font_badge
+    return tuple(chain_font(FONT_PATH, round(size * scale)) for size in (76, 34, 26))
+
 # Icon finder
 def find_icon():
     candidates = [
@@ -90,85 +83,184 @@ def find_icon():
         if os.path.exists(p2): return p2
     return None
 
-# Left icon container
-icon_box = 320
-icon_x = SAFE
-icon_y = SAFE + 12
-container = Image.new('RGBA', (icon_box, icon_box), (0,0,0,0))
-cd = ImageDraw.Draw(container)
-cd.rounded_rectangle([0,0,icon_box,icon_box], radius=48, fill=(255,255,255,240))
-container = container.filter(ImageFilter.GaussianBlur(0.4))
-img.paste(container, (icon_x, icon_y), container)
-
-icon_path = find_icon()
-if icon_path:
-    icon = Image.open(icon_path).convert('RGBA')
-    pad = 34
-    target = icon_box - pad*2
-    icon = icon.resize((target, target), Image.Resampling.LANCZOS)
-    shadow = Image.new('RGBA', (target, target), (0,0,0,55))
-    shadow = shadow.filter(ImageFilter.GaussianBlur(6))
-    img.paste(shadow, (icon_x+pad+4, icon_y+pad+6), shadow)
-    img.paste(icon, (icon_x+pad, icon_y+pad), icon)
-else:
-    draw.rounded_rectangle([icon_x+20,icon_y+20,icon_x+icon_box-20,icon_y+icon_box-20], radius=36, fill=(86,170,125))
-
-# Title with Lite pill
-title_main = '물주기 알림 '
-Lite = 'Lite'
-text_x = icon_x + icon_box + 56
-text_y = SAFE + 24
-# Main title
-draw.text((text_x, text_y), title_main, font=font_title, fill=(36, 56, 46))
-# Measure to place pill
-main_w = draw.textbbox((0,0), title_main, font=font_title)[2]
-# Pill background
-pill_pad_x, pill_h = 18, font_title.size + 6
-pill_w = draw.textbbox((0,0), Lite, font=font_title)[2] + pill_pad_x*2
-pill_img = Image.new('RGBA', (pill_w, pill_h), (0,0,0,0))
-pd = ImageDraw.Draw(pill_img)
-pd.rounded_rectangle([0,0,pill_w,pill_h], radius=int(pill_h/2), fill=(58, 141, 96, 255))
-# Slight highlight
-pd.rounded_rectangle([1,1,pill_w-1,pill_h-1], radius=int(pill_h/2), outline=(255,255,255,30), width=2)
-img.paste(pill_img, (text_x + main_w + 10, text_y - 6), pill_img)
-# Pill text
-pill_text_x = text_x + main_w + 10 + pill_pad_x
-pill_text_y = text_y - 2
-draw.text((pill_text_x, pill_text_y), Lite, font=font_title, fill=(255,255,255))
-
-# Subtitle (short & crisp)
-subtitle = '맞춤 주기 · 정확 알림 · D‑day'
-sub_y = text_y + 100
-draw.text((text_x, sub_y), subtitle, font=font_sub, fill=(70, 85, 78))
-
-# Chips
-chips = ['✓ 맞춤 주기', '✓ 정확 알림', '✓ D‑day 표시']
-chip_y = sub_y + 60
-chip_gap = 14
-chip_h = 54
-chip_pad_x = 22
-cx = text_x
-for label in chips:
-    tw = draw.textbbox((0,0), label, font=font_badge)[2]
-    bw = tw + chip_pad_x*2
-    if cx + bw > WIDTH - SAFE:
+
+def render_background(scale=1, box=None):
+    """Background of the layout scaled by scale, or only its region box (tiles.py)"""
+    width, height = round(WIDTH * scale), round(HEIGHT * scale)
+    x0, y0, x1, y1 = box or (0, 0, width, height)
+
+    def px(v, origin=0):
+        return round(v * scale) - origin
+
+    # Canvas
+    img = Image.new('RGB', (x1 - x0, y1 - y0), BG_BASE)
+    draw = ImageDraw.Draw(img)
+
+    # Background: radial layers
+    radials = [
+        ((int(WIDTH*0.20), int(HEIGHT*0.80)), 480, (204, 233, 215)),
+        ((int(WIDTH*0.85), int(HEIGHT*0.25)), 420, (200, 228, 210)),
+    ]
+    for (cx, cy), radius, color in radials:
+        for r in range(radius, 0, -3):
+            t = r / radius
+            shade = (
+                int(color[0] + (BG_BASE[0] - color[0]) * t),
+                int(color[1] + (BG_BASE[1] - color[1]) * t),
+                int(color[2] + (BG_BASE[2] - color[2]) * t),
+            )
+            draw.ellipse([px(cx-r, x0), px(cy-r, y0), px(cx+r, x0), px(cy+r, y0)], fill=shade)
+
+    # Subtle diagonal sheen overlay
+    sheen = Image.new('RGBA', img.size, (255,255,255,0))
+    sd = ImageDraw.Draw(sheen)
+    for y in range(0, HEIGHT, 4):
+        alpha = int(26 * max(0, 1 - y/HEIGHT))
+        sd.line([(-x0, px(y, y0)), (width - x0, px(y, y0))], fill=(255,255,255,alpha), width=px(1))
+    img.paste(sheen, (0,0), sheen)
+
+    # Watermark leaf silhouette
+    wm = Image.new('RGBA', img.size, (0,0,0,0))
+    wmd = ImageDraw.Draw(wm)
+    # Simple abstract leaf using polygons and arcs
+    wmd.polygon([(px(870, x0), px(450, y0)), (px(820, x0), px(260, y0)), (px(980, x0), px(320, y0))],
+                fill=(170, 195, 180, 50))
+    wmd.ellipse([px(770, x0), px(150, y0), px(980, x0), px(360, y0)], outline=(170, 195, 180, 55), width=px(10))
+    wm = wm.filter(ImageFilter.GaussianBlur(WATERMARK_BLUR * scale))
+    img.paste(wm, (0,0), wm)
+    return img
+
+
+def background_overlap(scale) -> int:
+    """Tile overlap covering the watermark blur (three box-blur passes of about the radius each)"""
+    return math.ceil(WATERMARK_BLUR * scale * 3) + 3
+
+
+def render(scale=1, workers=None):
+    """The feature graphic; scale > 1 renders a larger master with the background in tiles"""
+    def px(v):
+        return round(v * scale)
+    font_title, font_sub, font_badge = fonts_at(scale)
+
+    with stage('background'):
+        if scale == 1:
+            img = cached_layer('premium/background', render_background, size=(WIDTH, HEIGHT), base=BG_BASE)
+        else:
+            img = render_tiled(functools.partial(render_background, scale), (px(WIDTH), px(HEIGHT)),
+                               overlap=background_overlap(scale), workers=workers)
+        draw = ImageDraw.Draw(img)
+
+    with stage('icon paste'):
+        # Left icon container
+        icon_box = px(320)
+        icon_x = px(SAFE)
+        icon_y = px(SAFE + 12)
+        container = Image.new('RGBA', (icon_box, icon_box), (0,0,0,0))
+        cd = ImageDraw.Draw(container)
+        cd.rounded_rectangle([0,0,icon_box,icon_box], radius=px(48), fill=(255,255,255,240))
+        container = container.filter(ImageFilter.GaussianBlur(0.4 * scale))
+        img.paste(container, (icon_x, icon_y), container)
+
+        icon_path = find_icon()
+        if icon_path:
+            pad = px(34)
+            target = icon_box - pad*2
+            icon = cached_icon(icon_path, target)
+            shadow = cached_shadow(target, 55, 6 * scale)
+            img.paste(shadow, (icon_x+pad+px(4), icon_y+pad+px(6)), shadow)
+            img.paste(icon, (icon_x+pad, icon_y+pad), icon)
+        else:
+            draw.rounded_rectangle([icon_x+px(20),icon_y+px(20),icon_x+icon_box-px(20),icon_y+icon_box-px(20)],
+                                   radius=px(36), fill=(86,170,125))
+
+    with stage('text'):
+        # Title with Lite pill
+        title_main = '물주기 알림 '
+        Lite = 'Lite'
+        text_x = icon_x + icon_box + px(56)
+        text_y = px(SAFE + 24)
+        # Main title
+        draw_text(draw, (text_x, text_y), title_main, font=font_title, fill=(36, 56, 46))
+        # Measure to place pill
+        main_w = text_bbox(draw, (0,0), title_main, font=font_title)[2]
+        # Pill background
+        pill_pad_x, pill_h = px(18), font_title.size + px(6)
+        pill_w = text_bbox(draw, (0,0), Lite, font=font_title)[2] + pill_pad_x*2
+        pill_img = Image.new('RGBA', (pill_w, pill_h), (0,0,0,0))
+        pd = ImageDraw.Draw(pill_img)
+        pd.rounded_rectangle([0,0,pill_w,pill_h], radius=int(pill_h/2), fill=(58, 141, 96, 255))
+        # Slight highlight
+        pd.rounded_rectangle([px(1),px(1),pill_w-px(1),pill_h-px(1)], radius=int(pill_h/2), outline=(255,255,255,30),
+                             width=px(2))
+        img.paste(pill_img, (text_x + main_w + px(10), text_y - px(6)), pill_img)
+        # Pill text
+        pill_text_x = text_x + main_w + px(10) + pill_pad_x
+        pill_text_y = text_y - px(2)
+        draw_text(draw, (pill_text_x, pill_text_y), Lite, font=font_title, fill=(255,255,255))
+
+        # Subtitle (short & crisp)
+        subtitle = '맞춤 주기 · 정확 알림 · D‑day'
+        sub_y = text_y + px(100)
+        draw_text(draw, (text_x, sub_y), subtitle, font=font_sub, fill=(70, 85, 78))
+
+    with stage('badges'):
+        # Chips
+        chips = ['✓ 맞춤 주기', '✓ 정확 알림', '✓ D‑day 표시']
+        chip_y = sub_y + px(60)
+        chip_gap = px(14)
+        chip_h = px(54)
+        chip_pad_x = px(22)
         cx = text_x
-        chip_y += chip_h + 10
-    chip = Image.new('RGBA', (bw, chip_h), (0,0,0,0))
-    cd2 = ImageDraw.Draw(chip)
-    cd2.rounded_rectangle([0,0,bw,chip_h], radius=26, fill=(255,255,255,248))
-    cd2.rounded_rectangle([2,2,bw,chip_h], radius=26, outline=(0,0,0,24), width=2)
-    chip = chip.filter(ImageFilter.GaussianBlur(0.2))
-    img.paste(chip, (cx, chip_y), chip)
-    draw.text((cx + chip_pad_x, chip_y + (chip_h-font_badge.size)//2 - 1), label, font=font_badge, fill=(52, 66, 60))
-    cx += bw + chip_gap
-
-# Footer
-footer = '무료 · 오프라인 · 개인정보 수집 없음'
-draw.text((text_x, chip_y + chip_h + 28), footer, font=font_badge, fill=(92, 107, 99))
-
-# Save
-out_path = os.path.join(ROOT, 'assets', 'store_graphics', 'feature_graphic_premium.png')
-os.makedirs(os.path.dirname(out_path), exist_ok=True)
-img.save(out_path, 'PNG')
-print('✅ 프리미엄 Feature Graphic 생성:', os.path.relpath(out_path, ROOT))
+        for label in chips:
+            tw = text_bbox(draw, (0,0), label, font=font_badge)[2]
+            bw = tw + chip_pad_x*2
+            if cx + bw > px(WIDTH - SAFE):
+                cx = text_x
+                chip_y += chip_h + px(10)
+            chip = Image.new('RGBA', (bw, chip_h), (0,0,0,0))
+            cd2 = ImageDraw.Draw(chip)
+            cd2.rounded_rectangle([0,0,bw,chip_h], radius=px(26), fill=(255,255,255,248))
+            cd2.rounded_rectangle([px(2),px(2),bw,chip_h], radius=px(26), outline=(0,0,0,24), width=px(2))
+            chip = chip.filter(ImageFilter.GaussianBlur(0.2 * scale))
+            img.paste(chip, (cx, chip_y), chip)
+            draw_text(draw, (cx + chip_pad_x, chip_y + (chip_h-font_badge.size)//2 - px(1)), label, font=font_badge,
+                      fill=(52, 66, 60))
+            cx += bw + chip_gap
+
+    # Footer
+    footer = '무료 · 오프라인 · 개인정보 수집 없음'
+    draw_text(draw, (text_x, chip_y + chip_h + px(28)), footer, font=font_badge, fill=(92, 107, 99))
+    return img
+
+
+def main():
+    enable_from_argv('feature_graphic_premium')
+    parser = argparse.ArgumentParser(description='Render the premium Play Store feature graphic')
+    parser.add_argument('--master', type=int, action='append', default=[], metavar='WIDTH',
+                        help='also render a WIDTH-wide master into assets/store_graphics/masters/ (repeatable)')
+    parser.add_argument('--workers', type=int, default=None, help='background tile processes (default: CPU count)')
+    args = parser.parse_args()
+    with stage('render'):
+        img = render()
+    out_path = os.path.join(ROOT, 'assets', 'store_graphics', 'feature_graphic_premium.png')
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    save_async(img, out_path)
+    masters = []
+    for width in args.master:
+        with stage(f'master {width}'):
+            master = render(width / WIDTH, args.workers)
+        path = os.path.join(MASTERS_DIR, f'feature_graphic_premium_{width}.png')
+        os.makedirs(MASTERS_DIR, exist_ok=True)
+        save_async(master, path)
+        masters.append(f'{os.path.relpath(path, ROOT)} ({master.width}x{master.height})')
+    with stage('encode'):
+        flush_writes()
+    print('💾', get_writer().summary())
+    print('✅ 프리미엄 Feature Graphic 생성:', os.path.relpath(out_path, ROOT))
+    for line in masters:
+        print('✅ 원본:', line)
+    print('🗂️', get_cache().summary())
+
+
+if __name__ == '__main__':
+    main()
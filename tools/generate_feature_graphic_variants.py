@@ -11,10 +11,21 @@ Shared layout principles:
 - Square icon container (no clipping)
 - Korean fonts with rounded fallback if available
 - Responsive wrapping of subtitle and badges
+
+Usage:
+  python3 tools/generate_feature_graphic_variants.py [--shard i/N] [--profile]
+  --shard i/N  render only the i-th of N slices into build/shards/ (see sharding.py)
 """
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageDraw, ImageFilter
+import argparse
 import os
 
+from fonts import chain_font, draw_text, text_bbox
+from layer_cache import cached_layer, cached_icon, cached_shadow, get_cache
+from profiling import stage, profiled, enable_from_argv
+from sharding import ShardRun, add_shard_argument
+from write_behind import flush_writes, get_writer, save_async
+
 WIDTH, HEIGHT = 1024, 500
 SAFE = 40
 ICON_BOX = 320
@@ -35,13 +46,15 @@ FONT_CANDIDATES = [
     '/Library/Fonts/NanumSquareRoundL.ttf',
     '/System/Library/Fonts/AppleSDGothicNeo.ttc',
 ]
+if os.environ.get('PWB_FONT'):  # explicit override (benchmarks, CI)
+    FONT_CANDIDATES.insert(0, os.environ['PWB_FONT'])
 font_title = font_sub = font_badge = None
 for p in FONT_CANDIDATES:
     if os.path.exists(p):
         try:
-            font_title = ImageFont.truetype(p, 78)
-            font_sub = ImageFont.truetype(p, 34)
-            font_badge = ImageFont.truetype(p, 26)
+            font_title = chain_font(p, 78)
+            font_sub = chain_font(p, 34)
+            font_badge = chain_font(p, 26)
             print('✅ 폰트 사용:', p)
             break
         except Exception:
@@ -74,7 +87,7 @@ def wrap_text(draw, text, font, max_width):
     lines, line = [], ''
     for w in words:
         candidate = (line + ' ' + w).strip()
-        width = draw.textbbox((0,0), candidate, font=font)[2]
+        width = text_bbox(draw, (0,0), candidate, font=font)[2]
         if width <= max_width:
             line = candidate
         else:
@@ -86,6 +99,7 @@ def wrap_text(draw, text, font, max_width):
     return lines
 
 
+@profiled('icon paste')
 def draw_icon_container(base: Image.Image, theme: str):
     icon_x = SAFE
     icon_y = SAFE + 6
@@ -100,9 +114,8 @@ def draw_icon_container(base: Image.Image, theme: str):
     if app_icon_img:
         pad = 38
         target = ICON_BOX - pad*2
-        icon = app_icon_img.resize((target, target), Image.Resampling.LANCZOS)
-        shadow = Image.new('RGBA', (target, target), (0,0,0,60))
-        shadow = shadow.filter(ImageFilter.GaussianBlur(6))
+        icon = cached_icon(ICON_PATH, target)
+        shadow = cached_shadow(target, 60, 6)
         base.paste(shadow, (icon_x+pad+4, icon_y+pad+6), shadow)
         base.paste(icon, (icon_x+pad, icon_y+pad), icon)
     else:
@@ -111,12 +124,13 @@ def draw_icon_container(base: Image.Image, theme: str):
     return icon_x + ICON_BOX + 60, SAFE + 16  # text_x, text_y
 
 
+@profiled('badges')
 def draw_badges(img: Image.Image, draw: ImageDraw.ImageDraw, start_x: int, start_y: int, text_color, bg_color, outline_color):
     x = start_x
     y = start_y
     for label in BADGES:
         badge_text = label
-        tw = draw.textbbox((0,0), badge_text, font=font_badge)[2]
+        tw = text_bbox(draw, (0,0), badge_text, font=font_badge)[2]
         bw = tw + BADGE_PAD_X*2
         if x + bw > WIDTH - SAFE:
             x = start_x
@@ -127,13 +141,12 @@ def draw_badges(img: Image.Image, draw: ImageDraw.ImageDraw, start_x: int, start
         bd.rounded_rectangle([2,2,bw,BADGE_HEIGHT], radius=30, outline=outline_color, width=2)
         badge_img = badge_img.filter(ImageFilter.GaussianBlur(0.2))
         img.paste(badge_img, (x,y), badge_img)
-        draw.text((x+BADGE_PAD_X, y + (BADGE_HEIGHT-font_badge.size)/2 -2), badge_text, font=font_badge, fill=text_color)
+        draw_text(draw, (x+BADGE_PAD_X, y + (BADGE_HEIGHT-font_badge.size)/2 -2), badge_text, font=font_badge, fill=text_color)
         x += bw + BADGE_GAP
     return y + BADGE_HEIGHT
 
 
-def variant_a():
-    # Fresh green gradient
+def background_a():
     base = Image.new('RGB', (WIDTH, HEIGHT), (232,246,238))
     d = ImageDraw.Draw(base)
     # radial accents
@@ -144,72 +157,103 @@ def variant_a():
             d.ellipse([cx-r, cy-r, cx+r, cy+r], fill=shade)
     ov = Image.new('RGBA', (WIDTH, HEIGHT), (255,255,255,40))
     base.paste(ov, (0,0), ov)
-    text_x, text_y = draw_icon_container(base, theme='light')
-    d.text((text_x, text_y), TITLE, font=font_title, fill=(35,55,45))
-    lines = wrap_text(d, SUB, font_sub, WIDTH - SAFE - text_x)
-    yy = text_y + font_title.size + 20
-    for ln in lines:
-        d.text((text_x, yy), ln, font=font_sub, fill=(70,85,78))
-        yy += font_sub.size + 6
-    badges_bottom = draw_badges(base, d, text_x, yy + 12, (50,65,58), (255,255,255,250), (0,0,0,30))
-    d.text((text_x, badges_bottom + 30), FOOTER, font=font_badge, fill=(85,100,92))
     return base
 
 
-def variant_b():
-    # Minimal light with watermark leaf silhouette
-    base = Image.new('RGB', (WIDTH, HEIGHT), (245,248,245))
-    d = ImageDraw.Draw(base)
+def watermark_b():
     # Watermark silhouette
     wm = Image.new('RGBA', (WIDTH, HEIGHT), (0,0,0,0))
     wmd = ImageDraw.Draw(wm)
     wmd.polygon([(850,470),(780,180),(990,260)], fill=(180,200,185,60))
     wmd.ellipse([760,120,980,340], outline=(180,200,185,55), width=14)
-    wm = wm.filter(ImageFilter.GaussianBlur(12))
-    base.paste(wm, (0,0), wm)
+    return wm.filter(ImageFilter.GaussianBlur(12))
+
+
+def vignette_c():
+    vignette = Image.new('L', (WIDTH, HEIGHT), 0)
+    vg = ImageDraw.Draw(vignette)
+    vg.ellipse([ -200, -50, WIDTH+200, HEIGHT+250], fill=255)
+    return vignette.filter(ImageFilter.GaussianBlur(180))
+
+
+def variant_a():
+    # Fresh green gradient
+    with stage('background'):
+        base = cached_layer('variants/background_a', background_a, size=(WIDTH, HEIGHT))
+        d = ImageDraw.Draw(base)
+    text_x, text_y = draw_icon_container(base, theme='light')
+    with stage('text'):
+        draw_text(d, (text_x, text_y), TITLE, font=font_title, fill=(35,55,45))
+        lines = wrap_text(d, SUB, font_sub, WIDTH - SAFE - text_x)
+        yy = text_y + font_title.size + 20
+        for ln in lines:
+            draw_text(d, (text_x, yy), ln, font=font_sub, fill=(70,85,78))
+            yy += font_sub.size + 6
+    badges_bottom = draw_badges(base, d, text_x, yy + 12, (50,65,58), (255,255,255,250), (0,0,0,30))
+    draw_text(d, (text_x, badges_bottom + 30), FOOTER, font=font_badge, fill=(85,100,92))
+    return base
+
+
+def variant_b():
+    # Minimal light with watermark leaf silhouette
+    with stage('background'):
+        base = Image.new('RGB', (WIDTH, HEIGHT), (245,248,245))
+        d = ImageDraw.Draw(base)
+        wm = cached_layer('variants/watermark_b', watermark_b, size=(WIDTH, HEIGHT))
+        base.paste(wm, (0,0), wm)
     text_x, text_y = draw_icon_container(base, theme='light')
-    d.text((text_x, text_y), TITLE, font=font_title, fill=(40,60,50))
-    lines = wrap_text(d, SUB, font_sub, WIDTH - SAFE - text_x)
-    yy = text_y + font_title.size + 16
-    for ln in lines:
-        d.text((text_x, yy), ln, font=font_sub, fill=(80,95,88))
-        yy += font_sub.size + 6
+    with stage('text'):
+        draw_text(d, (text_x, text_y), TITLE, font=font_title, fill=(40,60,50))
+        lines = wrap_text(d, SUB, font_sub, WIDTH - SAFE - text_x)
+        yy = text_y + font_title.size + 16
+        for ln in lines:
+            draw_text(d, (text_x, yy), ln, font=font_sub, fill=(80,95,88))
+            yy += font_sub.size + 6
     badges_bottom = draw_badges(base, d, text_x, yy + 18, (55,70,63), (255,255,255,255), (0,0,0,25))
-    d.text((text_x, badges_bottom + 34), FOOTER, font=font_badge, fill=(95,110,103))
+    draw_text(d, (text_x, badges_bottom + 34), FOOTER, font=font_badge, fill=(95,110,103))
     return base
 
 
 def variant_c():
     # Dark focus
-    base = Image.new('RGB', (WIDTH, HEIGHT), (27,38,31))
-    d = ImageDraw.Draw(base)
-    # subtle vignette
-    vignette = Image.new('L', (WIDTH, HEIGHT), 0)
-    vg = ImageDraw.Draw(vignette)
-    vg.ellipse([ -200, -50, WIDTH+200, HEIGHT+250], fill=255)
-    vignette = vignette.filter(ImageFilter.GaussianBlur(180))
-    tint = Image.new('RGBA', (WIDTH, HEIGHT), (46,72,56,145))
-    base = Image.composite(tint, base.convert('RGBA'), vignette).convert('RGB')
+    with stage('background'):
+        base = Image.new('RGB', (WIDTH, HEIGHT), (27,38,31))
+        d = ImageDraw.Draw(base)
+        # subtle vignette
+        vignette = cached_layer('variants/vignette_c', vignette_c, size=(WIDTH, HEIGHT))
+        tint = Image.new('RGBA', (WIDTH, HEIGHT), (46,72,56,145))
+        base = Image.composite(tint, base.convert('RGBA'), vignette).convert('RGB')
     text_x, text_y = draw_icon_container(base, theme='dark')
-    d.text((text_x, text_y), TITLE, font=font_title, fill=(230,244,236))
-    lines = wrap_text(d, SUB, font_sub, WIDTH - SAFE - text_x)
-    yy = text_y + font_title.size + 20
-    for ln in lines:
-        d.text((text_x, yy), ln, font=font_sub, fill=(198,215,205))
-        yy += font_sub.size + 6
+    with stage('text'):
+        draw_text(d, (text_x, text_y), TITLE, font=font_title, fill=(230,244,236))
+        lines = wrap_text(d, SUB, font_sub, WIDTH - SAFE - text_x)
+        yy = text_y + font_title.size + 20
+        for ln in lines:
+            draw_text(d, (text_x, yy), ln, font=font_sub, fill=(198,215,205))
+            yy += font_sub.size + 6
     badges_bottom = draw_badges(base, d, text_x, yy + 16, (230,244,236), (46,72,56,255), (230,244,236,80))
-    d.text((text_x, badges_bottom + 34), FOOTER, font=font_badge, fill=(190,205,195))
+    draw_text(d, (text_x, badges_bottom + 34), FOOTER, font=font_badge, fill=(190,205,195))
     return base
 
 
-def save(img: Image.Image, name: str):
-    out_path = f'assets/store_graphics/{name}.png'
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    img.save(out_path, 'PNG')
-    print('✅ 생성:', out_path)
+def save(img: Image.Image, name: str, run: ShardRun):
+    rel_path = f'assets/store_graphics/{name}.png'
+    with stage('queue'):
+        save_async(img, run.output_path(rel_path))  # encoded while the next variant renders
+    print('✅ 생성:', rel_path)
 
 if __name__ == '__main__':
-    save(variant_a(), 'feature_graphic_variant_a')
-    save(variant_b(), 'feature_graphic_variant_b')
-    save(variant_c(), 'feature_graphic_variant_c')
-    print('\n완료: 3개 변형 생성. 원하는 방향 알려주세요 (A/B/C 또는 추가 수정 지시).')
+    enable_from_argv('feature_graphic_variants')
+    parser = argparse.ArgumentParser(description='Render the feature graphic variants')
+    add_shard_argument(parser)
+    run = ShardRun('feature_graphic_variants', parser.parse_args().shard)
+    variants = [('variant_a', variant_a), ('variant_b', variant_b), ('variant_c', variant_c)]
+    for name, render in run.select(variants, key=lambda v: v[0]):
+        with stage(name):
+            save(render(), f'feature_graphic_{name}', run)
+    with stage('encode'):
+        flush_writes()
+    print('💾', get_writer().summary())
+    print('🗂️', get_cache().summary())
+    run.finish()
+    print(f'\n완료: {len(run.selected)}개 변형 생성. 원하는 방향 알려주세요 (A/B/C 또는 추가 수정 지시).')
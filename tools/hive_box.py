@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+"""
+Read a Hive box file (plants_box.hive, pulled off a device) without the app.
+
+The file is memory-mapped and scanned once; only the frame headers are parsed:
+  frame  = uint32 length (whole frame) | key | value | uint32 crc32 of everything before it
+  key    = 0x00 uint32   or   0x01 uint8 length + UTF-8 bytes
+  value  = absent for a delete frame
+Hive appends a frame for every put/delete, so later frames supersede earlier ones.
+The scan keeps key -> (offset, length) of the latest live frame and stops at the
+first torn or corrupted frame, like Hive's recovery on open (the rest is reported).
+The key columns are gathered with NumPy and deduplicated with a stable sort, so
+only the length prefixes are walked in Python. Values are decoded only when asked
+for (get / values / export), in box order (int keys, then string keys by UTF-16 code
+units, as Hive's keystore sorts them); plant_arrays() reads the fixed-layout Plant
+fields of every record straight out of the mapping into NumPy columns.
+
+Value encoding (hive 2.2, little-endian; ints are written as float64):
+  0 null  1 int  2 double  3 bool  4 String  5 Uint8List  6-9 int/double/bool/String
+  lists  10 List  11 Map  16 DateTime(ms)  17 BigInt  18 DateTime(ms, isUtc)
+  32 + typeId for registered adapters: 32 = Plant (plant.g.dart: field count, then
+  field index + value for fields 0-7)
+
+Usage:
+  python3 tools/hive_box.py plants_box.hive                       # frame statistics
+  python3 tools/hive_box.py plants_box.hive --get <plant id>  # all digits: also an int key
+  python3 tools/hive_box.py plants_box.hive --list 20 [--inactive]
+  python3 tools/hive_box.py plants_box.hive --export backup.json [--tz Asia/Seoul]
+"""
+import argparse
+import array
+import datetime
+import json
+import mmap
+import operator
+import os
+import struct
+import tempfile
+import time
+import zlib
+import zoneinfo
+from collections import namedtuple
+
+from forecast_watering import utf16_key
+from write_behind import replace_file
+
+try:
+    import numpy as np
+except ImportError:
+    raise SystemExit('❌ numpy가 필요합니다: pip install numpy')
+
+RESERVED_TYPE_IDS = 32
+PLANT_TYPE_ID = RESERVED_TYPE_IDS + 0  # @HiveType(typeId: 0)
+PLANT_FIELDS = ('id', 'name', 'imagePath', 'intervalDays', 'lastWateredAt', 'notifyHour', 'notifyMinute', 'isActive')
+KEY_UINT, KEY_STRING = 0, 1
+
+_U32 = struct.Struct('<I')
+_F64 = struct.Struct('<d')
+_PLANT_HEAD = struct.Struct('<BBBBI')    # type 32, field count 8, field 0, String, id length
+_FIELD_STRING = struct.Struct('<BBI')    # field index, String, length
+# Fields 3-7 after imagePath: (index, type, value) with DateTime as (ms, isUtc)
+_PLANT_TAIL = struct.Struct('<BBdBBdBBBdBBdBBB')
+_PLANT_TAIL_MARKS = (3, 1, None, 4, 18, None, None, 5, 1, None, 6, 1, None, 7, 3, None)
+_tail_marks = operator.itemgetter(*(i for i, v in enumerate(_PLANT_TAIL_MARKS) if v is not None))
+_PLANT_TAIL_EXPECTED = tuple(v for v in _PLANT_TAIL_MARKS if v is not None)
+_PLANT_TAIL_DTYPE = np.dtype([
+    ('f3', 'u1'), ('t3', 'u1'), ('interval', '<f8'),
+    ('f4', 'u1'), ('t4', 'u1'), ('watered', '<f8'), ('utc', 'u1'),
+    ('f5', 'u1'), ('t5', 'u1'), ('hour', '<f8'),
+    ('f6', 'u1'), ('t6', 'u1'), ('minute', '<f8'),
+    ('f7', 'u1'), ('t7', 'u1'), ('active', 'u1'),
+])
+KEY_CHUNK = 1 << 16  # frames per key-gather block
+
+HiveDateTime = namedtuple('HiveDateTime', 'millis is_utc')
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class HiveFormatError(ValueError):
+    pass
+
+
+def _int(value: float):
+    # BinaryReader.readInt: readDouble().toInt()
+    return int(value) if value == value and abs(value) != float('inf') else value
+
+
+class _Reader:
+    """BinaryReaderImpl.read() over a buffer."""
+
+    def __init__(self, buf, pos: int):
+        self.buf = buf
+        self.pos = pos
+
+    def u8(self) -> int:
+        v = self.buf[self.pos]
+        self.pos += 1
+        return v
+
+    def u32(self) -> int:
+        v = _U32.unpack_from(self.buf, self.pos)[0]
+        self.pos += 4
+        return v
+
+    def f64(self) -> float:
+        v = _F64.unpack_from(self.buf, self.pos)[0]
+        self.pos += 8
+        return v
+
+    def utf8(self, n: int) -> str:
+        v = bytes(self.buf[self.pos:self.pos + n]).decode('utf-8')
+        self.pos += n
+        return v
+
+    def read(self):
+        type_id = self.u8()
+        if type_id == 0:
+            return None
+        if type_id == 1:
+            return _int(self.f64())
+        if type_id == 2:
+            return self.f64()
+        if type_id == 3:
+            return self.u8() != 0
+        if type_id == 4:
+            return self.utf8(self.u32())
+        if type_id == 5:
+            n = self.u32()
+            self.pos += n
+            return bytes(self.buf[self.pos - n:self.pos])
+        if type_id in (6, 7):
+            values = [self.f64() for _ in range(self.u32())]
+            return [_int(v) for v in values] if type_id == 6 else values
+        if type_id == 8:
+            return [self.u8() != 0 for _ in range(self.u32())]
+        if type_id == 9:
+            return [self.utf8(self.u32()) for _ in range(self.u32())]
+        if type_id == 10:
+            return [self.read() for _ in range(self.u32())]
+        if type_id == 11:
+            return {self.read(): self.read() for _ in range(self.u32())}
+        if type_id == 16:
+            return HiveDateTime(_int(self.f64()), False)
+        if type_id == 17:
+            return int(self.utf8(self.u8()), 16)
+        if type_id == 18:
+            return HiveDateTime(_int(self.f64()), self.u8() != 0)
+        if type_id == PLANT_TYPE_ID:
+            return self.plant()
+        raise HiveFormatError(f'지원하지 않는 타입 ID {type_id} (offset {self.pos - 1})')
+
+    def plant(self) -> dict:
+        """PlantAdapter.read: field count, then (field index, value) pairs."""
+        fields = {}
+        for _ in range(self.u8()):
+            index = self.u8()
+            fields[index] = self.read()
+        return {name: fields.get(i) for i, name in enumerate(PLANT_FIELDS)}
+
+
+def dart_iso(value: HiveDateTime, tz=None) -> str:
+    """DateTime.fromMillisecondsSinceEpoch(ms, isUtc: ...).toIso8601String(); local fields in tz."""
+    dt = _EPOCH + datetime.timedelta(milliseconds=value.millis)
+    if not value.is_utc:
+        dt = dt.astimezone(tz) if tz is not None else dt.astimezone()
+    text = dt.strftime('%Y-%m-%dT%H:%M:%S') + f'.{dt.microsecond // 1000:03d}'
+    return text + 'Z' if value.is_utc else text
+
+
+class PlantArrays:
+    """Plant fields of the live string-key records as NumPy columns, in box order; names decode lazily."""
+
+    def __init__(self, box, n: int):
+        self._box = box
+        self._rows = None                                  # row -> string key row of the box
+        self.is_plant = np.zeros(n, dtype=bool)
+        self.interval = np.zeros(n, dtype=np.int64)
+        self.watered_ms = np.zeros(n, dtype=np.int64)      # lastWateredAt.millisecondsSinceEpoch
+        self.watered_utc = np.zeros(n, dtype=bool)
+        self.notify_hour = np.zeros(n, dtype=np.int64)
+        self.notify_minute = np.zeros(n, dtype=np.int64)
+        self.active = np.zeros(n, dtype=bool)
+        self.has_image = np.zeros(n, dtype=bool)
+        self._name_at = np.zeros(n, dtype=np.int64)
+        self._name_len = np.zeros(n, dtype=np.int64)
+        self._names = {}                                   # rows decoded the slow way
+
+    def __len__(self):
+        return len(self.is_plant)
+
+    def key(self, row: int) -> str:
+        return self._box._key(int(self._rows[row]))
+
+    def name(self, row: int) -> str:
+        if row in self._names:
+            return self._names[row]
+        at = int(self._name_at[row])
+        return self._box._mm[at:at + int(self._name_len[row])].decode('utf-8')
+
+    def set_row(self, row: int, plant: dict):
+        watered = plant['lastWateredAt']
+        self.is_plant[row] = True
+        self.interval[row] = plant['intervalDays']
+        self.watered_ms[row], self.watered_utc[row] = watered.millis, watered.is_utc
+        self.notify_hour[row] = plant['notifyHour']
+        self.notify_minute[row] = plant['notifyMinute']
+        self.active[row] = plant['isActive']
+        self.has_image[row] = plant['imagePath'] is not None
+        self._names[row] = plant['name']
+
+
+class HiveBox:
+    def __init__(self, path: str, verify_crc=True):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.frames = self.deleted = self.superseded = 0
+        self.end = 0     # end of the last good frame
+        self.error = None
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        self._data = np.frombuffer(self._mm, dtype=np.uint8)
+        # Live string keys sorted by their UTF-8 bytes, with value [start, end) in the file
+        self._skeys = np.zeros(0, dtype='S1')
+        self._start = self._end = np.zeros(0, dtype=np.int64)
+        self._ikeys = {}     # int key -> (start, end)
+        self._order = None   # rows of _skeys in box order when it differs from byte order
+        self._scan(verify_crc)
+
+    def _frames(self) -> tuple:
+        """Frame offsets and ends: one tight pass over the length prefixes."""
+        mm, size, u32 = self._mm, self.size, _U32.unpack_from
+        offsets = array.array('q')
+        append = offsets.append
+        pos = 0
+        while pos < size - 3:
+            length = u32(mm, pos)[0]
+            if length < 10:
+                break
+            append(pos)
+            pos += length
+        starts = np.frombuffer(offsets, dtype=np.int64)
+        ends = np.append(starts[1:], pos).astype(np.int64)
+        if len(ends) and ends[-1] > size:  # only the last frame can run past the end
+            starts, ends = starts[:-1], ends[:-1]
+        end = int(ends[-1]) if len(ends) else 0
+        if end < size:
+            length = _U32.unpack_from(mm, end)[0] if end + 4 <= size else None
+            self.error = f'잘린 프레임 (offset {end}, 길이 {length})'
+        return starts, ends
+
+    def _truncate(self, n: int, error: str, *arrays):
+        self.error = error
+        return tuple(a[:n] for a in arrays)
+
+    def _scan(self, verify_crc: bool):
+        data = self._data
+        starts, ends = self._frames()
+        key_type = data[starts + 4]
+        value_at = np.where(key_type == KEY_STRING, starts + 6 + data[starts + 5], starts + 9)
+        bad = np.flatnonzero((key_type > KEY_STRING) | (value_at > ends - 4))
+        if bad.size:
+            i = int(bad[0])
+            starts, ends, key_type, value_at = self._truncate(
+                i, f'잘못된 키 (offset {starts[i]})', starts, ends, key_type, value_at)
+        if verify_crc and len(starts):
+            view = memoryview(self._mm)
+            try:
+                computed = np.fromiter(map(zlib.crc32, map(view.__getitem__, map(slice, starts.tolist(), (ends - 4).tolist()))),
+                                       dtype=np.uint32, count=len(starts))
+            finally:
+                view.release()
+            stored = self._data[(ends - 4)[:, None] + np.arange(4)].copy().view('<u4').ravel()
+            bad = np.flatnonzero(computed != stored)
+            if bad.size:
+                i = int(bad[0])
+                starts, ends, key_type, value_at = self._truncate(
+                    i, f'CRC 불일치 (offset {starts[i]})', starts, ends, key_type, value_at)
+        self.frames = len(starts)
+        self.end = int(ends[-1]) if len(ends) else 0
+        is_delete = value_at == ends - 4
+        self.deleted = int(is_delete.sum())
+
+        for i in np.flatnonzero(key_type == KEY_UINT).tolist():
+            key = _U32.unpack_from(self._mm, int(starts[i]) + 5)[0]
+            if key in self._ikeys:
+                self.superseded += 1
+            if is_delete[i]:
+                self._ikeys.pop(key, None)
+            else:
+                self._ikeys[key] = (int(value_at[i]), int(ends[i]) - 4)
+
+        frames = np.flatnonzero(key_type == KEY_STRING)
+        keys = self._gather_keys(starts[frames])
+        order = np.argsort(keys, kind='stable')   # equal keys stay in file order: the last one wins
+        keys = keys[order]
+        last = np.ones(len(keys), dtype=bool)
+        last[:-1] = keys[1:] != keys[:-1]
+        self.superseded += len(keys) - int(last.sum())
+        winner = frames[order[last]]
+        live = ~is_delete[winner]
+        self._skeys = keys[last][live]
+        self._start = value_at[winner][live]
+        self._end = ends[winner][live] - 4
+        if len(self._skeys) and (self._skeys.view(np.uint8) >= 0x80).any():
+            # Non-ASCII keys: UTF-16 code unit order differs from UTF-8 byte order
+            self._order = np.array(sorted(range(len(self._skeys)), key=lambda r: utf16_key(self._key(r))),
+                                   dtype=np.int64)
+
+    def _gather_keys(self, starts):
+        """Key bytes of the given string-key frames as a fixed-width bytes array."""
+        data = self._data
+        lengths = data[starts + 5]
+        width = max(int(lengths.max(initial=1)), 1)
+        keys = np.zeros((len(starts), width), dtype=np.uint8)
+        columns = np.arange(width)
+        uniform = len(starts) and int(lengths.min()) == width  # e.g. all UUIDs: no padding to mask
+        for lo in range(0, len(starts), KEY_CHUNK):
+            hi = lo + KEY_CHUNK
+            block = data.take(starts[lo:hi, None] + 6 + columns, mode='clip')
+            keys[lo:hi] = block if uniform else np.where(columns < lengths[lo:hi, None], block, 0)
+        return keys.view(f'S{width}').ravel()
+
+    def close(self):
+        self._data = None
+        if self.size:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __len__(self):
+        return len(self._skeys) + len(self._ikeys)
+
+    def __contains__(self, key):
+        return self._where(key) is not None
+
+    def _key(self, row: int) -> str:
+        return self._skeys[row].decode('utf-8')
+
+    def _rows(self):
+        """String-key rows in box order."""
+        return np.arange(len(self._skeys)) if self._order is None else self._order
+
+    def _where(self, key):
+        if isinstance(key, int):
+            return self._ikeys.get(key)
+        encoded = key.encode('utf-8')
+        row = int(np.searchsorted(self._skeys, encoded))
+        if row < len(self._skeys) and self._skeys[row] == encoded:
+            return int(self._start[row]), int(self._end[row])
+        return None
+
+    def keys(self) -> list:
+        """Keys in Hive's order: int keys ascending, then string keys by UTF-16 code units."""
+        return sorted(self._ikeys) + [self._key(r) for r in self._rows().tolist()]
+
+    def raw(self, key) -> bytes:
+        start, end = self._where(key)
+        return self._mm[start:end]
+
+    def _value(self, start: int, end: int):
+        plant = self._plant_at(start, end)
+        if plant is not None:
+            return plant
+        reader = _Reader(self._mm, start)
+        value = reader.read()
+        if reader.pos != end:
+            raise HiveFormatError(f'값 길이 불일치 (offset {start})')
+        return value
+
+    def _plant_at(self, start: int, end: int):
+        """PlantAdapter.read for the layout plant.g.dart writes; None for anything else."""
+        mm = self._mm
+        try:
+            type_id, count, f0, t0, id_len = _PLANT_HEAD.unpack_from(mm, start)
+            if (type_id, count, f0, t0) != (PLANT_TYPE_ID, 8, 0, 4):
+                return None
+            p = start + 8 + id_len
+            f1, t1, name_len = _FIELD_STRING.unpack_from(mm, p)
+            name_at = p + 6
+            p = name_at + name_len
+            f2, t2 = mm[p], mm[p + 1]
+            if (f1, t1, f2) != (1, 4, 2):
+                return None
+            if t2 == 4:
+                path_len = _U32.unpack_from(mm, p + 2)[0]
+                image_path = mm[p + 6:p + 6 + path_len].decode('utf-8')
+                p += 6 + path_len
+            elif t2 == 0:
+                image_path = None
+                p += 2
+            else:
+                return None
+            if p + _PLANT_TAIL.size != end:
+                return None
+            tail = _PLANT_TAIL.unpack_from(mm, p)
+        except (struct.error, IndexError):
+            return None
+        if _tail_marks(tail) != _PLANT_TAIL_EXPECTED:
+            return None
+        return {
+            'id': mm[start + 8:start + 8 + id_len].decode('utf-8'),
+            'name': mm[name_at:name_at + name_len].decode('utf-8'),
+            'imagePath': image_path,
+            'intervalDays': int(tail[2]),
+            'lastWateredAt': HiveDateTime(int(tail[5]), tail[6] != 0),
+            'notifyHour': int(tail[9]),
+            'notifyMinute': int(tail[12]),
+            'isActive': tail[15] != 0,
+        }
+
+    def get(self, key, default=None):
+        where = self._where(key)
+        return default if where is None else self._value(*where)
+
+    def values(self):
+        for key in sorted(self._ikeys):
+            yield self._value(*self._ikeys[key])
+        starts, ends = self._start.tolist(), self._end.tolist()
+        for r in self._rows().tolist():
+            yield self._value(starts[r], ends[r])
+
+    def items(self):
+        for key in sorted(self._ikeys):
+            yield key, self._value(*self._ikeys[key])
+        starts, ends = self._start.tolist(), self._end.tolist()
+        for r in self._rows().tolist():
+            yield self._key(r), self._value(starts[r], ends[r])
+
+    def plant_arrays(self) -> PlantArrays:
+        """
+        Plant fields of every string-key record at once, read straight out of the mapping.
+        Records in another layout (or not Plants) are decoded one by one; is_plant marks the Plants.
+        """
+        data = self._data
+        rows = self._rows()
+        start, end = self._start[rows], self._end[rows]
+        out = PlantArrays(self, len(rows))
+        out._rows = rows
+
+        def at(p):
+            return data.take(p, mode='clip')
+
+        def u32(p):
+            return at(p[:, None] + np.arange(4)).view('<u4').ravel().astype(np.int64)
+
+        ok = (at(start) == PLANT_TYPE_ID) & (at(start + 1) == 8) & (at(start + 2) == 0) & (at(start + 3) == 4)
+        p = start + 8 + u32(start + 4)
+        ok &= (at(p) == 1) & (at(p + 1) == 4)
+        name_at, name_len = p + 6, u32(p + 2)
+        p = name_at + name_len
+        path_type = at(p + 1)
+        ok &= (at(p) == 2) & ((path_type == 0) | (path_type == 4))
+        tail = np.where(path_type == 4, p + 6 + u32(p + 2), p + 2)
+        ok &= tail + _PLANT_TAIL.size == end
+        cells = at(np.where(ok, tail, 0)[:, None] + np.arange(_PLANT_TAIL.size)).view(_PLANT_TAIL_DTYPE).ravel()
+        for name, value in zip(_PLANT_TAIL_DTYPE.names, _PLANT_TAIL_MARKS):
+            if value is not None:
+                ok &= cells[name] == value
+
+        out.is_plant[:] = ok
+        out.interval[ok] = cells['interval'][ok]
+        out.watered_ms[ok] = cells['watered'][ok]
+        out.watered_utc[ok] = cells['utc'][ok] != 0
+        out.notify_hour[ok] = cells['hour'][ok]
+        out.notify_minute[ok] = cells['minute'][ok]
+        out.active[ok] = cells['active'][ok] != 0
+        out.has_image[ok] = path_type[ok] == 4
+        out._name_at[ok], out._name_len[ok] = name_at[ok], name_len[ok]
+        for row in np.flatnonzero(~ok).tolist():
+            value = self._value(int(start[row]), int(end[row]))
+            if isinstance(value, dict) and isinstance(value.get('lastWateredAt'), HiveDateTime):
+                out.set_row(row, value)
+        return out
+
+    def stats(self) -> dict:
+        return {
+            'frames': self.frames,
+            'live': len(self),
+            'superseded': self.superseded,
+            'deleted': self.deleted,
+            'bytes': self.size,
+            'live_bytes': int((self._end - self._start).sum()) + sum(e - s for s, e in self._ikeys.values()),
+            'valid_end': self.end,
+            'error': self.error,
+        }
+
+
+def plant_json(plant: dict, tz=None) -> dict:
+    """Plant.toJson()"""
+    out = dict(plant)
+    if isinstance(out['lastWateredAt'], HiveDateTime):
+        out['lastWateredAt'] = dart_iso(out['lastWateredAt'], tz)
+    return out
+
+
+def export_backup(box: HiveBox, out_path: str, tz=None) -> int:
+    """Write the live Plant records as an exportToJson backup (box order; the app sorts by nearestDue)."""
+    directory = os.path.dirname(os.path.abspath(out_path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    written = 0
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as out:
+            exported_at = datetime.datetime.now(tz).replace(tzinfo=None).isoformat(timespec='milliseconds')
+            out.write('{\n  "version": "1.0",\n  "exportedAt": ' + json.dumps(exported_at) + ',\n  "plants": [')
+            for value in box.values():
+                if not isinstance(value, dict):
+                    continue
+                body = json.dumps(plant_json(value, tz), indent=2, ensure_ascii=False).replace('\n', '\n    ')
+                out.write((',\n    ' if written else '\n    ') + body)
+                written += 1
+            out.write('\n  ]\n}' if written else ']\n}')
+        replace_file(tmp, out_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect a Hive box file (plants_box.hive)')
+    parser.add_argument('box', help='path to the .hive file')
+    parser.add_argument('--get', default=None, metavar='ID', help='print one record (all digits: also tried as an int key)')
+    parser.add_argument('--list', type=int, default=0, metavar='N', help='print the first N plants in box order')
+    parser.add_argument('--inactive', action='store_true', help='--list: inactive plants only')
+    parser.add_argument('--export', default=None, metavar='PATH', help='write the plants as a JSON backup')
+    parser.add_argument('--tz', default=None, help='time zone of the device for local DateTimes (default: this machine)')
+    parser.add_argument('--no-crc', action='store_true', help='skip the CRC check of every frame')
+    args = parser.parse_args()
+
+    tz = zoneinfo.ZoneInfo(args.tz) if args.tz else None
+    t0 = time.perf_counter()
+    try:
+        box = HiveBox(args.box, verify_crc=not args.no_crc)
+    except OSError as e:
+        raise SystemExit(f'❌ 박스 열기 실패: {e}')
+    with box:
+        s = box.stats()
+        print(f'🐝 {args.box}: {s["bytes"]:,} bytes, 프레임 {s["frames"]:,}개 ({time.perf_counter() - t0:.2f}s)')
+        print(f'   살아 있음 {s["live"]:,} / 덮어씀 {s["superseded"]:,} / 삭제 {s["deleted"]:,}, '
+              f'유효 데이터 {s["live_bytes"] / max(s["bytes"], 1):.0%}')
+        if s['error']:
+            print(f'⚠️ {s["error"]}: {s["bytes"] - s["valid_end"]:,} bytes 무시 (Hive는 열 때 잘라냄)')
+
+        try:
+            t1 = time.perf_counter()
+            plants = box.plant_arrays()
+            n = int(plants.is_plant.sum())
+            print(f'🌱 식물 {n:,}개: 활성 {int(plants.active.sum()):,} / 비활성 {n - int(plants.active.sum()):,}, '
+                  f'사진 있음 {int(plants.has_image.sum()):,} ({time.perf_counter() - t1:.2f}s)')
+            if args.get is not None:
+                value = box.get(args.get)
+                if value is None and args.get.isascii() and args.get.isdigit():
+                    value = box.get(int(args.get))
+                if value is None:
+                    raise SystemExit(f'❌ 키 없음: {args.get}')
+                print(json.dumps(plant_json(value, tz) if isinstance(value, dict) else value,
+                                 indent=2, ensure_ascii=False, default=str))
+            if args.list:
+                rows = np.flatnonzero(plants.is_plant & (~plants.active if args.inactive else True))
+                for row in rows[:args.list].tolist():
+                    watered = HiveDateTime(int(plants.watered_ms[row]), bool(plants.watered_utc[row]))
+                    print(f'   {plants.key(row):<36} {plants.name(row):<16} {int(plants.interval[row]):>3}일  '
+                          f'{dart_iso(watered, tz)}{"" if plants.active[row] else "  (비활성)"}')
+            if args.export:
+                t1 = time.perf_counter()
+                written = export_backup(box, args.export, tz)
+                print(f'✅ 내보내기: 식물 {written:,}개 → {args.export} ({time.perf_counter() - t1:.1f}s)')
+        except HiveFormatError as e:
+            raise SystemExit(f'❌ {e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache for expensive intermediate layers
+(gradient backgrounds, blurred watermarks, resized icons, device chrome).
+
+    from layer_cache import cached_layer
+
+    bg = cached_layer('premium/background', render_background, size=(WIDTH, HEIGHT), base=BG_BASE)
+
+The key is a hash of the layer name, the parameters and the source code of the render
+function (and of any function passed as a parameter, for helpers it calls), so editing
+the drawing code invalidates its layers automatically. Layers are
+stored raw as .npy files under build/layer_cache/ and loaded with mmap: no decoding, and
+parallel workers share the page cache. Writes go through a temp file + os.replace, so
+concurrent processes never see half-written layers.
+
+The cache is bounded by a byte budget; least recently used layers (file mtime, bumped
+on every hit) are evicted after each store.
+
+Environment:
+  PWB_LAYER_CACHE=off       disable (always render)
+  PWB_LAYER_CACHE_MB=256    byte budget in MB
+
+Without numpy the cache is disabled and layers are always rendered.
+
+Usage:
+  python3 tools/layer_cache.py [stats|clear]
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+
+from PIL import Image, ImageFilter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(ROOT, 'build', 'layer_cache')
+DEFAULT_BUDGET_MB = 256
+FORMAT_VERSION = 1
+
+def file_digest(path: str) -> str:
+    """Content hash for source files (icons, fonts) used as layer parameters."""
+    if not path or not os.path.exists(path):
+        return ''
+    st = os.stat(path)
+    return _digest(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _digest(path: str, mtime_ns: int, size: int) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def font_id(font) -> tuple:
+    """Parameter identifying a font: file content (or embedded bytes) + size."""
+    chain = getattr(font, 'chain', None)
+    if chain is not None:  # fonts.ChainFont: every font the text may fall back to
+        return (tuple(file_digest(p) for p in chain.paths), font.size, type(font).__name__)
+    path = getattr(font, 'path', None)
+    if isinstance(path, str):
+        digest = file_digest(path)
+    else:  # loaded from memory, e.g. ImageFont.load_default()
+        digest = hashlib.blake2b(getattr(font, 'font_bytes', b''), digest_size=16).hexdigest()
+    return (digest, getattr(font, 'size', None), type(font).__name__)
+
+
+def _source(fn) -> str:
+    if isinstance(fn, functools.partial):
+        return _source(fn.func) + repr(fn.args) + repr(sorted(fn.keywords.items()))
+    try:
+        return inspect.getsource(fn)
+    except (OSError, TypeError):
+        return fn.__code__.co_code.hex()
+
+
+def _param_default(value):
+    # Helper functions passed as parameters are keyed by their source, like render itself
+    return _source(value) if callable(value) else str(value)
+
+
+class LayerCache:
+    def __init__(self, root=CACHE_DIR, budget_bytes=None, enabled=None):
+        if budget_bytes is None:
+            budget_bytes = int(float(os.environ.get('PWB_LAYER_CACHE_MB', DEFAULT_BUDGET_MB)) * 1024 * 1024)
+        if enabled is None:
+            enabled = os.environ.get('PWB_LAYER_CACHE', 'on').lower() not in ('0', 'off', 'false', 'no')
+        self.root = root
+        self.budget_bytes = budget_bytes
+        self.enabled = enabled and np is not None
+        self.hits = self.misses = self.evictions = 0
+        self.bytes_loaded = self.bytes_stored = 0
+
+    def key(self, name: str, render, params: dict) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(json.dumps([FORMAT_VERSION, name, params], sort_keys=True, default=_param_default).encode())
+        h.update(_source(render).encode())
+        return h.hexdigest()
+
+    def _path(self, name: str, key: str) -> str:
+        safe = name.replace('/', '.').replace(' ', '_')
+        return os.path.join(self.root, f'{safe}-{key}.npy')
+
+    def get(self, path: str):
+        try:
+            arr = np.load(path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        os.utime(path)  # LRU: mtime = last use
+        self.hits += 1
+        self.bytes_loaded += arr.nbytes
+        # Mode follows the array shape (L / RGB / RGBA). The mmap is read-only:
+        # Pillow copies on the first in-place write, so callers may paste into the layer.
+        return Image.fromarray(arr)
+
+    def put(self, path: str, img: Image.Image):
+        if img.mode not in ('L', 'RGB', 'RGBA'):  # stored as plain uint8 arrays
+            img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+        arr = np.asarray(img)
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, arr)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.bytes_stored += arr.nbytes
+        self.evict()
+
+    def layer(self, name: str, render, params=None, **kw):
+        """Return the cached layer, rendering (and storing) it on a miss. render() takes no arguments."""
+        params = dict(params or {}, **kw)
+        if not self.enabled:
+            return render()
+        path = self._path(name, self.key(name, render, params))
+        img = self.get(path)
+        if img is not None:
+            return img
+        self.misses += 1
+        img = render()
+        self.put(path, img)
+        return img
+
+    def entries(self) -> list:
+        """[(mtime, size, path)] of the stored layers, oldest first."""
+        if not os.path.isdir(self.root):
+            return []
+        out = []
+        for fname in os.listdir(self.root):
+            if fname.endswith('.npy'):
+                path = os.path.join(self.root, fname)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:  # evicted by another process
+                    continue
+                out.append((st.st_mtime, st.st_size, path))
+        return sorted(out)
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.budget_bytes:
+                break
+            try:
+                os.unlink(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.unlink(path)
+
+    def summary(self) -> str:
+        if not self.enabled:
+            return '레이어 캐시: 꺼짐'
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0
+        return (f'레이어 캐시: hit {self.hits} / miss {self.misses} ({rate:.0f}%), '
+                f'로드 {self.bytes_loaded // 1024:,}KB, 저장 {self.bytes_stored // 1024:,}KB, 제거 {self.evictions}')
+
+
+_default = None
+
+
+def get_cache() -> LayerCache:
+    global _default
+    if _default is None:
+        _default = LayerCache()
+    return _default
+
+
+def cached_layer(name: str, render, params=None, **kw) -> Image.Image:
+    return get_cache().layer(name, render, params, **kw)
+
+
+# ---------------------------------------------------------------- shared layers
+
+def cached_icon(path: str, size: int) -> Image.Image:
+    """App icon resized (LANCZOS) to size x size, keyed by the icon file content."""
+    return cached_layer('icon', lambda: Image.open(path).convert('RGBA').resize((size, size), Image.Resampling.LANCZOS),
+                        src=file_digest(path), size=size)
+
+
+def cached_shadow(size: int, alpha: int, radius: float) -> Image.Image:
+    """Square black shadow with a Gaussian-blurred edge."""
+    return cached_layer('shadow', lambda: Image.new('RGBA', (size, size), (0, 0, 0, alpha)).filter(ImageFilter.GaussianBlur(radius)),
+                        size=size, alpha=alpha, radius=radius)
+
+
+def main():
+    cmd = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    cache = LayerCache(enabled=True)
+    if cmd == 'clear':
+        cache.clear()
+        print('🧹 레이어 캐시 비움:', os.path.relpath(cache.root, ROOT))
+        return
+    if cmd != 'stats':
+        raise SystemExit('usage: layer_cache.py [stats|clear]')
+    entries = cache.entries()
+    total = sum(size for _, size, _ in entries)
+    print(f'🗂️ {os.path.relpath(cache.root, ROOT)}: 레이어 {len(entries)}개, '
+          f'{total / 1024 / 1024:.1f}MB / {cache.budget_bytes / 1024 / 1024:.0f}MB')
+    for _, size, path in reversed(entries):
+        print(f'  {size // 1024:>8,}KB  {os.path.basename(path)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Merge any number of plant_water_buddy_backup.json exports into one backup.
+
+Same rule as PlantRepository.importFromJson, as if every file were imported in the
+given order into an empty box: the first record of an id is added; a later record
+with the same id replaces it only when its lastWateredAt is strictly later.
+
+Files are stream-parsed ({version, exportedAt, plants[]} in any key order), so only
+one record is in memory at a time:
+1. index pass  id -> (lastWateredAt in µs, file, record number) of the current winner
+2. write pass  the files are read again and each winning record is written as it
+               streams by (order: input file, then position in the file)
+Memory grows with the number of distinct ids (~150 bytes each), not with file size.
+Records are written back unchanged (unknown fields included), in the app's export
+format (2-space indent, UTF-8). exportedAt is the latest one of the inputs.
+
+Usage:
+  python3 tools/merge_backups.py -o merged.json backup1.json backup2.json ...
+"""
+import argparse
+import datetime
+import json
+import os
+import re
+import tempfile
+import time
+
+CHUNK_CHARS = 1 << 20
+BACKUP_VERSION = '1.0'
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_WS = re.compile(r'[ \t\r\n]*')
+
+
+class BackupFormatError(ValueError):
+    pass
+
+
+class _Stream:
+    """Pull JSON values out of a text file without reading it whole."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        data = self.f.read(CHUNK_CHARS)
+        if not data:
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, ch: str):
+        got = self.peek()
+        if got != ch:
+            raise BackupFormatError(f"'{ch}' expected, got {got!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number cut at the end of the buffer also decodes: make sure it is complete
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def read_backup(path: str, on_header=None):
+    """Yield the plant records of one backup; on_header(key, value) gets the other top-level fields."""
+    with open(path, encoding='utf-8-sig') as f:
+        s = _Stream(f)
+        s.expect('{')
+        if s.peek() == '}':
+            return
+        while True:
+            key = s.value()
+            s.expect(':')
+            if key == 'plants':
+                s.expect('[')
+                if s.peek() != ']':
+                    while True:
+                        yield s.value()
+                        if s.peek() != ',':
+                            break
+                        s.pos += 1
+                s.expect(']')
+            else:
+                value = s.value()
+                if on_header:
+                    on_header(key, value)
+            if s.peek() != ',':
+                break
+            s.pos += 1
+        s.expect('}')
+
+
+def watered_us(value: str) -> int:
+    """lastWateredAt as µs since the epoch; times without offset are local, as DateTime.parse reads them."""
+    dt = datetime.datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.astimezone()
+    return (dt - _EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def _check(record, where: str) -> tuple:
+    if not isinstance(record, dict) or not isinstance(record.get('id'), str):
+        raise BackupFormatError(f'{where}: id가 없는 레코드')
+    try:
+        return record['id'], watered_us(record['lastWateredAt'])
+    except (KeyError, TypeError, ValueError):
+        raise BackupFormatError(f"{where}: lastWateredAt 형식 오류 ({record.get('lastWateredAt')!r})")
+
+
+def build_index(paths) -> tuple:
+    """Return (index {id: (watered_us, file, record number)}, stats, latest exportedAt)."""
+    index = {}
+    stats = {'records': 0, 'added': 0, 'updated': 0, 'ignored': 0}
+    exported = []
+
+    def on_header(key, value):
+        if key == 'exportedAt' and isinstance(value, str):
+            exported.append(value)
+
+    for file_no, path in enumerate(paths):
+        for n, record in enumerate(read_backup(path, on_header)):
+            plant_id, when = _check(record, f'{path} #{n}')
+            stats['records'] += 1
+            current = index.get(plant_id)
+            if current is None:
+                stats['added'] += 1
+            elif when > current[0]:  # DateTime.isAfter: strictly later wins, ties keep the first
+                stats['updated'] += 1
+            else:
+                stats['ignored'] += 1
+                continue
+            index[plant_id] = (when, file_no, n)
+    latest = max(exported, key=watered_us, default=None)
+    return index, stats, latest
+
+
+def write_merged(out_path: str, paths, index: dict, exported_at: str) -> int:
+    directory = os.path.dirname(os.path.abspath(out_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    written = 0
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as out:
+            header = json.dumps({'version': BACKUP_VERSION, 'exportedAt': exported_at}, indent=2, ensure_ascii=False)
+            out.write(header[:-2] + ',\n  "plants": [')  # reopen the object after the header fields
+            for file_no, path in enumerate(paths):
+                for n, record in enumerate(read_backup(path)):
+                    if index[record['id']][1:] != (file_no, n):
+                        continue
+                    body = json.dumps(record, indent=2, ensure_ascii=False).replace('\n', '\n    ')
+                    out.write((',\n    ' if written else '\n    ') + body)
+                    written += 1
+            out.write('\n  ]\n}' if written else ']\n}')
+        os.replace(tmp, out_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge plant_water_buddy_backup.json exports')
+    parser.add_argument('inputs', nargs='+', help='backup files, imported in this order')
+    parser.add_argument('-o', '--output', required=True, help='merged backup to write')
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    try:
+        index, stats, latest = build_index(args.inputs)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f'❌ 백업 읽기 실패: {e}')
+    exported_at = latest or datetime.datetime.now().isoformat(timespec='milliseconds')
+    written = write_merged(args.output, args.inputs, index, exported_at)
+    print(f'📦 백업 {len(args.inputs)}개, 레코드 {stats["records"]:,}개')
+    print(f'   추가 {stats["added"]:,} / 갱신 {stats["updated"]:,} / 무시 {stats["ignored"]:,}')
+    print(f'✅ 병합 완료: 식물 {written:,}개 → {args.output} ({time.perf_counter() - t0:.1f}s)')
+
+
+if __name__ == '__main__':
+    main()
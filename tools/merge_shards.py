@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Merge the outputs of sharded runs (--shard i/N, see sharding.py) into the final
+assets/store_graphics layout.
+
+Every <tool>.manifest.json found under the shards directory (any depth, so CI
+artifacts can be downloaded as they are) is checked before anything is copied:
+- all N shards of a tool are present, agree on N and on the full target list
+- their target slices cover every target exactly once
+- every output exists with the recorded content hash, and no two shards produce
+  the same path with different content
+Outputs are then copied to their repo-relative paths; files that already hold the
+same bytes are left untouched.
+
+Usage:
+  python3 tools/merge_shards.py [--shards-dir build/shards] [--dry-run]
+"""
+import argparse
+import glob
+import json
+import os
+from collections import defaultdict
+
+from sharding import MANIFEST_SUFFIX, ROOT, SHARDS_DIR, file_hash
+from write_behind import copy_file
+
+
+def load_manifests(shards_dir: str) -> dict:
+    """{tool: [(shard root, manifest)]}"""
+    by_tool = defaultdict(list)
+    for path in sorted(glob.glob(os.path.join(shards_dir, '**', '*' + MANIFEST_SUFFIX), recursive=True)):
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        by_tool[manifest['tool']].append((os.path.dirname(path), manifest))
+    return by_tool
+
+
+def check_tool(tool: str, shards) -> list:
+    """Return the problems found in one tool's shards (empty when complete and consistent)."""
+    problems = []
+    counts = {m['shard'][1] for _, m in shards}
+    digests = {m['targets_digest'] for _, m in shards}
+    if len(counts) != 1 or len(digests) != 1:
+        return [f'{tool}: 샤드 설정이 서로 다름 (N={sorted(counts)}, 대상 목록 {len(digests)}종)']
+    count = counts.pop()
+    indexes = sorted(m['shard'][0] for _, m in shards)
+    if indexes != list(range(1, count + 1)):
+        missing = sorted(set(range(1, count + 1)) - set(indexes))
+        duplicated = sorted({i for i in indexes if indexes.count(i) > 1})
+        problems.append(f'{tool}: 샤드 누락 {missing} / 중복 {duplicated} (N={count})')
+    covered = [t for _, m in shards for t in m['targets']]
+    total = shards[0][1]['all_targets']
+    if len(covered) != total or len(set(covered)) != len(covered):
+        problems.append(f'{tool}: 대상 {total}개 중 {len(set(covered))}개 처리 (중복 {len(covered) - len(set(covered))}개)')
+    return problems
+
+
+def collect_outputs(by_tool: dict) -> tuple:
+    """Return ({repo-relative path: source file}, problems)."""
+    outputs, hashes, problems = {}, {}, []
+    for tool, shards in by_tool.items():
+        for shard_root, manifest in shards:
+            for rel, entry in manifest['outputs'].items():
+                src = os.path.join(shard_root, rel)
+                if not os.path.exists(src):
+                    problems.append(f'{tool}: 출력 없음 {os.path.relpath(src, ROOT)}')
+                    continue
+                if file_hash(src) != entry['blake2b']:
+                    problems.append(f'{tool}: 해시 불일치 {os.path.relpath(src, ROOT)}')
+                    continue
+                if hashes.get(rel, entry['blake2b']) != entry['blake2b']:
+                    problems.append(f'{rel}: 샤드마다 내용이 다름')
+                    continue
+                hashes[rel] = entry['blake2b']
+                outputs[rel] = src
+    return outputs, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge sharded asset outputs into the repo layout')
+    parser.add_argument('--shards-dir', default=SHARDS_DIR, help='directory holding the shard outputs and manifests')
+    parser.add_argument('--dry-run', action='store_true', help='check the manifests only')
+    args = parser.parse_args()
+
+    by_tool = load_manifests(args.shards_dir)
+    if not by_tool:
+        raise SystemExit(f'❌ 샤드 매니페스트가 없습니다: {args.shards_dir}')
+    problems = [p for tool, shards in sorted(by_tool.items()) for p in check_tool(tool, shards)]
+    outputs, output_problems = collect_outputs(by_tool)
+    problems += output_problems
+    for tool, shards in sorted(by_tool.items()):
+        print(f'🧩 {tool}: 샤드 {len(shards)}개, 대상 {shards[0][1]["all_targets"]}개')
+    if problems:
+        for problem in problems:
+            print('  ❌', problem)
+        raise SystemExit(f'❌ 병합 중단: 문제 {len(problems)}건')
+    if args.dry_run:
+        print(f'✅ 확인 완료: 출력 {len(outputs)}개 (--dry-run, 복사 안 함)')
+        return
+
+    written = 0
+    for rel, src in sorted(outputs.items()):
+        written += copy_file(src, os.path.join(ROOT, rel))
+    print(f'✅ 병합 완료: 출력 {len(outputs)}개 (변경 {written}개, 그대로 {len(outputs) - written}개)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+"""
+Incremental PNG writer: rows are filtered and deflated as they arrive, so an image
+never has to exist in memory as a whole.
+
+    with PngStreamWriter(path, (width, height), 'RGB') as png:
+        for strip in strips:
+            png.write(strip.tobytes())
+
+- per-row adaptive filter (None/Sub/Up/Average/Paeth, minimum sum of absolute
+  differences, the usual libpng heuristic), vectorized with numpy when available;
+  without numpy every row uses filter None
+- output is written to a temp file next to the target and renamed on close,
+  so readers never see a partial PNG
+- the file holds only IHDR, IDAT and IEND: no timestamps or text chunks, so the same
+  pixels always give the same bytes; when the target already holds those bytes it is
+  left untouched (changed is False after close)
+
+ApngStreamWriter writes animated PNGs one frame at a time: every frame after the first
+stores only the region that changed (fcTL offset, blend SOURCE, dispose NONE), frames
+without changes lengthen the delay of the previous one. Whole frames are at hand, so
+they are filtered and deflated by Pillow's encoder rather than row by row here.
+
+    with ApngStreamWriter(path, (width, height), 'RGB', fps=30) as apng:
+        for frame, box in frames:       # box: changed region, None when nothing changed
+            apng.add_frame(frame, box)
+"""
+import filecmp
+import io
+import os
+import struct
+import tempfile
+import zlib
+
+from write_behind import replace_file
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# mode -> (PNG colour type, bytes per pixel)
+COLOR_TYPES = {'L': (0, 1), 'LA': (4, 2), 'RGB': (2, 3), 'RGBA': (6, 4)}
+IDAT_SIZE = 256 * 1024
+
+
+def chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+
+def _cost_table():
+    v = np.arange(256)
+    return np.minimum(v, 256 - v).astype(np.uint8)  # |byte as signed int8|
+
+
+_COST = _cost_table() if np is not None else None
+
+
+def filter_rows(rows, prev, bpp: int) -> bytes:
+    """
+    rows: (n, stride) uint8 array, prev: (stride,) uint8 row above the first one.
+    Returns the filtered scanlines, each prefixed with its filter type byte.
+    """
+    x = rows
+    up = np.vstack([prev[None, :], x[:-1]])
+    left = np.zeros_like(x)
+    left[:, bpp:] = x[:, :-bpp]
+    upleft = np.zeros_like(x)
+    upleft[:, bpp:] = up[:, :-bpp]
+
+    # Paeth predictor (needs signed arithmetic)
+    a, b, c = left.astype(np.int16), up.astype(np.int16), upleft.astype(np.int16)
+    pa, pb, pc = np.abs(b - c), np.abs(a - c), np.abs(a + b - 2 * c)
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, upleft))
+    average = ((a + b) >> 1).astype(np.uint8)
+
+    # uint8 arithmetic wraps modulo 256, as PNG filters require
+    candidates = np.stack([x, x - left, x - up, x - average, x - paeth])
+    # Heuristic: smallest sum of |signed byte| per row
+    best = _COST[candidates].sum(axis=2, dtype=np.uint32).argmin(axis=0)
+    chosen = candidates[best, np.arange(len(best))]
+    return np.hstack([best.astype(np.uint8)[:, None], chosen]).tobytes()
+
+
+def idat_stream(img, level: int = 6) -> bytes:
+    """The zlib stream (IDAT payloads joined) of img encoded as a PNG by Pillow's C encoder."""
+    buf = io.BytesIO()
+    img.save(buf, 'PNG', compress_level=level)
+    data, pos, stream = buf.getvalue(), len(PNG_SIGNATURE), []
+    while pos < len(data):
+        size, tag = struct.unpack_from('>I4s', data, pos)
+        if tag == b'IDAT':
+            stream.append(data[pos + 8:pos + 8 + size])
+        pos += 12 + size
+    return b''.join(stream)
+
+
+def _replace_if_changed(tmp: str, path: str) -> bool:
+    changed = not (os.path.exists(path) and filecmp.cmp(tmp, path, shallow=False))
+    if changed:
+        replace_file(tmp, path)
+    else:
+        os.unlink(tmp)
+    return changed
+
+
+class PngStreamWriter:
+    def __init__(self, path: str, size, mode: str, level: int = 9):
+        if mode not in COLOR_TYPES:
+            raise ValueError(f'unsupported PNG stream mode: {mode}')
+        self.path = path
+        self.width, self.height = size
+        self.mode = mode
+        color_type, self.bpp = COLOR_TYPES[mode]
+        self.stride = self.width * self.bpp
+        self.rows_written = 0
+        self.changed = None
+        self._prev = np.zeros(self.stride, np.uint8) if np is not None else None
+        self._zlib = zlib.compressobj(level)
+        self._pending = b''
+
+        fd, self._tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.png.tmp')
+        self._f = os.fdopen(fd, 'wb')
+        self._f.write(PNG_SIGNATURE)
+        self._f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', self.width, self.height, 8, color_type, 0, 0, 0)))
+
+    def _emit(self, data: bytes, final=False):
+        self._pending += data
+        while len(self._pending) >= IDAT_SIZE or (final and self._pending):
+            self._f.write(chunk(b'IDAT', self._pending[:IDAT_SIZE]))
+            self._pending = self._pending[IDAT_SIZE:]
+
+    def write(self, raw: bytes):
+        """Append whole rows of raw pixel data in the writer's mode."""
+        n, rest = divmod(len(raw), self.stride)
+        if rest or self.rows_written + n > self.height:
+            raise ValueError(f'expected whole rows of {self.stride} bytes, at most {self.height - self.rows_written} rows')
+        if np is not None:
+            rows = np.frombuffer(raw, np.uint8).reshape(n, self.stride)
+            filtered = filter_rows(rows, self._prev, self.bpp)
+            self._prev = rows[-1].copy()
+        else:
+            filtered = b''.join(b'\x00' + raw[i:i + self.stride] for i in range(0, len(raw), self.stride))
+        self._emit(self._zlib.compress(filtered))
+        self.rows_written += n
+
+    def close(self):
+        if self.rows_written != self.height:
+            self.abort()
+            raise ValueError(f'PNG stream closed after {self.rows_written}/{self.height} rows')
+        self._emit(self._zlib.flush(), final=True)
+        self._f.write(chunk(b'IEND', b''))
+        self._f.close()
+        self.changed = _replace_if_changed(self._tmp, self.path)
+
+    def abort(self):
+        self._f.close()
+        if os.path.exists(self._tmp):
+            os.unlink(self._tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class ApngStreamWriter:
+    def __init__(self, path: str, size, mode: str, fps: int, loop: int = 0, level: int = 6):
+        if mode not in COLOR_TYPES:
+            raise ValueError(f'unsupported PNG stream mode: {mode}')
+        self.path = path
+        self.width, self.height = size
+        self.mode = mode
+        color_type = COLOR_TYPES[mode][0]
+        self.fps = fps
+        self.loop = loop
+        self.level = level
+        self.frames = 0
+        self.changed = None
+        self._seq = 0  # fcTL and fdAT share one sequence
+        self._pending = None  # [box, zlib data, delay in 1/fps s]
+
+        fd, self._tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.png.tmp')
+        self._f = os.fdopen(fd, 'wb')
+        self._f.write(PNG_SIGNATURE)
+        self._f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', self.width, self.height, 8, color_type, 0, 0, 0)))
+        self._actl_at = self._f.tell()
+        self._f.write(chunk(b'acTL', struct.pack('>II', 0, loop)))  # frame count patched on close
+
+    def add_frame(self, img, box):
+        """
+        img: the whole frame; box: the region that changed since the previous frame,
+        None when nothing did. The first frame is always stored whole.
+        """
+        if self._pending is not None and box is None:
+            self._pending[2] += 1
+            return
+        if self._pending is None:
+            box = (0, 0, self.width, self.height)
+        self._write_pending()
+        region = img.crop(box) if box != (0, 0, self.width, self.height) else img
+        if region.mode != self.mode:
+            region = region.convert(self.mode)
+        self._pending = [box, idat_stream(region, self.level), 1]
+
+    def _write_pending(self):
+        if self._pending is None:
+            return
+        (x0, y0, x1, y1), data, delay = self._pending
+        fctl = struct.pack('>IIIIIHHBB', self._seq, x1 - x0, y1 - y0, x0, y0, min(delay, 0xFFFF), self.fps, 0, 0)
+        self._f.write(chunk(b'fcTL', fctl))
+        self._seq += 1
+        for i in range(0, len(data), IDAT_SIZE):
+            if self.frames == 0:  # the first frame is the default image
+                self._f.write(chunk(b'IDAT', data[i:i + IDAT_SIZE]))
+            else:
+                self._f.write(chunk(b'fdAT', struct.pack('>I', self._seq) + data[i:i + IDAT_SIZE]))
+                self._seq += 1
+        self.frames += 1
+        self._pending = None
+
+    def close(self):
+        if self._pending is None:
+            self.abort()
+            raise ValueError('APNG stream closed without frames')
+        self._write_pending()
+        self._f.write(chunk(b'IEND', b''))
+        self._f.seek(self._actl_at)
+        self._f.write(chunk(b'acTL', struct.pack('>II', self.frames, self.loop)))
+        self._f.close()
+        self.changed = _replace_if_changed(self._tmp, self.path)
+
+    def abort(self):
+        self._f.close()
+        if os.path.exists(self._tmp):
+            os.unlink(self._tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
@@ -12,9 +12,26 @@ Output:
   - app_store_iphone/ (1284x2778 resized)
   - app_store_ipad_129/ (2048x2732 resized with padding)
   - app_store_ipad_11/ (2064x2752 resized with padding)
+
+Usage:
+  python3 tools/prepare_store_screenshots.py [--stream] [--workers N] [--shard i/N] [--profile]
+  --stream     resize in horizontal strips and write PNG rows incrementally:
+               peak memory stays constant whatever the output size (CI runners with many workers)
+  --workers N  resize in a process pool; decoded sources and results are passed
+               through shared memory (see shm_transport.py)
+  --shard i/N  process only the i-th of N slices of the (store, screenshot) pairs into
+               build/shards/ (see sharding.py); merge_shards.py puts them in place
 """
 from PIL import Image
-import os, shutil
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from png_stream import PngStreamWriter
+from profiling import stage, enable_from_argv
+from sharding import ShardRun, add_shard_argument
+from shm_transport import release, share, with_image
+from write_behind import copy_file, flush_writes, get_writer, save_async, write_image
 
 ROOT = os.path.dirname(os.path.dirname(__file__))
 SCREENSHOTS_DIR = os.path.join(ROOT, 'assets', 'store_graphics', 'screenshots')
@@ -27,53 +44,149 @@ SPECS = {
     'app_store_ipad_11': (2064, 2752),  # iPad Pro 11" 3rd gen
 }
 
-def ensure_dir(path):
-    os.makedirs(path, exist_ok=True)
+STRIP_BYTES = 512 * 1024  # raw output bytes per strip in --stream mode
 
-def resize_with_fit(img: Image.Image, target_w: int, target_h: int, bg_color=(245, 250, 247)):
+def fit_geometry(src_w: int, src_h: int, target_w: int, target_h: int):
     """
-    Resize image to fit within target dimensions while maintaining aspect ratio (iPhone),
-    or fill (center crop) for iPad to avoid iPhone frame on iPad screenshots.
+    iPad: fill (center crop), iPhone: fit (letterbox).
+    Returns (crop box or None, resized (w, h), paste offset (x, y)).
     """
-    src_w, src_h = img.size
     src_ratio = src_w / src_h
     target_ratio = target_w / target_h
-
-    # iPad: fill (center crop), iPhone: fit (letterbox)
-    if target_w >= 2000:  # iPad
-        # Center crop to fill
+    if target_w >= 2000:  # iPad: fill (center crop)
         if src_ratio > target_ratio:
             # Source is wider: crop width
             new_h = src_h
             new_w = int(new_h * target_ratio)
-            left = (src_w - new_w) // 2
-            top = 0
+            left, top = (src_w - new_w) // 2, 0
         else:
             # Source is taller: crop height
             new_w = src_w
             new_h = int(new_w / target_ratio)
-            left = 0
-            top = (src_h - new_h) // 2
-        box = (left, top, left + new_w, top + new_h)
-        cropped = img.crop(box)
-        resized = cropped.resize((target_w, target_h), Image.Resampling.LANCZOS)
-        return resized
+            left, top = 0, (src_h - new_h) // 2
+        return (left, top, left + new_w, top + new_h), (target_w, target_h), (0, 0)
+    # iPhone: fit with background
+    if src_ratio > target_ratio:
+        new_w = target_w
+        new_h = int(target_w / src_ratio)
     else:
-        # iPhone: fit with background
-        if src_ratio > target_ratio:
-            new_w = target_w
-            new_h = int(target_w / src_ratio)
-        else:
-            new_h = target_h
-            new_w = int(target_h * src_ratio)
-        resized = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
-        canvas = Image.new('RGB', (target_w, target_h), bg_color)
-        paste_x = (target_w - new_w) // 2
-        paste_y = (target_h - new_h) // 2
-        canvas.paste(resized, (paste_x, paste_y))
-        return canvas
-
-def process_screenshots():
+        new_h = target_h
+        new_w = int(target_h * src_ratio)
+    return None, (new_w, new_h), ((target_w - new_w) // 2, (target_h - new_h) // 2)
+
+def resize_with_fit(img: Image.Image, target_w: int, target_h: int, bg_color=(245, 250, 247)):
+    """
+    Resize image to fit within target dimensions while maintaining aspect ratio (iPhone),
+    or fill (center crop) for iPad to avoid iPhone frame on iPad screenshots.
+    """
+    box, size, offset = fit_geometry(img.width, img.height, target_w, target_h)
+    if box is not None:
+        return img.crop(box).resize(size, Image.Resampling.LANCZOS)
+    resized = img.resize(size, Image.Resampling.LANCZOS)
+    canvas = Image.new('RGB', (target_w, target_h), bg_color)
+    canvas.paste(resized, offset)
+    return canvas
+
+
+def stream_resize_with_fit(img: Image.Image, target_w: int, target_h: int, dst_path: str,
+                           bg_color=(245, 250, 247), strip_bytes=STRIP_BYTES):
+    """
+    resize_with_fit() written straight to dst_path as PNG, one horizontal strip at a time.
+    Each strip is resampled with resize(box=...), which reads the source rows around the box
+    that the LANCZOS kernel needs, so strips join seamlessly: the result matches the full
+    resize within ±1 (float rounding of the per-strip filter coefficients; for translucent
+    pixels the ±1 is in premultiplied alpha).
+    Memory: decoded source (+ crop) and one strip of strip_bytes, whatever the output size.
+    """
+    crop, (new_w, new_h), (paste_x, paste_y) = fit_geometry(img.width, img.height, target_w, target_h)
+    if crop is not None:
+        img = img.crop(crop)
+        mode = img.mode  # the fill path keeps the source mode, like resize_with_fit
+    else:
+        mode = 'RGB'     # the fit path pastes onto an RGB canvas
+    # Image.resize() premultiplies alpha on every call; do it once for all strips instead
+    premultiplied = {'RGBA': 'RGBa', 'LA': 'La'}.get(img.mode)
+    if premultiplied:
+        img = img.convert(premultiplied)
+    scale_y = img.height / new_h
+    strip_rows = max(1, strip_bytes // (target_w * len(mode)))
+    with PngStreamWriter(dst_path, (target_w, target_h), mode) as png:
+        for y0 in range(0, target_h, strip_rows):
+            y1 = min(y0 + strip_rows, target_h)
+            strip = Image.new(mode, (target_w, y1 - y0), bg_color)
+            # rows of the resized image inside this strip
+            r0, r1 = max(y0 - paste_y, 0), min(y1 - paste_y, new_h)
+            if r0 < r1:
+                part = img.resize((new_w, r1 - r0), Image.Resampling.LANCZOS,
+                                  box=(0, r0 * scale_y, img.width, r1 * scale_y))
+                if premultiplied:
+                    part = part.convert(premultiplied.upper())
+                strip.paste(part, (paste_x, paste_y + r0 - y0))
+            png.write(strip.tobytes())
+
+
+def _resize_job(desc, w: int, h: int, dst_path: str, stream: bool):
+    """Pool worker: resize the shared source; the result comes back as a shared block."""
+    if stream:
+        with_image(desc, stream_resize_with_fit, w, h, dst_path)
+        return None
+    resized = with_image(desc, resize_with_fit, w, h)
+    out_desc, _ = share(resized, handoff=True)
+    return out_desc
+
+
+def _save_png(img, dst_path):
+    write_image(img, dst_path, 'png-optimize')
+
+
+def process_screenshots_pool(jobs: dict, run: ShardRun, workers: int, stream=False):
+    """
+    Same outputs as process_screenshots, resized in a process pool. Sources are decoded
+    once and handed to the workers through shared memory; resized images come back the
+    same way (only descriptors are pickled). PNG encoding stays in this process.
+    """
+    sources = {}
+    try:
+        for fname in sorted({f for store, files in jobs.items() if store != 'play_store' for f in files}):
+            with stage('decode'):
+                img = Image.open(os.path.join(SCREENSHOTS_DIR, fname))
+                img.load()
+            with stage('share'):
+                sources[fname] = share(img)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for store, files in jobs.items():
+                w, h = SPECS[store]
+                print(f'📂 {store} ({w}x{h}):')
+                if store == 'play_store':
+                    for fname in files:
+                        with stage('copy'):
+                            copy_file(os.path.join(SCREENSHOTS_DIR, fname), run.output_path(store_output(store, fname)))
+                        print(f'  ✅ {fname} (복사)')
+                    print()
+                    continue
+                futures = []
+                for fname in files:
+                    dst_path = run.output_path(store_output(store, fname))
+                    futures.append((fname, dst_path, pool.submit(_resize_job, sources[fname][0], w, h, dst_path, stream)))
+                for fname, dst_path, future in futures:
+                    with stage('resize (pool)'):
+                        out_desc = future.result()
+                    if out_desc is not None:
+                        with stage('encode'):
+                            with_image(out_desc, _save_png, dst_path, unlink=True)
+                    print(f'  ✅ {fname} (리사이즈 {w}x{h})')
+                print()
+    finally:
+        for _, shm in sources.values():
+            release(shm, unlink=True)
+
+
+def store_output(store: str, fname: str) -> str:
+    """Repo-relative output path of one store screenshot."""
+    return f'assets/store_graphics/screenshots/{store}/{fname}'
+
+
+def process_screenshots(stream=False, workers=1, shard=None):
     # Find all source screenshots (any PNG file in screenshots dir)
     source_files = sorted([
         f for f in os.listdir(SCREENSHOTS_DIR)
@@ -86,32 +199,66 @@ def process_screenshots():
     
     print(f'📱 소스 스크린샷 {len(source_files)}개 발견\n')
     
-    for store, (w, h) in SPECS.items():
-        store_dir = os.path.join(SCREENSHOTS_DIR, store)
-        ensure_dir(store_dir)
+    run = ShardRun('prepare_store_screenshots', shard)
+    jobs = {}
+    for store, fname in run.select([(store, f) for store in SPECS for f in source_files], key=lambda j: f'{j[0]}/{j[1]}'):
+        jobs.setdefault(store, []).append(fname)
+    
+    if workers > 1:
+        process_screenshots_pool(jobs, run, workers, stream)
+        run.finish()
+        print_summary()
+        return
+    
+    for store, files in jobs.items():
+        w, h = SPECS[store]
         print(f'📂 {store} ({w}x{h}):')
         
-        for fname in source_files:
+        for fname in files:
             src_path = os.path.join(SCREENSHOTS_DIR, fname)
-            dst_path = os.path.join(store_dir, fname)
+            dst_path = run.output_path(store_output(store, fname))
             
             if store == 'play_store':
                 # Play Store: just copy original (already correct size)
-                shutil.copy2(src_path, dst_path)
+                with stage('copy'):
+                    copy_file(src_path, dst_path)
                 print(f'  ✅ {fname} (복사)')
             else:
                 # Other stores: resize with fit
-                img = Image.open(src_path)
-                resized = resize_with_fit(img, w, h)
-                resized.save(dst_path, 'PNG', optimize=True)
+                with stage('decode'):
+                    img = Image.open(src_path)
+                    img.load()
+                if stream:
+                    with stage('stream resize'):
+                        stream_resize_with_fit(img, w, h, dst_path)
+                else:
+                    with stage('resize'):
+                        resized = resize_with_fit(img, w, h)
+                    with stage('queue'):
+                        save_async(resized, dst_path, 'png-optimize')
                 print(f'  ✅ {fname} (리사이즈 {w}x{h})')
         print()
     
+    with stage('encode'):
+        flush_writes()
+    print('💾', get_writer().summary())
+    run.finish()
+    print_summary()
+
+
+def print_summary():
     print('✅ 완료: 4개 스토어별 스크린샷 세트 생성')
     print(f'   - Play Store: {SCREENSHOTS_DIR}/play_store/')
     print(f'   - App Store iPhone: {SCREENSHOTS_DIR}/app_store_iphone/')
     print(f'   - App Store iPad 12.9": {SCREENSHOTS_DIR}/app_store_ipad_129/')
     print(f'   - App Store iPad 11": {SCREENSHOTS_DIR}/app_store_ipad_11/')
 
+
 if __name__ == '__main__':
-    process_screenshots()
+    enable_from_argv('prepare_store_screenshots')
+    parser = argparse.ArgumentParser(description='Resize screenshots for every store')
+    parser.add_argument('--stream', action='store_true', help='strip-wise resize, constant memory')
+    parser.add_argument('--workers', type=int, default=1, help='process pool size (images travel via shared memory)')
+    add_shard_argument(parser)
+    args = parser.parse_args()
+    process_screenshots(stream=args.stream, workers=args.workers, shard=args.shard)
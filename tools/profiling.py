@@ -0,0 +1,203 @@
+"""
+Lightweight per-stage instrumentation for the asset generators.
+
+    from profiling import stage, profiled, enable_from_argv
+
+    enable_from_argv('feature_graphic_premium')   # no-op unless --profile is passed
+
+    with stage('background'):
+        ...
+
+    @profiled('encode')
+    def save(...): ...
+
+Each stage records wall time, CPU time and the tracemalloc peak reached inside it
+(nested stages included). Pillow's pixel buffers live outside the Python allocator,
+so the growth of the process max RSS during the stage is recorded as well.
+When profiling is off, stage() costs one attribute check.
+
+At exit a report is written to build/profile/<run>-<timestamp>.json:
+- "stages": flat summary (path, wall_ms, cpu_ms, peak_kb, rss_growth_kb)
+- "traceEvents": Chrome trace format, loadable in chrome://tracing, Perfetto or speedscope
+and a .folded file (collapsed stacks, self time in µs) for flamegraph.pl / speedscope.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_DIR = os.path.join(ROOT, 'build', 'profile')
+
+_active = None  # Profiler while profiling is enabled
+
+
+def _max_rss_kb() -> int:
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss  # bytes on macOS, KB on Linux
+
+
+class Profiler:
+    def __init__(self, run_name: str):
+        self.run_name = run_name
+        self.records = []
+        self._stack = []
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+    def push(self, name: str):
+        # Fold the peak reached so far into the parent before resetting it for the child
+        _, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            parent = self._stack[-1]
+            parent['peak'] = max(parent['peak'], peak)
+        tracemalloc.reset_peak()
+        rec = {
+            'name': name,
+            'path': ';'.join([r['name'] for r in self._stack] + [name]),
+            'depth': len(self._stack),
+            'start': time.perf_counter(),
+            'cpu_start': time.process_time(),
+            'peak': 0,
+            'rss_start': _max_rss_kb(),
+            'child_wall': 0.0,
+        }
+        self._stack.append(rec)
+        return rec
+
+    def pop(self, rec):
+        wall = time.perf_counter() - rec['start']
+        cpu = time.process_time() - rec['cpu_start']
+        _, peak = tracemalloc.get_traced_memory()
+        rec['peak'] = max(rec['peak'], peak)
+        self._stack.pop()
+        if self._stack:
+            parent = self._stack[-1]
+            parent['peak'] = max(parent['peak'], rec['peak'])
+            parent['child_wall'] += wall
+        tracemalloc.reset_peak()
+        self.records.append({
+            'name': rec['name'],
+            'path': rec['path'],
+            'depth': rec['depth'],
+            'start_ms': (rec['start'] - self._t0) * 1000,
+            'wall_ms': wall * 1000,
+            'cpu_ms': cpu * 1000,
+            'self_ms': (wall - rec['child_wall']) * 1000,
+            'peak_kb': rec['peak'] / 1024,
+            'rss_growth_kb': _max_rss_kb() - rec['rss_start'],
+        })
+
+    def report(self) -> dict:
+        stages = sorted(self.records, key=lambda r: r['start_ms'])
+        pid = os.getpid()
+        events = [{
+            'name': r['name'], 'cat': 'stage', 'ph': 'X', 'pid': pid, 'tid': 0,
+            'ts': round(r['start_ms'] * 1000), 'dur': round(r['wall_ms'] * 1000),
+            'args': {'cpu_ms': round(r['cpu_ms'], 3), 'peak_kb': round(r['peak_kb'], 1),
+                     'rss_growth_kb': r['rss_growth_kb']},
+        } for r in stages]
+        return {
+            'run': self.run_name,
+            'argv': sys.argv,
+            'total_wall_ms': (time.perf_counter() - self._t0) * 1000,
+            'total_cpu_ms': (time.process_time() - self._cpu0) * 1000,
+            'stages': stages,
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+        }
+
+    def folded(self) -> str:
+        totals = {}
+        for r in self.records:
+            totals[r['path']] = totals.get(r['path'], 0) + round(r['self_ms'] * 1000)
+        return ''.join(f'{path} {us}\n' for path, us in sorted(totals.items()))
+
+    def write(self, out_dir=PROFILE_DIR) -> str:
+        os.makedirs(out_dir, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        base = os.path.join(out_dir, f'{self.run_name}-{stamp}')
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        with open(base + '.folded', 'w', encoding='utf-8') as f:
+            f.write(self.folded())
+        return base + '.json'
+
+    def print_summary(self):
+        print(f'\n⏱️  프로파일: {self.run_name}')
+        print(f"  {'stage':<36} {'wall ms':>9} {'cpu ms':>9} {'peak KB':>10} {'+RSS KB':>10}")
+        for r in sorted(self.records, key=lambda r: r['start_ms']):
+            label = '  ' * r['depth'] + r['name']
+            print(f"  {label:<36} {r['wall_ms']:>9.1f} {r['cpu_ms']:>9.1f} {r['peak_kb']:>10.0f} {r['rss_growth_kb']:>10}")
+
+
+class stage:
+    """Context manager marking a pipeline stage; does nothing while profiling is off."""
+    __slots__ = ('name', '_rec')
+
+    def __init__(self, name: str):
+        self.name = name
+        self._rec = None
+
+    def __enter__(self):
+        if _active is not None:
+            self._rec = _active.push(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        if self._rec is not None:
+            _active.pop(self._rec)
+            self._rec = None
+        return False
+
+
+def profiled(name=None):
+    """Decorator form of stage(); the stage name defaults to the function name."""
+    def wrap(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with stage(label):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def enable(run_name: str) -> Profiler:
+    """Start profiling and write the report when the process exits."""
+    global _active
+    if _active is None:
+        _active = Profiler(run_name)
+
+        def finish():
+            _active.print_summary()
+            print('📝 프로파일 저장:', os.path.relpath(_active.write(), ROOT))
+        atexit.register(finish)
+    return _active
+
+
+def enable_from_argv(run_name: str, argv=None):
+    """Enable profiling when --profile is on the command line (and strip the flag)."""
+    argv = sys.argv if argv is None else argv
+    if '--profile' in argv:
+        argv.remove('--profile')
+        return enable(run_name)
+    return None
+
+
+def is_enabled() -> bool:
+    return _active is not None
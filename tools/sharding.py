@@ -0,0 +1,106 @@
+"""
+Deterministic --shard i/N partitioning for CI fan-out.
+
+    from sharding import add_shard_argument, ShardRun
+
+    add_shard_argument(parser)
+    args = parser.parse_args()
+    run = ShardRun('create_screenshots', args.shard)
+    for name in run.select(names):                                      # this shard's targets
+        save(render(name), run.output_path(f'assets/.../{name}.png'))   # final repo-relative path
+    run.finish()                                                        # after the files are written
+
+Targets are sorted by key and dealt round-robin, so every job computes the same split
+from the same tree with no coordination. Without --shard everything renders in place
+as before. With --shard, outputs go to build/shards/<i>-of-<N>/<repo-relative path>
+and a <tool>.manifest.json records the target list and the content hash of every
+output. merge_shards.py checks the manifests and copies the outputs into place.
+"""
+import argparse
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHARDS_DIR = os.path.join(ROOT, 'build', 'shards')
+MANIFEST_SUFFIX = '.manifest.json'
+
+Shard = namedtuple('Shard', 'index count')  # index is 1-based
+
+
+def parse_shard(value: str) -> Shard:
+    index, _, count = value.partition('/')
+    if not (index.isdigit() and count.isdigit()) or not 1 <= int(index) <= int(count):
+        raise argparse.ArgumentTypeError(f'잘못된 샤드 형식: {value} (예: 2/4)')
+    return Shard(int(index), int(count))
+
+
+def add_shard_argument(parser: argparse.ArgumentParser):
+    parser.add_argument('--shard', type=parse_shard, default=None, metavar='i/N',
+                        help='render only the i-th of N deterministic slices (CI fan-out); merge with merge_shards.py')
+
+
+def partition(keys, shard: Shard) -> list:
+    """Keys of the given shard: sorted, then dealt round-robin (sizes differ by at most one)."""
+    return [k for n, k in enumerate(sorted(keys)) if n % shard.count == shard.index - 1]
+
+
+def file_hash(path: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def targets_digest(keys) -> str:
+    return hashlib.blake2b('\n'.join(sorted(keys)).encode(), digest_size=8).hexdigest()
+
+
+class ShardRun:
+    def __init__(self, tool: str, shard=None):
+        self.tool = tool
+        self.shard = shard
+        self.all_targets = []
+        self.selected = []
+        self.outputs = []
+        self.root = ROOT if shard is None else os.path.join(SHARDS_DIR, f'{shard.index}-of-{shard.count}')
+
+    def select(self, items, key=str) -> list:
+        """Items of this shard, in their original order."""
+        keys = {key(item): item for item in items}
+        self.all_targets = sorted(keys)
+        mine = set(keys) if self.shard is None else set(partition(keys, self.shard))
+        self.selected = [k for k in keys if k in mine]
+        if self.shard is not None:
+            print(f'🧩 샤드 {self.shard.index}/{self.shard.count}: 대상 {len(mine)}/{len(keys)}개')
+        return [item for k, item in keys.items() if k in mine]
+
+    def output_path(self, rel_path: str) -> str:
+        """Where to write the output whose final location is ROOT/rel_path."""
+        path = os.path.join(self.root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.outputs.append(rel_path.replace(os.sep, '/'))
+        return path
+
+    def finish(self):
+        """Write this shard's manifest (no-op without --shard). Call once the outputs are on disk."""
+        if self.shard is None:
+            return None
+        manifest = {
+            'tool': self.tool,
+            'shard': list(self.shard),
+            'targets': self.selected,
+            'all_targets': len(self.all_targets),
+            'targets_digest': targets_digest(self.all_targets),
+            'outputs': {rel: {'blake2b': file_hash(os.path.join(self.root, rel)),
+                              'size': os.path.getsize(os.path.join(self.root, rel))}
+                        for rel in sorted(set(self.outputs))},
+        }
+        path = os.path.join(self.root, self.tool + MANIFEST_SUFFIX)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f'🧾 샤드 매니페스트: {os.path.relpath(path, ROOT)} (출력 {len(manifest["outputs"])}개)')
+        return path
@@ -0,0 +1,141 @@
+"""
+Hand decoded images between pipeline processes through multiprocessing.shared_memory
+instead of pickling the pixel buffers.
+
+    desc, shm = share(img)                 # producer: one copy into a shared block
+    pool.submit(job, desc, ...)            # only the small descriptor is pickled
+    ...
+    release(shm, unlink=True)              # when every job is done
+
+    def job(desc, ...):                    # worker
+        out = with_image(desc, work)       # zero-copy view for L / RGBA / RGBX / CMYK / I / F
+        out_desc, _ = share(out, handoff=True)
+        return out_desc                    # the result comes back the same way
+
+    with_image(out_desc, save, path, unlink=True)   # consumer takes ownership
+
+Workers can also fill one shared output image region by region (tiles.py):
+
+    desc, shm = allocate('RGB', (8192, 8192))
+    pool.submit(job, desc, box)            # worker: write_region(desc, tile, box[:2])
+    img = with_image(desc, Image.Image.copy)
+    release(shm, unlink=True)
+
+A descriptor is a plain dict: {'name', 'mode', 'size', 'rawmode', 'nbytes', 'tracker'}.
+Modes Pillow cannot map in place (RGB is stored with 4 bytes per pixel) are copied
+once when attached. The creator of a block unlinks it, unless it was shared with
+handoff=True, in which case the receiver does (with_image(..., unlink=True)).
+The same works for layers loaded from the layer cache, which are plain Images.
+"""
+import os
+from multiprocessing import resource_tracker, shared_memory
+
+from PIL import Image
+
+ZERO_COPY_MODES = ('L', 'RGBA', 'RGBX', 'CMYK', 'I', 'F')
+
+
+def _tracker_id():
+    # Children started by multiprocessing (fork, spawn or forkserver) inherit the
+    # tracker's pipe: same inode = same tracker process
+    return os.fstat(resource_tracker.getfd()).st_ino
+
+
+def _untrack(shm):
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    shm.untracked = True
+
+
+def _open(desc: dict):
+    try:
+        return shared_memory.SharedMemory(name=desc['name'], track=False)
+    except TypeError:  # track= is new in Python 3.13
+        shm = shared_memory.SharedMemory(name=desc['name'])
+        # Python < 3.13 registers attached blocks with this process's resource tracker,
+        # which would unlink them when the process exits (bpo-39959). Forked workers
+        # share the creator's tracker, where the block is already registered.
+        if desc['tracker'] != _tracker_id():
+            _untrack(shm)
+        return shm
+
+
+def share(img: Image.Image, handoff=False):
+    """Copy img into a new shared block. Returns (descriptor, SharedMemory)."""
+    img.load()
+    data = img.tobytes()
+    shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    shm.buf[:len(data)] = data
+    desc = {'name': shm.name, 'mode': img.mode, 'size': img.size, 'rawmode': img.mode, 'nbytes': len(data),
+            'tracker': _tracker_id()}
+    if handoff:
+        # The receiver unlinks the block; keep it alive when this process exits
+        _untrack(shm)
+        shm.close()
+    return desc, shm
+
+
+def allocate(mode: str, size) -> tuple:
+    """New zero-filled shared block for a mode x size image. Returns (descriptor, SharedMemory)."""
+    nbytes = len(Image.new(mode, (1, 1)).tobytes()) * size[0] * size[1]
+    shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+    desc = {'name': shm.name, 'mode': mode, 'size': tuple(size), 'rawmode': mode, 'nbytes': nbytes,
+            'tracker': _tracker_id()}
+    return desc, shm
+
+
+def write_region(desc: dict, img: Image.Image, xy):
+    """Copy img into the image of desc with its top left corner at xy (img must fit)."""
+    width, height = desc['size']
+    x, y = xy
+    if img.mode != desc['mode'] or x < 0 or y < 0 or x + img.width > width or y + img.height > height:
+        raise ValueError(f'{img.mode} {img.size} at {xy} does not fit a {desc["mode"]} {desc["size"]} image')
+    data = img.tobytes('raw', desc['rawmode'])
+    bpp = desc['nbytes'] // (width * height)
+    row = img.width * bpp
+    shm = _open(desc)
+    try:
+        for r in range(img.height):
+            start = ((y + r) * width + x) * bpp
+            shm.buf[start:start + row] = data[r * row:(r + 1) * row]
+    finally:
+        release(shm)
+
+
+def view(desc: dict, shm) -> Image.Image:
+    buf = shm.buf[:desc['nbytes']]
+    if desc['mode'] in ZERO_COPY_MODES:
+        return Image.frombuffer(desc['mode'], tuple(desc['size']), buf, 'raw', desc['rawmode'], 0, 1)
+    img = Image.frombytes(desc['mode'], tuple(desc['size']), bytes(buf), 'raw', desc['rawmode'])
+    buf.release()
+    return img
+
+
+def with_image(desc: dict, fn, *args, unlink=False):
+    """
+    Call fn(img, *args) with the image of desc and return its result.
+    Zero-copy images are read-only views of the block, valid only during the call:
+    fn must not return or keep the view itself (copy anything that must outlive it).
+    unlink=True: this process owns the block (handoff) and frees it afterwards.
+    """
+    shm = _open(desc)
+    img = view(desc, shm)
+    try:
+        return fn(img, *args)
+    finally:
+        del img
+        release(shm, unlink=unlink)
+
+
+def release(shm, unlink=False):
+    try:
+        shm.close()
+    except BufferError:  # a view is still referenced somewhere; the OS frees it at exit
+        pass
+    if unlink:
+        if getattr(shm, 'untracked', False):
+            # unlink() unregisters the block from the tracker; balance the earlier _untrack()
+            resource_tracker.register(shm._name, 'shared_memory')
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Shrink the launcher icon PNGs shipped in the app bundles:
+  android/app/src/main/res/mipmap-*/*.png
+  ios/Runner/Assets.xcassets/AppIcon.appiconset/*.png
+  macos/Runner/Assets.xcassets/AppIcon.appiconset/*.png
+
+For every file two encodings are tried:
+- truecolor: same mode, zlib optimize
+- palette:   alpha-aware 256-colour quantization (libimagequant when available)
+The palette version is only accepted when its error against the original stays under
+the threshold (RMS ΔE in CIELAB, alpha composited over black and white).
+The smallest acceptable encoding is kept; files are never made bigger.
+
+Usage:
+  python3 tools/shrink_launcher_icons.py [--dry-run] [--max-delta-e 2.0]
+"""
+import argparse
+import glob
+import io
+import math
+import os
+
+from PIL import Image, ImageChops, ImageCms, ImageStat, features
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+ICON_GLOBS = [
+    'android/app/src/main/res/mipmap-*/*.png',
+    'ios/Runner/Assets.xcassets/AppIcon.appiconset/*.png',
+    'macos/Runner/Assets.xcassets/AppIcon.appiconset/*.png',
+]
+DEFAULT_MAX_DELTA_E = 2.0  # ~1 JND (2.3) in CIE76
+
+_SRGB_TO_LAB = ImageCms.buildTransform(
+    ImageCms.createProfile('sRGB'), ImageCms.createProfile('LAB'), 'RGB', 'LAB')
+
+
+def find_icons():
+    paths = []
+    for pattern in ICON_GLOBS:
+        paths.extend(sorted(glob.glob(os.path.join(ROOT, pattern))))
+    return paths
+
+
+def encode_png(img: Image.Image) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, 'PNG', optimize=True)
+    return buf.getvalue()
+
+
+def quantize(img: Image.Image) -> Image.Image:
+    if features.check('libimagequant'):
+        method = Image.Quantize.LIBIMAGEQUANT
+    elif img.mode == 'RGBA':
+        method = Image.Quantize.FASTOCTREE  # MEDIANCUT does not handle alpha
+    else:
+        method = Image.Quantize.MEDIANCUT
+    return img.quantize(colors=256, method=method, dither=Image.Dither.NONE)
+
+
+def delta_e(a: Image.Image, b: Image.Image) -> float:
+    """Worst RMS ΔE76 of the two images composited over black and over white."""
+    worst = 0.0
+    for bg in ((0, 0, 0), (255, 255, 255)):
+        labs = []
+        for img in (a, b):
+            flat = Image.new('RGB', img.size, bg)
+            rgba = img.convert('RGBA')
+            flat.paste(rgba, (0, 0), rgba)
+            labs.append(ImageCms.applyTransform(flat, _SRGB_TO_LAB))
+        rms_l, rms_a, rms_b = ImageStat.Stat(ImageChops.difference(*labs)).rms
+        # Pillow's LAB stores L* scaled to 0~255
+        worst = max(worst, math.sqrt((rms_l * 100 / 255) ** 2 + rms_a ** 2 + rms_b ** 2))
+    return worst
+
+
+def shrink(path: str, max_delta_e: float):
+    """Return (best_bytes or None when the original is already smallest, report dict)."""
+    with open(path, 'rb') as f:
+        original = f.read()
+    img = Image.open(io.BytesIO(original))
+    img.load()
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGBA' if 'A' in img.getbands() or 'transparency' in img.info else 'RGB')
+
+    candidates = {'truecolor': encode_png(img)}
+    palette = quantize(img)
+    err = delta_e(img, palette)
+    if err <= max_delta_e:
+        candidates['palette'] = encode_png(palette)
+
+    kind, data = min(candidates.items(), key=lambda kv: len(kv[1]))
+    report = {'kind': kind, 'before': len(original), 'after': min(len(data), len(original)), 'delta_e': err}
+    if len(data) >= len(original):
+        report['kind'] = 'original'
+        return None, report
+    return data, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Palette-quantize launcher icons when visually lossless')
+    parser.add_argument('--dry-run', action='store_true', help='report savings without writing files')
+    parser.add_argument('--max-delta-e', type=float, default=DEFAULT_MAX_DELTA_E)
+    args = parser.parse_args()
+
+    icons = find_icons()
+    if not icons:
+        raise SystemExit('❌ 런처 아이콘을 찾을 수 없습니다.')
+
+    total_before = total_after = 0
+    for path in icons:
+        data, r = shrink(path, args.max_delta_e)
+        total_before += r['before']
+        total_after += r['after']
+        if data is not None and not args.dry_run:
+            with open(path, 'wb') as f:
+                f.write(data)
+        saved = r['before'] - r['after']
+        print(f"  {'✅' if saved else '➖'} {os.path.relpath(path, ROOT)}: "
+              f"{r['before']:,} → {r['after']:,} bytes ({r['kind']}, ΔE {r['delta_e']:.2f})")
+
+    saved = total_before - total_after
+    pct = saved / total_before * 100 if total_before else 0
+    print(f"\n{'🔎 (dry-run) ' if args.dry_run else ''}아이콘 {len(icons)}개: "
+          f'{total_before:,} → {total_after:,} bytes, {saved:,} bytes 절감 ({pct:.1f}%)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Replay a backup through NotificationService's scheduling rules
+(lib/core/notify/notification_service.dart) on an event queue, to see how the
+schedule holds up for users with many plants.
+
+Model (one device, one time zone, default Asia/Seoul like NotificationService.init):
+- scheduleFor(plant)   inactive: cancelFor; fire time = TZDateTime(nextWaterDate date,
+                       notifyHour, notifyMinute); in the past: not scheduled; otherwise
+                       AndroidAlarmManager.oneShotAt + zonedSchedule, both with the ID
+                       plant.id.hashCode, so a plant with the same hash replaces the other
+- reconcileAll         cancelAll (notifications only: AlarmManager alarms stay), then
+                       scheduleFor every active plant in getAll() order (nearestDue)
+- platform limits      android: the two channels share AlarmManager's cap of pending
+                       alarms per app (--alarm-limit, 500); ios: zonedSchedule only, the
+                       system keeps the 64 soonest
+- user                 on every notification, waters the plant of its payload after
+                       --water-delay minutes (markWateredToday -> scheduleFor), or ignores
+                       it with probability --miss-rate
+- reconciles           at --start (backup import), then every --reconcile-every hours
+
+Events (fires, waterings, reconciles) are popped in time order from a heap; cancelled
+or replaced schedules are dropped lazily when their event comes up.
+
+Reports: posts / alerts per minute (bursts), the work done by each reconcile, plants
+left without any pending notification, and an index of alarm-ID collisions.
+plant.id.hashCode is the Dart VM String hash (one-at-a-time over UTF-16 code units,
+30 bits); web builds hash differently.
+
+Usage:
+  python3 tools/simulate_notifications.py backup.json [--start 2025-11-20T08:00]
+         [--horizon 30] [--tz Asia/Seoul] [--platform android|ios]
+         [--reconcile-every 168] [--water-delay 30] [--miss-rate 0] [--json report.json]
+"""
+import argparse
+import datetime
+import heapq
+import json
+import random
+import time
+from collections import Counter, defaultdict
+
+from forecast_watering import DAY, LocalTime, day_date, load_backup
+
+DART_HASH_BITS = 30
+TEST_NOTIFICATION_ID = 999  # showTestNotification
+ALARM, NOTIFICATION = 'alarm', 'notification'
+PLATFORMS = {
+    # channels, pending limit, what happens beyond it
+    'android': ((ALARM, NOTIFICATION), 500, 'reject'),
+    'ios': ((NOTIFICATION,), 64, 'keep-soonest'),
+}
+# heap entry kinds; equal times run in this order
+RECONCILE, FIRE, WATER = 0, 1, 2
+
+
+def dart_string_hash(s: str) -> int:
+    """String.hashCode in the Dart VM (StringHasher + FinalizeHash with String::kHashBits)."""
+    h = 0
+    for unit in memoryview(s.encode('utf-16-le')).cast('H'):
+        h = (h + unit) & 0xFFFFFFFF
+        h = (h + (h << 10)) & 0xFFFFFFFF
+        h ^= h >> 6
+    h = (h + (h << 3)) & 0xFFFFFFFF
+    h ^= h >> 11
+    h = (h + (h << 15)) & 0xFFFFFFFF
+    h &= (1 << DART_HASH_BITS) - 1
+    return h or 1
+
+
+def collision_index(ids) -> dict:
+    """{alarm ID: [plant ids]} for every ID shared by two plants or with the test notification."""
+    by_hash = defaultdict(list)
+    for plant_id in ids:
+        by_hash[dart_string_hash(plant_id)].append(plant_id)
+    return {h: group for h, group in sorted(by_hash.items())
+            if len(group) > 1 or h == TEST_NOTIFICATION_ID}
+
+
+class Clock:
+    """Fire times of scheduleFor, with the local-day arithmetic of forecast_watering."""
+
+    def __init__(self, local: LocalTime):
+        self.local = local
+        self._midnights = {}
+
+    def midnight(self, day: int) -> int:
+        t = self._midnights.get(day)
+        if t is None:
+            t = self._midnights[day] = self.local.midnight(day)
+        return t
+
+    def wall(self, day: int, hour: int, minute: int) -> int:
+        """tz.TZDateTime(tz.local, y, m, d, hour, minute) in epoch seconds."""
+        d = day_date(day)
+        if self.local.tz is None:
+            return int(time.mktime((d.year, d.month, d.day, hour, minute, 0, 0, 0, -1)))
+        return int(datetime.datetime(d.year, d.month, d.day, hour, minute, tzinfo=self.local.tz).timestamp())
+
+    def next_instant(self, last_day: int, interval: int) -> int:
+        """nextWaterDate: local midnight of the lastWateredAt date + intervalDays x 24h."""
+        return self.midnight(last_day) + interval * DAY
+
+    def fire_time(self, last_day: int, interval: int, hour: int, minute: int) -> int:
+        return self.wall(self.local.local_day(self.next_instant(last_day, interval)), hour, minute)
+
+    def label(self, t: int) -> str:
+        if self.local.tz is None:
+            return datetime.datetime.fromtimestamp(t).strftime('%Y-%m-%d %H:%M')
+        return datetime.datetime.fromtimestamp(t, self.local.tz).strftime('%Y-%m-%d %H:%M')
+
+
+class Device:
+    """Pending alarms / notifications of one install, keyed by ID like the platform APIs."""
+
+    def __init__(self, platform: str, limit=None):
+        self.channels, default_limit, self.overflow = PLATFORMS[platform]
+        self.limit = default_limit if limit is None else limit
+        self.pending = {ch: {} for ch in self.channels}  # id -> (fire time, seq, plant row)
+
+    def total(self) -> int:
+        return sum(len(p) for p in self.pending.values())
+
+    def put(self, channel: str, alarm_id: int, entry: tuple):
+        """Store a schedule; returns (replaced entry or None, dropped entry or None, accepted)."""
+        pending = self.pending[channel]
+        old = pending.get(alarm_id)
+        if old is None and self.limit and self.overflow == 'reject' and self.total() >= self.limit:
+            return None, None, False
+        pending[alarm_id] = entry
+        dropped = None
+        if self.limit and self.overflow == 'keep-soonest' and len(pending) > self.limit:
+            latest = max(pending, key=lambda k: pending[k][:2])
+            dropped = pending.pop(latest)
+        return old, dropped, dropped is not entry
+
+    def valid(self, channel: str, alarm_id: int, seq: int) -> bool:
+        entry = self.pending[channel].get(alarm_id)
+        return entry is not None and entry[1] == seq
+
+
+class Simulator:
+    def __init__(self, cols, clock: Clock, device: Device, water_delay: int, miss_rate: float, seed: int):
+        self.cols = cols
+        self.clock = clock
+        self.device = device
+        self.water_delay = water_delay
+        self.miss_rate = miss_rate
+        self.rng = random.Random(seed)
+        self.hashes = [dart_string_hash(i) for i in cols.ids]
+        self.last_day = [int(d) for d in cols.last_day]
+        self.interval = [int(v) for v in cols.interval]
+        self.hour = [int(v) for v in cols.notify_hour]
+        self.minute = [int(v) for v in cols.notify_minute]
+        self.active = [bool(v) for v in cols.active]
+        self.heap = []
+        self.seq = 0
+        self.posts = Counter()     # minute -> notifications posted (every channel)
+        self.alerts = Counter()    # minute -> distinct notifications the user sees
+        self.reconciles = []
+        self.counts = Counter()
+        self.lost = Counter()      # plant row -> schedules replaced by a colliding plant
+        self._alerted = set()      # (alarm ID, fire time) already shown
+
+    def _push(self, t: int, kind: int, data):
+        self.seq += 1
+        heapq.heappush(self.heap, (t, kind, self.seq, data))
+        return self.seq
+
+    def fire_time(self, row: int) -> int:
+        return self.clock.fire_time(self.last_day[row], self.interval[row], self.hour[row], self.minute[row])
+
+    def schedule_for(self, row: int, now: int) -> str:
+        alarm_id = self.hashes[row]
+        if not self.active[row]:
+            self.device.pending[NOTIFICATION].pop(alarm_id, None)  # cancelFor
+            return 'inactive'
+        t = self.fire_time(row)
+        if t < now:
+            return 'past'
+        outcome = 'scheduled'
+        for channel in self.device.channels:
+            seq = self._push(t, FIRE, (channel, alarm_id))
+            old, dropped, accepted = self.device.put(channel, alarm_id, (t, seq, row))
+            if not accepted:
+                outcome = 'limit'
+                continue
+            if old is not None and old[2] != row:
+                self.lost[old[2]] += 1
+                self.counts['overwritten'] += 1
+            if dropped is not None:
+                self.counts['dropped'] += 1
+        return outcome
+
+    def reconcile(self, now: int):
+        cancelled = self.device.pending[NOTIFICATION]
+        before = {k: v[::2] for k, v in cancelled.items()}  # id -> (fire time, row)
+        self.device.pending[NOTIFICATION] = {}
+        # getAll(): nearestDue, inactive plants last, ties in box order
+        order = sorted(range(len(self.cols)),
+                       key=lambda r: (not self.active[r], self.clock.next_instant(self.last_day[r], self.interval[r]), r))
+        work = Counter()
+        for row in order:
+            if self.active[row]:
+                work[self.schedule_for(row, now)] += 1
+        after = self.device.pending[NOTIFICATION]
+        work['cancelled'] = len(before)
+        work['unchanged'] = sum(1 for k, v in after.items() if before.get(k) == v[::2])
+        work['platform_calls'] = 1 + (work['scheduled'] + work['limit']) * len(self.device.channels)
+        self.reconciles.append({'at': self.clock.label(now), **{k: work[k] for k in (
+            'cancelled', 'scheduled', 'unchanged', 'past', 'limit', 'platform_calls')}})
+
+    def fire(self, t: int, channel: str, alarm_id: int, seq: int):
+        if not self.device.valid(channel, alarm_id, seq):
+            self.counts['stale_events'] += 1
+            return
+        _, _, row = self.device.pending[channel].pop(alarm_id)
+        minute = t // 60
+        self.posts[minute] += 1
+        # Both channels post with the same ID at the same instant: the user sees one
+        if (alarm_id, t) in self._alerted:
+            return
+        self._alerted.add((alarm_id, t))
+        self.alerts[minute] += 1
+        if self.rng.random() < self.miss_rate:
+            self.counts['ignored'] += 1
+        else:
+            self._push(t + self.water_delay * 60, WATER, row)
+
+    def water(self, t: int, row: int):
+        self.counts['watered'] += 1
+        self.last_day[row] = self.clock.local.local_day(t)
+        self.schedule_for(row, t)
+
+    def run(self, start: int, end: int, reconcile_every: int):
+        self._push(start, RECONCILE, None)
+        if reconcile_every > 0:
+            for t in range(start + reconcile_every * 3600, end, reconcile_every * 3600):
+                self._push(t, RECONCILE, None)
+        events = 0
+        while self.heap and self.heap[0][0] < end:
+            t, kind, seq, data = heapq.heappop(self.heap)
+            events += 1
+            if kind == RECONCILE:
+                self.reconcile(t)
+            elif kind == FIRE:
+                self.fire(t, data[0], data[1], seq)
+            else:
+                self.water(t, data)
+        self.counts['events'] = events
+        return self
+
+    def stranded(self) -> Counter:
+        """Active plants with nothing pending for them at the end, by likely cause."""
+        covered = {entry[2] for pending in self.device.pending.values() for entry in pending.values()}
+        causes = Counter()
+        for row in range(len(self.cols)):
+            if self.active[row] and row not in covered:
+                causes['collision' if self.lost[row] else 'past / limit'] += 1
+        return causes
+
+
+def burst_report(clock: Clock, per_minute: Counter, top: int) -> dict:
+    values = sorted(per_minute.values())
+    return {
+        'total': sum(values),
+        'busy_minutes': len(values),
+        'max': values[-1] if values else 0,
+        'p99': values[min(len(values) - 1, int(len(values) * 0.99))] if values else 0,
+        'top': [(clock.label(m * 60), n) for m, n in per_minute.most_common(top)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate notification load and alarm-ID collisions for a backup')
+    parser.add_argument('backup', help='plant_water_buddy_backup.json')
+    parser.add_argument('--start', type=datetime.datetime.fromisoformat, default=None,
+                        help='local start time, YYYY-MM-DDTHH:MM (default: now)')
+    parser.add_argument('--horizon', type=int, default=30, help='days to simulate')
+    parser.add_argument('--tz', default='Asia/Seoul', help="IANA time zone (tz.local of the app; 'local' = this machine)")
+    parser.add_argument('--platform', choices=sorted(PLATFORMS), default='android')
+    parser.add_argument('--alarm-limit', type=int, default=None, help='pending limit (0 = none; default: platform)')
+    parser.add_argument('--reconcile-every', type=int, default=168, metavar='HOURS', help='0 = only at the start')
+    parser.add_argument('--water-delay', type=int, default=30, metavar='MIN', help='minutes from notification to watering')
+    parser.add_argument('--miss-rate', type=float, default=0.0, help='probability a notification is ignored')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--top', type=int, default=5, help='busiest minutes to print')
+    parser.add_argument('--json', default=None, metavar='PATH', help='also write the report as JSON')
+    args = parser.parse_args()
+
+    local = LocalTime(None if args.tz == 'local' else args.tz)
+    start = args.start or datetime.datetime.now(local.tz).replace(second=0, microsecond=0, tzinfo=None)
+    start_t = int(start.replace(tzinfo=local.tz).timestamp()) if local.tz else int(time.mktime(start.timetuple()))
+    end_t = start_t + args.horizon * DAY
+
+    t0 = time.perf_counter()
+    try:
+        cols, _ = load_backup(args.backup)
+    except (OSError, ValueError, KeyError) as e:
+        raise SystemExit(f'❌ 백업 읽기 실패: {e}')
+    clock = Clock(local)
+    device = Device(args.platform, args.alarm_limit)
+    sim = Simulator(cols, clock, device, args.water_delay, args.miss_rate, args.seed).run(
+        start_t, end_t, args.reconcile_every)
+    collisions = collision_index(cols.ids)
+    stranded = sim.stranded()
+    elapsed = time.perf_counter() - t0
+
+    n = len(cols)
+    report = {
+        'plants': n,
+        'active': sum(sim.active),
+        'start': clock.label(start_t),
+        'horizon_days': args.horizon,
+        'tz': local.name,
+        'platform': args.platform,
+        'posts_per_minute': burst_report(clock, sim.posts, args.top),
+        'alerts_per_minute': burst_report(clock, sim.alerts, args.top),
+        'reconciles': sim.reconciles,
+        'counts': dict(sim.counts),
+        'stranded': dict(stranded),
+        'collisions': {str(h): ids for h, ids in collisions.items()},
+        'expected_collision_pairs': n * (n - 1) / 2 / 2 ** DART_HASH_BITS,
+    }
+
+    print(f'🔔 식물 {n:,}개 (활성 {report["active"]:,}개), {report["start"]}부터 {args.horizon}일 '
+          f'({local.name}, {args.platform})')
+    for key, title in (('posts_per_minute', '알림 게시'), ('alerts_per_minute', '사용자 알림')):
+        b = report[key]
+        print(f'\n📈 {title}: 총 {b["total"]:,}건, {b["busy_minutes"]:,}분에 집중, 분당 최대 {b["max"]:,} / p99 {b["p99"]:,}')
+        for label, count in b['top']:
+            print(f'   {label}  {count:>8,}')
+    print(f'\n🔁 재조정 {len(sim.reconciles)}회:')
+    for r in sim.reconciles:
+        print(f'   {r["at"]}  취소 {r["cancelled"]:,} / 예약 {r["scheduled"]:,} (그대로 {r["unchanged"]:,}) / '
+              f'과거 {r["past"]:,} / 한도 초과 {r["limit"]:,} / 플랫폼 호출 {r["platform_calls"]:,}')
+    c = sim.counts
+    print(f'\n💧 물주기 {c["watered"]:,}회, 무시 {c["ignored"]:,}회, ID 충돌로 덮어씀 {c["overwritten"]:,}회, '
+          f'한도로 밀려남 {c["dropped"]:,}회')
+    if stranded:
+        print('⚠️ 예약 없이 남은 활성 식물: ' + ', '.join(f'{k} {v:,}개' for k, v in stranded.items()))
+    print(f'\n🆔 알람 ID 충돌 {len(collisions)}건 (기대값 {report["expected_collision_pairs"]:.2e}쌍):')
+    for h, ids in list(collisions.items())[:20]:
+        reserved = '  (테스트 알림 ID)' if h == TEST_NOTIFICATION_ID else ''
+        print(f'   {h:>10}  {", ".join(ids)}{reserved}')
+    print(f'\n⏱️ 이벤트 {c["events"]:,}개, {elapsed:.2f}s')
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f'🧾 리포트: {args.json}')
+
+
+if __name__ == '__main__':
+    main()
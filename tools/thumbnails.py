@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Thumbnails of the plant photos (Plant.imagePath) referenced by backups, for list
+tiles and the screenshot plant cards.
+
+imagePath is a path on the phone (image_picker cache), so photos are looked up by
+file name in the --photos directories (e.g. an `adb pull` of the cache folder);
+paths that exist locally are used as they are.
+
+- JPEG draft mode: libjpeg decodes at 1/2, 1/4 or 1/8 scale, the smallest that still
+  covers the largest thumbnail, so full-resolution camera photos are never decoded
+- one decode per photo: the largest size is centre-cropped from it, each smaller size
+  is reduced from the previous one; EXIF orientation is applied
+- keyed by content hash: build/thumbnails/<ab>/<hash>-<size>.<ext>; photos whose
+  thumbnails all exist are skipped, and index.json remembers the hash of every source
+  by (mtime, size) so unchanged photos are not even read again
+- photos are decoded and encoded on a thread pool (libjpeg / libwebp and resizing
+  release the GIL); files are written atomically and only when their bytes change
+
+    from thumbnails import load_thumbnail
+    photo = load_thumbnail(plant['imagePath'], 100, photo_dirs=['photos'])  # RGB or None
+
+Usage:
+  python3 tools/thumbnails.py backup.json [more.json|.pwbc ...] --photos DIR [--sizes 120,240,480]
+                              [--formats webp,jpeg] [--workers N] [--force]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+from merge_backups import read_backup
+from sharding import file_hash
+from write_behind import write_bytes, write_image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THUMB_DIR = os.path.join(ROOT, 'build', 'thumbnails')
+INDEX_PATH = os.path.join(THUMB_DIR, 'index.json')
+INDEX_VERSION = 1
+SIZES = (120, 240, 480)
+FORMATS = ('webp', 'jpeg')  # write_behind profiles
+EXTENSIONS = {'webp': '.webp', 'jpeg': '.jpg'}
+
+
+def backup_photos(path: str):
+    """(name, imagePath) of the plants of a backup (.json or .pwbc) that have a photo."""
+    from backup_columns import ColumnarBackup, is_columnar  # imports numpy
+    if is_columnar(path):
+        with ColumnarBackup(path) as backup:
+            pairs = list(zip(backup.strings('name').tolist(), backup.strings('image_path').tolist()))
+        yield from ((name, image) for name, image in pairs if image)
+        return
+    for record in read_backup(path):
+        if isinstance(record, dict) and record.get('imagePath'):
+            yield record.get('name'), record['imagePath']
+
+
+def resolve(image_path: str, photo_dirs=()):
+    """Local file for an imagePath: the path itself, else the same file name in photo_dirs."""
+    if os.path.isfile(image_path):
+        return os.path.abspath(image_path)
+    name = os.path.basename(image_path)
+    for directory in photo_dirs:
+        candidate = os.path.join(directory, name)
+        if os.path.isfile(candidate):
+            return os.path.abspath(candidate)
+    return None
+
+
+def thumb_path(digest: str, size: int, fmt='webp') -> str:
+    return os.path.join(THUMB_DIR, digest[:2], f'{digest}-{size}{EXTENSIONS[fmt]}')
+
+
+class ThumbnailIndex:
+    """Source path -> content hash, trusted while the file's mtime and size are unchanged."""
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        self.sources = data.get('sources', {}) if data.get('version') == INDEX_VERSION else {}
+        self._lock = threading.Lock()
+
+    def digest(self, src: str, rehash=True):
+        """Content hash of src; None when src is unknown or stale and rehash is False."""
+        st = os.stat(src)
+        entry = self.sources.get(src)
+        if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            return entry['hash']
+        if not rehash:
+            return None
+        digest = file_hash(src)
+        with self._lock:
+            self.sources[src] = {'hash': digest, 'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+        return digest
+
+    def save(self) -> bool:
+        data = {'version': INDEX_VERSION, 'sources': dict(sorted(self.sources.items()))}
+        return write_bytes(self.path, (json.dumps(data, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+
+
+def render(src: str, digest: str, sizes=SIZES, formats=FORMATS) -> dict:
+    """Decode src once and write its thumbnails. Returns the decode statistics."""
+    with Image.open(src) as img:
+        full = img.size
+        largest = max(sizes)
+        if img.format == 'JPEG':
+            img.draft('RGB', (largest, largest))  # DCT scaling: both sides stay >= largest
+        decoded = img.size
+        thumb = ImageOps.exif_transpose(img).convert('RGB')
+    written = 0
+    for size in sorted(sizes, reverse=True):
+        if thumb.size != (size, size):
+            thumb = ImageOps.fit(thumb, (size, size), Image.Resampling.LANCZOS)
+        for fmt in formats:
+            path = thumb_path(digest, size, fmt)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            written += write_image(thumb, path, fmt)
+    return {'full': full, 'decoded': decoded, 'written': written}
+
+
+def load_thumbnail(image_path, size: int, photo_dirs=(), fmt='webp', index=None):
+    """
+    size x size RGB thumbnail of a plant photo, from the smallest stored size that is
+    at least as large; None when the photo is not available locally or has no thumbnails yet.
+    """
+    if not image_path:
+        return None
+    src = resolve(image_path, photo_dirs)
+    if src is None:
+        return None
+    digest = (index or ThumbnailIndex()).digest(src, rehash=False)
+    if digest is None:
+        return None
+    stored = [s for s in SIZES if os.path.exists(thumb_path(digest, s, fmt))]
+    if not stored:
+        return None
+    best = min((s for s in stored if s >= size), default=max(stored))
+    with Image.open(thumb_path(digest, best, fmt)) as img:
+        thumb = img.convert('RGB')
+    return thumb if best == size else thumb.resize((size, size), Image.Resampling.LANCZOS)
+
+
+def _parse_list(value: str) -> list:
+    return [v for v in value.split(',') if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Make thumbnails of the plant photos referenced by backups')
+    parser.add_argument('backups', nargs='+', help='plant_water_buddy_backup.json or .pwbc files')
+    parser.add_argument('--photos', action='append', default=[], metavar='DIR',
+                        help='directory holding the photos by file name (repeatable)')
+    parser.add_argument('--sizes', type=lambda v: sorted({int(s) for s in _parse_list(v)}), default=list(SIZES),
+                        help='square thumbnail sizes in px (default: %(default)s)')
+    parser.add_argument('--formats', type=_parse_list, default=list(FORMATS), help='webp and/or jpeg')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--force', action='store_true', help='re-render even when the thumbnails exist')
+    args = parser.parse_args()
+    if not args.sizes or min(args.sizes) < 1 or not set(args.formats) <= set(EXTENSIONS) or not args.formats:
+        raise SystemExit(f'❌ --sizes는 양수, --formats는 {"/".join(EXTENSIONS)} 중에서')
+
+    t0 = time.perf_counter()
+    refs = set()
+    for path in args.backups:
+        refs.update(image for _, image in backup_photos(path))
+    sources = {}
+    for image in sorted(refs):
+        src = resolve(image, args.photos)
+        if src is not None:
+            sources[src] = image
+    index = ThumbnailIndex()
+    stats = {'rendered': 0, 'skipped': 0, 'written': 0, 'full_px': 0, 'decoded_px': 0}
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        digests = dict(zip(sources, pool.map(index.digest, sources)))
+        todo = {}  # identical photos under several names are decoded once
+        for src, digest in digests.items():
+            done = all(os.path.exists(thumb_path(digest, s, f)) for s in args.sizes for f in args.formats)
+            if done and not args.force:
+                stats['skipped'] += 1
+            else:
+                todo.setdefault(digest, src)
+        for result in pool.map(lambda item: render(item[1], item[0], args.sizes, args.formats), todo.items()):
+            stats['rendered'] += 1
+            stats['written'] += result['written']
+            stats['full_px'] += result['full'][0] * result['full'][1]
+            stats['decoded_px'] += result['decoded'][0] * result['decoded'][1]
+    index.save()
+
+    elapsed = time.perf_counter() - t0
+    print(f'🖼️ 사진 참조 {len(refs):,}개: 로컬 {len(sources):,}개, 없음 {len(refs) - len(sources):,}개')
+    print(f'✅ 썸네일: 렌더 {stats["rendered"]:,}장 (파일 {stats["written"]:,}개 저장), '
+          f'건너뜀 {stats["skipped"]:,}장, {elapsed:.1f}s')
+    if stats['full_px']:
+        print(f'   draft 디코딩: 원본 픽셀의 {stats["decoded_px"] / stats["full_px"] * 100:.1f}%만 디코딩')
+    print(f'📁 {os.path.relpath(THUMB_DIR, ROOT)} (크기 {",".join(map(str, args.sizes))}, '
+          f'형식 {",".join(args.formats)})')
+
+
+if __name__ == '__main__':
+    main()
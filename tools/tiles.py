@@ -0,0 +1,82 @@
+"""
+Tile-parallel rendering of one large canvas (4096px+ masters of the icon and the
+feature graphics).
+
+    img = render_tiled(functools.partial(render_region, scale), (8192, 4000), overlap=128)
+
+render_region(box) returns the canvas region box = (x0, y0, x1, y1) as an image of
+that size, drawn like the same pixels of the whole canvas: the same shapes shifted
+by (-x0, -y0) (vector_scene.Scene.rasterize(box=..., snap=True), the premium feature
+graphic background). Pillow rasterizes float coordinates in single precision, so only
+shapes on integer coordinates come out the same after a shift, and even those can
+differ by an edge pixel at odd offsets; compare_tiled() counts the differences.
+
+- the canvas is cut into tile x tile boxes; each is rendered with `overlap` extra
+  pixels around it (clipped at the canvas edge, where the whole canvas ends too), so
+  blurs see the same neighbourhood as in the whole canvas, and cropped back
+- tiles render in a process pool and write straight into one shared-memory image
+  (shm_transport.allocate / write_region): only the box is pickled, and the stitched
+  canvas is never sent back through a pipe
+- render time goes as pixels / workers; with one worker or one tile the canvas is
+  rendered whole in this process
+- render_region must be picklable: a module-level function or a functools.partial of one
+"""
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageChops
+
+from shm_transport import allocate, release, with_image, write_region
+
+TILE = 1024  # power of two: shifts by it keep Pillow's scan conversion of integer shapes exact in practice
+
+
+def tile_boxes(size, tile=TILE) -> list:
+    width, height = size
+    return [(x, y, min(x + tile, width), min(y + tile, height))
+            for y in range(0, height, tile) for x in range(0, width, tile)]
+
+
+def render_tile(render_region, size, box, overlap: int) -> Image.Image:
+    """The tile box of the canvas, rendered with overlap pixels of context around it."""
+    width, height = size
+    x0, y0, x1, y1 = box
+    outer = (max(x0 - overlap, 0), max(y0 - overlap, 0), min(x1 + overlap, width), min(y1 + overlap, height))
+    img = render_region(outer)
+    if outer == box:
+        return img
+    return img.crop((x0 - outer[0], y0 - outer[1], x1 - outer[0], y1 - outer[1]))
+
+
+def _tile_job(render_region, desc: dict, box, overlap: int):
+    """Pool worker: render one tile into the shared canvas."""
+    write_region(desc, render_tile(render_region, desc['size'], box, overlap), box[:2])
+
+
+def render_tiled(render_region, size, mode='RGB', tile=TILE, overlap=0, workers=None) -> Image.Image:
+    boxes = tile_boxes(size, tile)
+    workers = min(workers or os.cpu_count() or 1, len(boxes))
+    if workers <= 1:
+        return render_region((0, 0) + tuple(size))
+    desc, shm = allocate(mode, size)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(_tile_job, render_region, desc, box, overlap) for box in boxes]:
+                future.result()
+        return with_image(desc, Image.Image.copy)
+    finally:
+        release(shm, unlink=True)
+
+
+def compare_tiled(render_region, size, tile=TILE, overlap=0) -> list:
+    """[(box, differing pixels)] of the tiles whose render differs from the whole canvas."""
+    whole = render_region((0, 0) + tuple(size))
+    out = []
+    for box in tile_boxes(size, tile):
+        bands = ImageChops.difference(render_tile(render_region, size, box, overlap), whole.crop(box)).split()
+        changed = functools.reduce(ImageChops.lighter, bands)  # max over the bands
+        count = changed.width * changed.height - changed.histogram()[0]
+        if count:
+            out.append((box, count))
+    return out
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Validate every generated image asset against Play Store / App Store rules
+without decoding pixels (only PNG/JPEG/WebP headers are read).
+
+Checked roots: assets/, android/, ios/, macos/, web/
+
+Rules (see assets/store_graphics/README.md and SPECS in prepare_store_screenshots.py):
+- Play app icon (store_graphics/app_icon_512.png): 512x512, 32-bit PNG with alpha, <= 1MB
+- Feature graphic (store_graphics/feature_graphic*.png|jpg): 1024x500, no alpha, <= 15MB
+- Play screenshots: PNG/JPEG, each side 320~3840px, long side <= 2x short side, no alpha, <= 8MB
+- App Store screenshots (SPECS folders): exact SPECS size, no alpha
+- Android launcher mipmaps: square, size per density (mdpi 48 ... xxxhdpi 192)
+- iOS/macOS AppIcon.appiconset: size x scale from Contents.json, 1024 marketing icon without alpha
+- Web icons: Icon-<N>.png is NxN
+
+Usage:
+  python3 tools/validate_store_assets.py [--quiet]
+Exit code is 1 when any asset violates a rule (for CI).
+"""
+import json
+import os
+import re
+import struct
+import sys
+import time
+
+from prepare_store_screenshots import SPECS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCAN_ROOTS = ['assets', 'android', 'ios', 'macos', 'web']
+SKIP_DIRS = {'build', '.dart_tool', 'Pods', '.gradle', '.symlinks', 'ephemeral', 'node_modules'}
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.webp')
+
+MB = 1024 * 1024
+MIPMAP_SIZES = {
+    'mdpi': 48,
+    'hdpi': 72,
+    'xhdpi': 96,
+    'xxhdpi': 144,
+    'xxxhdpi': 192,
+}
+PLAY_SCREENSHOT_MIN, PLAY_SCREENSHOT_MAX = 320, 3840
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# PNG color type -> (channels, has alpha)
+PNG_COLOR_TYPES = {0: (1, False), 2: (3, False), 3: (1, False), 4: (2, True), 6: (4, True)}
+# JPEG SOFn markers (excluding DHT/JPG/DAC which share the range)
+JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+class HeaderError(Exception):
+    pass
+
+
+def read_png_header(f):
+    """IHDR + chunk walk up to the first IDAT (seeking over chunk data)."""
+    if f.read(8) != PNG_SIGNATURE:
+        raise HeaderError('PNG 시그니처 아님')
+    length, ctype = struct.unpack('>I4s', f.read(8))
+    if ctype != b'IHDR' or length != 13:
+        raise HeaderError('IHDR 없음')
+    width, height, bit_depth, color_type = struct.unpack('>IIBB', f.read(10))
+    if color_type not in PNG_COLOR_TYPES:
+        raise HeaderError(f'알 수 없는 color type {color_type}')
+    channels, alpha = PNG_COLOR_TYPES[color_type]
+    f.seek(3 + 4, os.SEEK_CUR)  # compression/filter/interlace + CRC
+    while True:
+        head = f.read(8)
+        if len(head) < 8:
+            raise HeaderError('IDAT 이전에 파일이 끝남')
+        length, ctype = struct.unpack('>I4s', head)
+        if ctype == b'IDAT':
+            break
+        if ctype == b'tRNS':
+            alpha = True
+        f.seek(length + 4, os.SEEK_CUR)
+    bits = bit_depth * (3 if color_type == 3 else channels) + (8 if color_type == 3 and alpha else 0)
+    return {'format': 'PNG', 'width': width, 'height': height, 'alpha': alpha, 'bits': bits}
+
+
+def read_jpeg_header(f):
+    """Walk JPEG markers until the first SOFn segment."""
+    if f.read(2) != b'\xff\xd8':
+        raise HeaderError('JPEG SOI 없음')
+    while True:
+        byte = f.read(1)
+        if not byte:
+            raise HeaderError('SOF 이전에 파일이 끝남')
+        if byte != b'\xff':
+            continue
+        marker = f.read(1)
+        while marker == b'\xff':
+            marker = f.read(1)
+        m = marker[0]
+        if m == 0xD8 or 0xD0 <= m <= 0xD7 or m == 0x01:
+            continue
+        (length,) = struct.unpack('>H', f.read(2))
+        if m in JPEG_SOF:
+            precision, height, width, components = struct.unpack('>BHHB', f.read(6))
+            return {'format': 'JPEG', 'width': width, 'height': height, 'alpha': False,
+                    'bits': precision * components}
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def read_webp_header(f):
+    head = f.read(30)
+    if len(head) < 30 or head[:4] != b'RIFF' or head[8:12] != b'WEBP':
+        raise HeaderError('WebP RIFF 헤더 아님')
+    chunk = head[12:16]
+    if chunk == b'VP8X':
+        alpha = bool(head[20] & 0x10)
+        width = 1 + int.from_bytes(head[24:27], 'little')
+        height = 1 + int.from_bytes(head[27:30], 'little')
+    elif chunk == b'VP8L':
+        bits = int.from_bytes(head[21:25], 'little')
+        width = (bits & 0x3FFF) + 1
+        height = ((bits >> 14) & 0x3FFF) + 1
+        alpha = bool((bits >> 28) & 1)
+    elif chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', head[26:30])
+        width &= 0x3FFF
+        height &= 0x3FFF
+        alpha = False
+    else:
+        raise HeaderError(f'알 수 없는 WebP 청크 {chunk!r}')
+    return {'format': 'WEBP', 'width': width, 'height': height, 'alpha': alpha,
+            'bits': 32 if alpha else 24}
+
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        magic = f.read(12)
+        f.seek(0)
+        if magic.startswith(PNG_SIGNATURE):
+            info = read_png_header(f)
+        elif magic.startswith(b'\xff\xd8'):
+            info = read_jpeg_header(f)
+        elif magic[:4] == b'RIFF' and magic[8:12] == b'WEBP':
+            info = read_webp_header(f)
+        else:
+            raise HeaderError('지원하지 않는 이미지 형식')
+    info['bytes'] = os.path.getsize(path)
+    return info
+
+
+# ---------------------------------------------------------------------------
+# Rules: each returns a list of violation messages (empty list == pass)
+# ---------------------------------------------------------------------------
+
+def check_exact(info, w, h):
+    if (info['width'], info['height']) != (w, h):
+        return [f"크기 {info['width']}x{info['height']} ≠ {w}x{h}"]
+    return []
+
+
+def check_no_alpha(info):
+    return ['알파 채널 포함 (불투명 이미지 필요)'] if info['alpha'] else []
+
+
+def check_max_bytes(info, limit):
+    if info['bytes'] > limit:
+        return [f"용량 {info['bytes'] / MB:.1f}MB > {limit / MB:.0f}MB"]
+    return []
+
+
+def check_formats(info, formats):
+    if info['format'] not in formats:
+        return [f"형식 {info['format']} (허용: {'/'.join(formats)})"]
+    return []
+
+
+def rule_play_icon(info):
+    errors = check_exact(info, 512, 512) + check_formats(info, ('PNG',)) + check_max_bytes(info, 1 * MB)
+    if not info['alpha'] or info['bits'] < 32:
+        errors.append('32비트 PNG(알파 채널) 아님')
+    return errors
+
+
+def rule_feature_graphic(info):
+    if info['format'] == 'WEBP':  # web preview export, not uploaded to Play
+        return check_exact(info, 1024, 500)
+    return (check_exact(info, 1024, 500) + check_formats(info, ('PNG', 'JPEG'))
+            + check_no_alpha(info) + check_max_bytes(info, 15 * MB))
+
+
+def rule_play_screenshot(info):
+    errors = check_formats(info, ('PNG', 'JPEG')) + check_no_alpha(info) + check_max_bytes(info, 8 * MB)
+    w, h = info['width'], info['height']
+    for side in (w, h):
+        if not PLAY_SCREENSHOT_MIN <= side <= PLAY_SCREENSHOT_MAX:
+            errors.append(f'변 길이 {side}px (허용 {PLAY_SCREENSHOT_MIN}~{PLAY_SCREENSHOT_MAX}px)')
+            break
+    if max(w, h) > 2 * min(w, h):
+        errors.append(f'비율 {w}x{h} (긴 변이 짧은 변의 2배 초과)')
+    return errors
+
+
+def rule_app_store_screenshot(w, h):
+    def rule(info):
+        return (check_exact(info, w, h) + check_formats(info, ('PNG', 'JPEG'))
+                + check_no_alpha(info))
+    return rule
+
+
+def rule_square(size, opaque=False):
+    def rule(info):
+        errors = check_exact(info, size, size)
+        if opaque:
+            errors += check_no_alpha(info)
+        return errors
+    return rule
+
+
+def rule_readable(info):
+    return []
+
+
+def load_appiconset_rules(appiconset_dir):
+    """filename -> rule built from Contents.json (size x scale)."""
+    rules = {}
+    contents = os.path.join(appiconset_dir, 'Contents.json')
+    if not os.path.exists(contents):
+        return rules
+    with open(contents, encoding='utf-8') as f:
+        data = json.load(f)
+    for entry in data.get('images', []):
+        name = entry.get('filename')
+        if not name or 'size' not in entry:
+            continue
+        points = float(entry['size'].split('x')[0])
+        scale = int(entry.get('scale', '1x').rstrip('x'))
+        pixels = int(round(points * scale))
+        # App Store rejects a marketing icon with transparency
+        rules[name] = rule_square(pixels, opaque=entry.get('idiom') == 'ios-marketing')
+    return rules
+
+
+def missing_appiconset_files(appiconset_dir):
+    rules = load_appiconset_rules(appiconset_dir)
+    return sorted(n for n in rules if not os.path.exists(os.path.join(appiconset_dir, n)))
+
+
+_appiconset_cache = {}
+
+
+def pick_rule(rel_path):
+    """Return (rule name, rule fn) for a path relative to ROOT."""
+    parts = rel_path.split(os.sep)
+    name = parts[-1]
+    parent = parts[-2] if len(parts) > 1 else ''
+
+    if parts[:2] == ['assets', 'store_graphics']:
+        if name == 'app_icon_512.png' and len(parts) == 3:
+            return 'play_icon', rule_play_icon
+        if name.startswith('feature_graphic') and len(parts) == 3:
+            return 'feature_graphic', rule_feature_graphic
+        if 'screenshots' in parts:
+            if parent in SPECS and parent != 'play_store':
+                w, h = SPECS[parent]
+                return f'app_store {w}x{h}', rule_app_store_screenshot(w, h)
+            return 'play_screenshot', rule_play_screenshot
+    if parent.startswith('mipmap-'):
+        density = parent[len('mipmap-'):]
+        if density in MIPMAP_SIZES:
+            return f'mipmap {density}', rule_square(MIPMAP_SIZES[density])
+    if parent.endswith('.appiconset'):
+        folder = os.path.join(ROOT, *parts[:-1])
+        if folder not in _appiconset_cache:
+            _appiconset_cache[folder] = load_appiconset_rules(folder)
+        rule = _appiconset_cache[folder].get(name)
+        if rule:
+            return 'appiconset', rule
+    if parts[0] == 'web':
+        m = re.search(r'-(\d+)\.png$', name)
+        if m:
+            size = int(m.group(1))
+            return f'web icon {size}', rule_square(size)
+    return 'readable', rule_readable
+
+
+def iter_images():
+    for top in SCAN_ROOTS:
+        base = os.path.join(ROOT, top)
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+            for fname in sorted(filenames):
+                if fname.lower().endswith(IMAGE_EXTS):
+                    yield os.path.relpath(os.path.join(dirpath, fname), ROOT)
+
+
+def validate():
+    """Return a list of (ok, rel_path, rule_name, info, errors)."""
+    results = []
+    for rel in iter_images():
+        rule_name, rule = pick_rule(rel)
+        try:
+            info = read_header(os.path.join(ROOT, rel))
+            errors = rule(info)
+        except (HeaderError, struct.error, IndexError, OSError) as e:
+            info, errors = None, [f'헤더 읽기 실패: {e}']
+        results.append((not errors, rel, rule_name, info, errors))
+    for folder, rules in sorted(_appiconset_cache.items()):
+        for name in missing_appiconset_files(folder):
+            rel = os.path.relpath(os.path.join(folder, name), ROOT)
+            results.append((False, rel, 'appiconset', None, ['Contents.json에 있으나 파일 없음']))
+    return results
+
+
+def format_info(info):
+    if not info:
+        return '-'
+    alpha = 'A' if info['alpha'] else '-'
+    return f"{info['format']:<4} {info['width']}x{info['height']} {info['bits']}b {alpha} {info['bytes'] / 1024:.0f}KB"
+
+
+def main():
+    quiet = '--quiet' in sys.argv[1:]
+    start = time.perf_counter()
+    results = validate()
+    elapsed = time.perf_counter() - start
+
+    path_w = max((len(r[1]) for r in results), default=10)
+    failed = [r for r in results if not r[0]]
+    print(f"{'결과':<4} {'파일':<{path_w}}  {'규칙':<18} 헤더")
+    for ok, rel, rule_name, info, errors in results:
+        if quiet and ok:
+            continue
+        mark = '✅' if ok else '❌'
+        print(f'{mark:<4} {rel:<{path_w}}  {rule_name:<18} {format_info(info)}')
+        for err in errors:
+            print(f"{'':<4} {'':<{path_w}}  ↳ {err}")
+
+    print(f'\n검사 {len(results)}개 / 통과 {len(results) - len(failed)}개 / 실패 {len(failed)}개 ({elapsed * 1000:.0f}ms)')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,308 @@
+"""
+Drawing scenes: the shapes of an image recorded once, then rasterized with Pillow or
+written as SVG / Android VectorDrawable.
+
+    scene = Scene(1024, 1024)
+    with scene.group('droplet'):
+        scene.polygon(points, fill=(100, 200, 255))
+    img = scene.rasterize()              # same pixels as the direct ImageDraw calls
+    svg = to_svg(scene)
+
+Primitives take the arguments of the ImageDraw calls they replace:
+  vertical_gradient(top, bottom)   per-row colour of a top-to-bottom linear gradient
+  polygon(points, fill=None, outline=None, width=1)
+  ellipse(box, fill)   rectangle(box, fill)   arc(box, start, end, fill, width)
+  line(points, fill, width)
+Groups become profiling stages when rasterized and <g id> / <group android:name>
+in the vector output.
+
+Vector output is made for the eye, not for pixel equality: polygons are simplified
+(Ramer-Douglas-Peucker, `tolerance` in scene units), polygon outlines are stroked
+on the path where Pillow draws them inside, and the gradient is not row-quantized.
+"""
+import contextlib
+import math
+from collections import namedtuple
+
+from PIL import Image, ImageColor, ImageDraw
+
+from profiling import stage
+
+Op = namedtuple('Op', 'kind group args')
+
+ANDROID_NS = 'http://schemas.android.com/apk/res/android'
+AAPT_NS = 'http://schemas.android.com/aapt'
+DEFAULT_TOLERANCE = 0.5
+
+
+class Scene:
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.ops = []
+        self._group = None
+
+    @contextlib.contextmanager
+    def group(self, name: str):
+        outer, self._group = self._group, name
+        try:
+            yield self
+        finally:
+            self._group = outer
+
+    def _add(self, kind, **args):
+        self.ops.append(Op(kind, self._group, args))
+
+    def vertical_gradient(self, top, bottom):
+        self._add('gradient', top=top, bottom=bottom)
+
+    def polygon(self, points, fill=None, outline=None, width=1):
+        self._add('polygon', points=list(points), fill=fill, outline=outline, width=width)
+
+    def ellipse(self, box, fill):
+        self._add('ellipse', box=list(box), fill=fill)
+
+    def rectangle(self, box, fill):
+        self._add('rectangle', box=list(box), fill=fill)
+
+    def arc(self, box, start, end, fill, width=1):
+        self._add('arc', box=list(box), start=start, end=end, fill=fill, width=width)
+
+    def line(self, points, fill, width=1):
+        self._add('line', points=list(points), fill=fill, width=width)
+
+    def groups(self) -> list:
+        """Group names in drawing order."""
+        return list(dict.fromkeys(op.group for op in self.ops))
+
+    def select(self, keep) -> 'Scene':
+        """New scene with the ops whose group passes keep(name)."""
+        out = Scene(self.width, self.height)
+        out.ops = [op for op in self.ops if keep(op.group)]
+        return out
+
+    def rasterize(self, mode='RGB', background='#FFFFFF', box=None, snap=False) -> Image.Image:
+        """
+        The scene, or only its region box = (x0, y0, x1, y1), with every op shifted by
+        (-x0, -y0). snap rounds the coordinates to whole pixels first (as Pillow rounds
+        them), so that regions match the whole snapped scene (tiles.py).
+        """
+        x0, y0, x1, y1 = box or (0, 0, self.width, self.height)
+        img = Image.new(mode, (x1 - x0, y1 - y0), background)
+        draw = ImageDraw.Draw(img)
+        for name, ops in _grouped((op.group, op) for op in self.ops):
+            with stage(name or 'scene'):
+                for _, op in ops:
+                    if x0 or y0 or snap:
+                        op = _shifted(op, x0, y0, snap)
+                    _draw(img, draw, op, self.height, y0)
+        return img
+
+
+def _rgb(color) -> tuple:
+    return ImageColor.getrgb(color) if isinstance(color, str) else tuple(color)
+
+
+def _round(v) -> int:
+    return int(math.floor(abs(v) + 0.5)) * (1 if v >= 0 else -1)  # half away from zero, like Pillow
+
+
+def _shifted(op: Op, dx: int, dy: int, snap=False) -> Op:
+    a = dict(op.args)
+    r = _round if snap else (lambda v: v)
+    if 'points' in a:
+        a['points'] = [(r(x) - dx, r(y) - dy) for x, y in a['points']]
+    if 'box' in a:
+        x0, y0, x1, y1 = a['box']
+        a['box'] = [r(x0) - dx, r(y0) - dy, r(x1) - dx, r(y1) - dy]
+    return op._replace(args=a)
+
+
+def _draw(img: Image.Image, draw: ImageDraw.ImageDraw, op: Op, height: int, top_row: int):
+    """Draw one op; height: scene height, top_row: the scene row of img's first row."""
+    a = op.args
+    if op.kind == 'gradient':
+        top, bottom = _rgb(a['top']), _rgb(a['bottom'])
+        for y in range(img.height):
+            ratio = (top_row + y) / height
+            img.paste(tuple(int(t + (b - t) * ratio) for t, b in zip(top, bottom)), (0, y, img.width, y + 1))
+    elif op.kind == 'polygon':
+        if a['fill'] is not None:
+            draw.polygon(a['points'], fill=a['fill'])
+        if a['outline'] is not None:
+            draw.polygon(a['points'], outline=a['outline'], width=a['width'])
+    elif op.kind == 'ellipse':
+        draw.ellipse(a['box'], fill=a['fill'])
+    elif op.kind == 'rectangle':
+        draw.rectangle(a['box'], fill=a['fill'])
+    elif op.kind == 'arc':
+        draw.arc(a['box'], a['start'], a['end'], fill=a['fill'], width=a['width'])
+    elif op.kind == 'line':
+        draw.line(a['points'], fill=a['fill'], width=a['width'])
+    else:
+        raise ValueError(f'unknown scene op: {op.kind}')
+
+
+# ---------------------------------------------------------------- vector output
+
+def simplify(points, tolerance: float) -> list:
+    """Ramer-Douglas-Peucker: drop points closer than tolerance to the simplified outline."""
+    if len(points) < 3 or tolerance <= 0:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        (x0, y0), (x1, y1) = points[first], points[last]
+        dx, dy = x1 - x0, y1 - y0
+        norm = math.hypot(dx, dy)
+        best, index = -1.0, None
+        for i in range(first + 1, last):
+            px, py = points[i]
+            dist = abs(dy * (px - x0) - dx * (py - y0)) / norm if norm else math.hypot(px - x0, py - y0)
+            if dist > best:
+                best, index = dist, i
+        if index is not None and best > tolerance:
+            keep[index] = True
+            stack += [(first, index), (index, last)]
+    return [p for p, k in zip(points, keep) if k]
+
+
+def _num(v: float) -> str:
+    text = f'{v:.2f}'.rstrip('0').rstrip('.')
+    return '0' if text == '-0' else text
+
+
+def _hex(color) -> str:
+    return '#%02X%02X%02X' % _rgb(color)[:3]
+
+
+def _polyline(points, closed: bool) -> str:
+    d = 'M' + ' L'.join(f'{_num(x)},{_num(y)}' for x, y in points)
+    return d + 'Z' if closed else d
+
+
+def _ellipse_path(x0, y0, x1, y1) -> str:
+    rx, ry, cy = (x1 - x0) / 2, (y1 - y0) / 2, (y0 + y1) / 2
+    r = f'{_num(rx)},{_num(ry)}'
+    return f'M{_num(x0)},{_num(cy)} A{r} 0 1,0 {_num(x1)},{_num(cy)} A{r} 0 1,0 {_num(x0)},{_num(cy)}Z'
+
+
+def _arc_path(box, start, end, width) -> str:
+    # Pillow strokes arcs inside the box: centre the vector stroke half a width in
+    x0, y0, x1, y1 = (box[0] + width / 2, box[1] + width / 2, box[2] - width / 2, box[3] - width / 2)
+    cx, cy, rx, ry = (x0 + x1) / 2, (y0 + y1) / 2, (x1 - x0) / 2, (y1 - y0) / 2
+    sweep = (end - start) % 360 or 360
+    p0 = (cx + rx * math.cos(math.radians(start)), cy + ry * math.sin(math.radians(start)))
+    p1 = (cx + rx * math.cos(math.radians(start + sweep)), cy + ry * math.sin(math.radians(start + sweep)))
+    return (f'M{_num(p0[0])},{_num(p0[1])} A{_num(rx)},{_num(ry)} 0 {int(sweep > 180)},1 '
+            f'{_num(p1[0])},{_num(p1[1])}')
+
+
+def paths(scene: Scene, tolerance=DEFAULT_TOLERANCE):
+    """(group, path data, fill, stroke, stroke width) per drawn shape; gradients are skipped."""
+    for op in scene.ops:
+        a = op.args
+        if op.kind == 'polygon':
+            d = _polyline(simplify(a['points'] + a['points'][:1], tolerance)[:-1], closed=True)
+            if a['fill'] is not None:
+                yield op.group, d, _hex(a['fill']), None, 0
+            if a['outline'] is not None:
+                yield op.group, d, None, _hex(a['outline']), a['width']
+        elif op.kind == 'ellipse':
+            yield op.group, _ellipse_path(*a['box']), _hex(a['fill']), None, 0
+        elif op.kind == 'rectangle':
+            x0, y0, x1, y1 = a['box']
+            yield op.group, _polyline([(x0, y0), (x1, y0), (x1, y1), (x0, y1)], closed=True), _hex(a['fill']), None, 0
+        elif op.kind == 'arc':
+            yield op.group, _arc_path(a['box'], a['start'], a['end'], a['width']), None, _hex(a['fill']), a['width']
+        elif op.kind == 'line':
+            yield op.group, _polyline(a['points'], closed=False), None, _hex(a['fill']), a['width']
+
+
+def _gradient(scene: Scene):
+    return next((op.args for op in scene.ops if op.kind == 'gradient'), None)
+
+
+def _grouped(items):
+    """[(group, [items])] keeping the order, consecutive items of a group together."""
+    out = []
+    for item in items:
+        if not out or out[-1][0] != item[0]:
+            out.append((item[0], []))
+        out[-1][1].append(item)
+    return out
+
+
+def to_svg(scene: Scene, tolerance=DEFAULT_TOLERANCE) -> str:
+    w, h = scene.width, scene.height
+    lines = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" viewBox="0 0 {w} {h}">']
+    gradient = _gradient(scene)
+    if gradient:
+        lines += ['  <defs>',
+                  '    <linearGradient id="bg" x1="0" y1="0" x2="0" y2="1">',
+                  f'      <stop offset="0" stop-color="{_hex(gradient["top"])}"/>',
+                  f'      <stop offset="1" stop-color="{_hex(gradient["bottom"])}"/>',
+                  '    </linearGradient>',
+                  '  </defs>',
+                  f'  <rect width="{w}" height="{h}" fill="url(#bg)"/>']
+    for group, items in _grouped(paths(scene, tolerance)):
+        lines.append(f'  <g id="{group}">' if group else '  <g>')
+        for _, d, fill, stroke, width in items:
+            if stroke:
+                lines.append(f'    <path d="{d}" fill="none" stroke="{stroke}" stroke-width="{_num(width)}" '
+                             f'stroke-linejoin="round"/>')
+            else:
+                lines.append(f'    <path d="{d}" fill="{fill}"/>')
+        lines.append('  </g>')
+    lines.append('</svg>')
+    return '\n'.join(lines) + '\n'
+
+
+def to_vector_drawable(scene: Scene, viewport=None, size_dp=None, translate=(0.0, 0.0), scale=1.0,
+                       tolerance=DEFAULT_TOLERANCE) -> str:
+    """
+    Android <vector> XML: a viewport of `viewport` units (default: the scene size) shown
+    at size_dp. The gradient fills the whole viewport; the shapes are scaled by `scale`,
+    shifted by `translate` and clipped to the scene rectangle, like the raster canvas.
+    """
+    vw, vh = viewport or (scene.width, scene.height)
+    width_dp, height_dp = size_dp or (vw, vh)
+    lines = ['<?xml version="1.0" encoding="utf-8"?>',
+             f'<vector xmlns:android="{ANDROID_NS}"',
+             f'    xmlns:aapt="{AAPT_NS}"',
+             f'    android:width="{_num(width_dp)}dp"',
+             f'    android:height="{_num(height_dp)}dp"',
+             f'    android:viewportWidth="{_num(vw)}"',
+             f'    android:viewportHeight="{_num(vh)}">']
+    gradient = _gradient(scene)
+    if gradient:
+        lines += ['    <path android:pathData="' + _polyline([(0, 0), (vw, 0), (vw, vh), (0, vh)], closed=True) + '">',
+                  '        <aapt:attr name="android:fillColor">',
+                  f'            <gradient android:type="linear" android:startX="0" android:startY="0" '
+                  f'android:endX="0" android:endY="{_num(vh)}"',
+                  f'                android:startColor="{_hex(gradient["top"])}" '
+                  f'android:endColor="{_hex(gradient["bottom"])}"/>',
+                  '        </aapt:attr>',
+                  '    </path>']
+    shapes = _grouped(paths(scene, tolerance))
+    if shapes:
+        w, h = scene.width, scene.height
+        lines += [f'    <group android:translateX="{_num(translate[0])}" android:translateY="{_num(translate[1])}"',
+                  f'        android:scaleX="{scale:.6g}" android:scaleY="{scale:.6g}">',
+                  '        <clip-path android:pathData="'
+                  + _polyline([(0, 0), (w, 0), (w, h), (0, h)], closed=True) + '"/>']
+    for group, items in shapes:
+        lines.append(f'        <group android:name="{group}">' if group else '        <group>')
+        for _, d, fill, stroke, width in items:
+            if stroke:
+                lines.append(f'            <path android:pathData="{d}" android:strokeColor="{stroke}" '
+                             f'android:strokeWidth="{_num(width)}" android:strokeLineJoin="round"/>')
+            else:
+                lines.append(f'            <path android:pathData="{d}" android:fillColor="{fill}"/>')
+        lines.append('        </group>')
+    if shapes:
+        lines.append('    </group>')
+    lines.append('</vector>')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Watch the asset sources and re-render only the outputs affected by a change.
+
+The generator modules stay imported in one warm process (fonts loaded, layer cache
+in memory), so a layout tweak is a module reload + one render + one PNG encode:
+- generator source changed      -> reload that module, re-render its outputs
+- shared helper changed         -> reload the helper, then the generators using it
+- font / icon / fixture changed -> reload (module-level loads) and re-render dependents
+Outputs that are themselves inputs (assets/images/app_icon*.png) trigger their
+dependents on the next poll, so the icon flows into the feature graphics.
+
+Changes are detected by polling mtime + size (no extra dependency); a render error
+is printed and the previous module stays loaded until the next save.
+
+Usage:
+  python3 tools/watch.py [-k feature_] [--interval 0.2] [--once]
+  --once  render the selected targets once and exit (warm-up / smoke test)
+"""
+import argparse
+import fnmatch
+import glob
+import importlib
+import os
+import sys
+import time
+import traceback
+
+import write_behind  # called through the module, so a reload of the helper takes effect
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)  # create_icon.py (tools/ comes first: both have a create_screenshots.py)
+
+DEFAULT_INTERVAL = 0.2
+DEBOUNCE = 0.05  # editors often write a file in several steps
+
+FONTS = ['assets/fonts/*']
+ICONS = ['assets/images/app_icon*.png', 'assets/store_graphics/app_icon_512.png']
+TEXT = ['assets/fixtures/*', 'lib/l10n/*.arb']  # copy / sample data, once they exist
+# Shared helper modules: when one changes it is reloaded before the generators
+# (in this order, so a helper is reloaded after the helpers it imports from)
+HELPERS = {
+    'profiling': 'tools/profiling.py',
+    'write_behind': 'tools/write_behind.py',
+    'layer_cache': 'tools/layer_cache.py',
+    'fonts': 'tools/fonts.py',
+    'emoji_atlas': 'tools/emoji_atlas.py',
+    'vector_scene': 'tools/vector_scene.py',
+    'shm_transport': 'tools/shm_transport.py',
+    'tiles': 'tools/tiles.py',
+}
+
+
+def _icon_outputs(m):
+    icon = m.create_app_icon(1024)
+    return [('assets/images/app_icon.png', icon),
+            ('assets/images/app_icon_rounded.png', m.create_rounded_icon(icon))]
+
+
+def _single(out, fn_name):
+    return lambda m: [(out, getattr(m, fn_name)())]
+
+
+def _variant(name):
+    return _single(f'assets/store_graphics/feature_graphic_{name}.png', name)
+
+
+def _screen(name):
+    return _single(f'assets/store_graphics/screenshots/{name}.png', name)
+
+
+_VARIANTS = ['tools/generate_feature_graphic_variants.py'] + FONTS + ICONS + TEXT
+_SCREENS = ['tools/create_screenshots.py'] + FONTS + TEXT
+
+# target -> (module, render(module) -> [(output path, image)], dependency globs)
+TARGETS = {
+    'icon': ('create_icon', _icon_outputs, ['create_icon.py']),
+    'feature_premium': ('generate_feature_graphic_premium',
+                        _single('assets/store_graphics/feature_graphic_premium.png', 'render'),
+                        ['tools/generate_feature_graphic_premium.py'] + FONTS + ICONS + TEXT),
+    'feature_v2': ('generate_feature_graphic_v2', _single('assets/store_graphics/feature_graphic_v2.png', 'render'),
+                   ['tools/generate_feature_graphic_v2.py'] + FONTS + ICONS + TEXT),
+    'feature_variant_a': ('generate_feature_graphic_variants', _variant('variant_a'), _VARIANTS),
+    'feature_variant_b': ('generate_feature_graphic_variants', _variant('variant_b'), _VARIANTS),
+    'feature_variant_c': ('generate_feature_graphic_variants', _variant('variant_c'), _VARIANTS),
+    'screenshot_1_home': ('create_screenshots', _screen('screenshot_1_home'), _SCREENS),
+    'screenshot_2_add': ('create_screenshots', _screen('screenshot_2_add'), _SCREENS),
+    'screenshot_3_detail': ('create_screenshots', _screen('screenshot_3_detail'), _SCREENS),
+    'screenshot_4_notification': ('create_screenshots', _screen('screenshot_4_notification'), _SCREENS),
+}
+
+
+def snapshot(patterns) -> dict:
+    """{relative path: (mtime_ns, size)} of every file matching the patterns."""
+    state = {}
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(ROOT, pattern)):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            state[os.path.relpath(path, ROOT)] = (st.st_mtime_ns, st.st_size)
+    return state
+
+
+def changed_paths(old: dict, new: dict) -> set:
+    return {p for p in old.keys() | new.keys() if old.get(p) != new.get(p)}
+
+
+def matches(path: str, patterns) -> bool:
+    return any(fnmatch.fnmatch(path, pattern) for pattern in patterns)
+
+
+class Watcher:
+    def __init__(self, names):
+        self.names = names
+        self.modules = {}
+        self.patterns = sorted({p for n in names for p in TARGETS[n][2]} | set(HELPERS.values()))
+
+    def affected(self, changed) -> list:
+        if any(path in HELPERS.values() for path in changed):
+            return list(self.names)
+        return [n for n in self.names if any(matches(path, TARGETS[n][2]) for path in changed)]
+
+    def load(self, name: str, reload: bool):
+        mod = self.modules.get(name)
+        if mod is None:
+            mod = self.modules[name] = importlib.import_module(name)
+        elif reload:
+            mod = self.modules[name] = importlib.reload(mod)
+        return mod
+
+    def render(self, targets, changed=()):
+        t0 = time.perf_counter()
+        for helper, path in HELPERS.items():
+            if path in changed and helper in sys.modules:
+                importlib.reload(sys.modules[helper])
+        written = 0
+        reloaded = set()
+        for name in targets:
+            mod_name, render, _ = TARGETS[name]
+            try:
+                mod = self.load(mod_name, reload=bool(changed) and mod_name not in reloaded)
+                reloaded.add(mod_name)
+                t1 = time.perf_counter()
+                outputs = render(mod)
+                for out, img in outputs:
+                    # Unchanged pixels leave the file alone, so dependents are not re-rendered
+                    written += write_behind.write_image(img, os.path.join(ROOT, out))
+                print(f'  ✅ {name} ({(time.perf_counter() - t1) * 1000:.0f} ms)')
+            except Exception:
+                print(f'  ❌ {name}')
+                traceback.print_exc()
+            except SystemExit as e:  # generators exit when no font is found
+                print(f'  ❌ {name}: {e}')
+        print(f'⚡ 출력 {written}개 갱신 ({(time.perf_counter() - t0) * 1000:.0f} ms)')
+
+    def run(self, interval: float):
+        for name in self.names:  # warm up: import generators and load their fonts now
+            self.load(TARGETS[name][0], reload=False)
+        state = snapshot(self.patterns)
+        print(f'👀 감시 중: 대상 {len(self.names)}개, 파일 {len(state)}개 (Ctrl+C 종료)')
+        while True:
+            time.sleep(interval)
+            new = snapshot(self.patterns)
+            changed = changed_paths(state, new)
+            if not changed:
+                continue
+            time.sleep(DEBOUNCE)
+            new = snapshot(self.patterns)
+            changed |= changed_paths(state, new)
+            state = new
+            targets = self.affected(changed)
+            print(f"\n📝 변경: {', '.join(sorted(changed))}")
+            if targets:
+                print(f"🎯 다시 그리기: {', '.join(targets)}")
+                self.render(targets, changed)
+                # Our own outputs are left in the old snapshot on purpose: the ones that are
+                # inputs of other targets (the app icon) are picked up by the next poll.
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-render affected assets when their sources change')
+    parser.add_argument('-k', '--filter', default='', help='substring of target names to watch')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help='poll interval in seconds')
+    parser.add_argument('--once', action='store_true', help='render the selected targets once and exit')
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # generators resolve some asset paths relative to the repo root
+    names = [n for n in TARGETS if args.filter in n]
+    if not names:
+        raise SystemExit(f'❌ 일치하는 대상이 없습니다: {args.filter}')
+    watcher = Watcher(names)
+    if args.once:
+        watcher.render(names)
+        return
+    try:
+        watcher.run(args.interval)
+    except KeyboardInterrupt:
+        print('\n👋 감시 종료')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""
+Write-behind encoder queue: renderers hand over finished images and move on while a
+thread pool encodes and writes them (zlib / libwebp / libjpeg release the GIL).
+
+    from write_behind import save_async, flush_writes
+
+    for name, render in targets:
+        save_async(render(), f'assets/store_graphics/{name}.png')        # returns at once
+    flush_writes()                                                       # wait, raise the first error
+
+- every file is encoded, then written to a temp file next to the target and renamed
+  into place, so readers never see a partial image
+- deterministic output: PNGs carry only IHDR / PLTE / tRNS / iCCP / IDAT / IEND with
+  fixed encoder settings (no timestamps, text or EXIF chunks, whatever the source had)
+- no churn: a PNG whose pixels match the existing file, or any file whose bytes match,
+  is left untouched (mtime included), so a no-op build writes nothing
+- backpressure: submit() blocks while the queued images hold more than max_bytes of
+  pixels (always accepts one), so memory stays bounded however fast renderers are
+- the image must not be modified after it has been submitted
+
+Environment:
+  PWB_WRITE_BEHIND=off        encode synchronously in submit()
+  PWB_WRITE_BEHIND_WORKERS=N  encoder threads (default: min(4, CPU count))
+"""
+import io
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+# profile -> (Pillow format, save options)
+PROFILES = {
+    'png': ('PNG', {}),
+    'png-optimize': ('PNG', {'optimize': True}),
+    'png-fast': ('PNG', {'compress_level': 1}),  # intermediates, e.g. frames for a video tool
+    'webp-lossless': ('WEBP', {'lossless': True, 'quality': 100, 'method': 4}),
+    'webp': ('WEBP', {'quality': 90, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 90, 'optimize': True, 'progressive': True}),
+}
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Image.info entries written to PNGs: colour interpretation and transparency only
+PNG_KEEP_INFO = ('icc_profile', 'transparency')
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _image_bytes(img: Image.Image) -> int:
+    return img.width * img.height * len(img.getbands())
+
+
+def _for_png(img: Image.Image) -> Image.Image:
+    # Only the info entries that change how the pixels look
+    out = img._new(img.im)
+    out.info = {k: img.info[k] for k in PNG_KEEP_INFO if k in img.info}
+    return out
+
+
+def same_pixels(img: Image.Image, path: str) -> bool:
+    """True when the image file at path decodes to exactly img (mode, size, pixels, kept info)."""
+    try:
+        existing = Image.open(path)
+        existing.load()
+    except (OSError, SyntaxError):  # missing or unreadable: write it
+        return False
+    return (existing.mode == img.mode and existing.size == img.size
+            and all(existing.info.get(k) == img.info.get(k) for k in PNG_KEEP_INFO)
+            and (img.mode != 'P' or existing.getpalette() == img.getpalette())
+            and existing.tobytes() == img.tobytes())
+
+
+def replace_file(tmp: str, path: str):
+    """Move tmp over path; the result keeps path's permissions (mkstemp creates 0600 files)."""
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    os.chmod(tmp, mode)
+    os.replace(tmp, path)
+
+
+def write_bytes(path: str, data: bytes) -> bool:
+    """Atomically write data to path unless it already holds exactly these bytes. Returns True if written."""
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+    except FileNotFoundError:
+        pass
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        replace_file(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+
+def copy_file(src: str, dst: str) -> bool:
+    """Copy src to dst unless dst already holds the same bytes. Returns True if written."""
+    with open(src, 'rb') as f:
+        return write_bytes(dst, f.read())
+
+
+def write_image(img: Image.Image, path: str, profile='png') -> bool:
+    """
+    Encode img with the given profile and write it atomically.
+    Returns False when the file already held the same image and was left untouched.
+    """
+    fmt, options = PROFILES[profile]
+    # Image.save() stores encoder options on the Image object: encode through an own
+    # wrapper around the pixels, in case the same image is being written by another thread
+    img = _for_png(img) if fmt == 'PNG' else img._new(img.im)
+    if fmt == 'PNG' and same_pixels(img, path):  # decoding is much cheaper than encoding
+        return False
+    buf = io.BytesIO()
+    img.save(buf, fmt, **options)
+    return write_bytes(path, buf.getvalue())
+
+
+class WriteBehind:
+    def __init__(self, workers=None, max_bytes=DEFAULT_MAX_BYTES, enabled=None):
+        if enabled is None:
+            enabled = os.environ.get('PWB_WRITE_BEHIND', 'on').lower() not in ('0', 'off', 'false', 'no')
+        if workers is None:
+            workers = int(os.environ.get('PWB_WRITE_BEHIND_WORKERS', min(4, os.cpu_count() or 1)))
+        self.enabled = enabled and workers > 0
+        self.max_bytes = max_bytes
+        self.written = self.unchanged = 0
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='write-behind') if self.enabled else None
+        self._futures = []
+        self._pending_bytes = 0
+        self._cond = threading.Condition()
+
+    def _count(self, written: bool):
+        if written:
+            self.written += 1
+        else:
+            self.unchanged += 1
+
+    def _write(self, img, path, profile, nbytes):
+        try:
+            written = write_image(img, path, profile)
+            with self._cond:
+                self._count(written)
+        finally:
+            with self._cond:
+                self._pending_bytes -= nbytes
+                self._cond.notify_all()
+
+    def submit(self, img: Image.Image, path: str, profile='png'):
+        if profile not in PROFILES:
+            raise ValueError(f'unknown encode profile: {profile}')
+        if not self.enabled:
+            self._count(write_image(img, path, profile))
+            return
+        img.load()
+        nbytes = _image_bytes(img)
+        with self._cond:
+            while self._pending_bytes and self._pending_bytes + nbytes > self.max_bytes:
+                self._cond.wait()
+            self._pending_bytes += nbytes
+        self._futures.append(self._pool.submit(self._write, img, path, profile, nbytes))
+
+    def flush(self) -> int:
+        """Wait for every queued write; raise the first error. Returns the number of files written so far."""
+        futures, self._futures = self._futures, []
+        errors = [f.exception() for f in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+        return self.written
+
+    def summary(self) -> str:
+        return f'출력: 저장 {self.written}개, 변경 없음 {self.unchanged}개'
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        elif self._pool is not None:  # keep the original error; still let queued writes finish
+            self._pool.shutdown()
+        return False
+
+
+_default = None
+
+
+def get_writer() -> WriteBehind:
+    global _default
+    if _default is None:
+        _default = WriteBehind()
+    return _default
+
+
+def save_async(img: Image.Image, path: str, profile='png'):
+    get_writer().submit(img, path, profile)
+
+
+def flush_writes() -> int:
+    return get_writer().flush()